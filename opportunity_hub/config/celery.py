@@ -1,5 +1,6 @@
 import os
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 from django.conf import settings
 
 # Set the default Django settings module for the 'celery' program.
@@ -11,4 +12,23 @@ app = Celery('opportunity_hub')
 app.config_from_object('django.conf:settings', namespace='CELERY')
 
 # Load task modules from all registered Django app configs.
-app.autodiscover_tasks()
\ No newline at end of file
+app.autodiscover_tasks()
+
+@worker_process_init.connect
+def warm_up_driver_pools(**kwargs):
+    """Start pooled browsers in each worker process before the first task arrives"""
+    from core.scraping.driver_pool import warm_up_pools
+    warm_up_pools()
+
+
+@worker_process_shutdown.connect
+def shutdown_driver_pools(**kwargs):
+    from core.scraping.driver_pool import shutdown_pools
+    shutdown_pools()
+
+
+@worker_process_shutdown.connect
+def mark_metrics_process_dead(pid=None, **kwargs):
+    """Drop this worker's browser-pool gauges from the shared metrics directory"""
+    from core.metrics import mark_process_dead
+    mark_process_dead(pid)
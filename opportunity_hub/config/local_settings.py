@@ -43,10 +43,117 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
 
+# Caches; 'scraper' is shared by every web and Celery process (per-domain politeness buckets)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'scraper': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': 'redis://localhost:6379/1',
+    },
+}
+
+# Scraper browser pool (per process)
+SCRAPER_DRIVER_POOL_SIZE = 2  # Max live browsers per driver flavour
+SCRAPER_DRIVER_POOL_WARMUP = {'chrome': 1, 'undetected': 1}  # Started when a Celery worker boots
+SCRAPER_DRIVER_MAX_USES = 50  # Restart a browser after this many checkouts
+SCRAPER_DRIVER_CHECKOUT_TIMEOUT = 300  # Seconds to wait for a free browser
+SCRAPER_PAGE_CONCURRENCY = 2  # Listing pages of one source fetched at once (1 = one page after another)
+SCRAPER_SOURCE_PAGE_CONCURRENCY = {'LinkedIn': 1}  # Per-source overrides
+SCRAPER_DETAIL_CONCURRENCY = 2  # Job detail pages loaded at once, each worker with its own browser
+SCRAPER_SOURCE_DETAIL_CONCURRENCY = {}  # Per-source overrides
+
+# Async HTTP fetching (API sources)
+SCRAPER_HTTP_TIMEOUT = 30  # Seconds per request, including the body
+SCRAPER_HTTP_MAX_CONNECTIONS = 20  # Open keep-alive connections per fetcher
+SCRAPER_HTTP_PER_HOST_LIMIT = 4  # Concurrent requests to a single host
+
+# Static-HTML fast path
+SCRAPER_STATIC_REPROBE_HOURS = 24  # Retry plain GET for browser-only sources after this long
+SCRAPER_STATIC_RETRIES = 2  # Retries of a plain GET that was throttled (429), hit a 5xx or failed outright
+SCRAPER_STATIC_RETRY_DELAY = 10  # Seconds the domain is held before such a retry when there's no Retry-After
+
+# Adaptive stealth (scholarship sources start fast and slow down only when blocked)
+SCRAPER_STEALTH_DECAY_HOURS = 24  # Step back down one level after this long without a block
+SCRAPER_STEALTH_CACHE_SECONDS = 60  # Re-read a source's level after this long, to see other workers' changes
+
+# Per-domain politeness
+SCRAPER_DEFAULT_RATE = 0.5  # Starting requests per second for each domain
+SCRAPER_DEFAULT_BURST = 3  # Requests allowed back to back before pacing kicks in
+SCRAPER_MIN_RATE = 0.05  # Floor when a site keeps throttling us
+SCRAPER_MAX_RATE = 2.0  # Ceiling when a site responds quickly
+SCRAPER_DOMAIN_RATES = {}  # e.g. {'www.linkedin.com': 0.2}
+SCRAPER_RESPECT_ROBOTS_TXT = True  # Honour Crawl-delay / Request-rate
+SCRAPER_THROTTLE_CACHE = 'scraper'  # Cache alias holding every domain's bucket, shared by all worker processes (None = per process)
+
+# Conditional-request HTTP cache
+SCRAPER_HTTP_CACHE_ENABLED = True
+SCRAPER_HTTP_CACHE_DIR = BASE_DIR / 'cache' / 'http'  # Bodies plus ETag/Last-Modified validators
+SCRAPER_HTTP_CACHE_MAX_BYTES = 100 * 1024 * 1024  # Least recently used entries are evicted past this
+
+# Raw page archive (replay with `manage.py replay_pages`)
+SCRAPER_ARCHIVE_ENABLED = True
+SCRAPER_ARCHIVE_DIR = BASE_DIR / 'archive'  # Gzipped pages plus a per-day index
+SCRAPER_ARCHIVE_RETENTION_DAYS = 14  # Enforced nightly by core.tasks.prune_page_archive_task (see CRONJOBS)
+
+# HTML parsing
+SCRAPER_HTML_PARSER = 'selectolax'  # 'selectolax', 'lxml' or 'html.parser'; falls back to html.parser if missing
+SCRAPER_PARTIAL_PARSE = True  # Build trees only for the card_selector subtrees where the backend supports it
+
+# Infinite-scroll loading (one in-page script per page)
+SCRAPER_SCROLL_IDLE_MS = 1500  # Stop once no new cards have appeared for this long
+SCRAPER_SCROLL_MAX_CARDS = 500  # ...or once this many cards are on the page
+SCRAPER_SCROLL_MAX_SECONDS = 30  # ...or after this long regardless
+
+# Resource blocking in headless Chrome (set through DevTools on every driver)
+SCRAPER_BLOCK_RESOURCES = True
+SCRAPER_BLOCKED_RESOURCE_TYPES = ['Image', 'Font', 'Stylesheet', 'Media']  # Never read by the parsers
+SCRAPER_BLOCKED_URL_PATTERNS = [  # Analytics and ads
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*googlesyndication.com*', '*facebook.net*', '*hotjar.com*', '*adservice.google.*',
+]
+SCRAPER_SOURCE_RESOURCE_POLICY = {}  # Per-source overrides, e.g. {'LinkedIn': {'types': ['Image', 'Media']}}
+
+# Incremental crawling (core.scraping.watermark)
+SCRAPER_INCREMENTAL = True  # Stop paginating at the first page made up entirely of already-seen listings
+SCRAPER_RECENT_LISTINGS = 1000  # Newest listing identities remembered per source
+
+# Known-listing index (core.scraping.known); stored listings skip their detail page
+SCRAPER_DETAIL_MAX_AGE_HOURS = 168  # Reload a listing's detail page once its stored details are this old
+SCRAPER_KNOWN_LISTINGS_REFRESH = 300  # Seconds between top-ups of each process's index from the database
+
+# Bulk ingestion of scraped records (core.ingest)
+SCRAPER_INGEST_CHUNK_SIZE = 500  # Records de-duplicated, compared and upserted per transaction
+SCRAPER_INGEST_BATCH_SIZE = 100  # Rows per INSERT ... ON CONFLICT statement within a chunk
+
+# Scrape run ledger (core.ledger; browse it under ScrapeRun / SourceRun in the admin)
+SCRAPER_RUN_RETENTION_DAYS = 90  # Enforced nightly by core.tasks.prune_scrape_runs_task (see CRONJOBS)
+
+# Opt-in profiling (core.profiling; --profile on the scraping commands, profile=True on the scrape tasks)
+SCRAPER_PROFILE_DIR = BASE_DIR / 'profiles'  # One run-<id>/ directory of .prof/.tracemalloc/.json dumps per run
+SCRAPER_PROFILE_MEMORY = True  # Also trace allocations with tracemalloc (slower, but shows peak memory)
+SCRAPER_PROFILE_MEMORY_FRAMES = 10  # Stack depth kept per traced allocation
+
+# Offline parser benchmark (core.benchmark; manage.py benchmark_parsers)
+SCRAPER_BENCHMARK_CORPUS = BASE_DIR / 'benchmarks' / 'corpus'  # Directory of <ScraperClass>.html listing pages
+SCRAPER_BENCHMARK_HISTORY = BASE_DIR / 'benchmarks' / 'parsers.jsonl'  # One JSON line per saved run
+SCRAPER_BENCHMARK_TOLERANCE = 0.2  # Slowdown or memory growth (fraction) reported as a regression
+
+# Mock sources for load tests (core.mock_sources; manage.py mock_sources)
+SCRAPER_MOCK_SERVER = ''  # e.g. 'http://127.0.0.1:8765' sends every scraper request to the mock server
+SCRAPER_BASE_URL_OVERRIDES = {}  # Per-site redirects, e.g. {'https://www.indeed.com': 'http://127.0.0.1:8765/www.indeed.com'}
+
+# Metrics endpoint (core.metrics). Set the PROMETHEUS_MULTIPROC_DIR environment variable
+# to one shared, empty directory for the web server and Celery workers to aggregate across processes
+METRICS_ENABLED = True  # Serve /metrics; needs prometheus-client installed
+
 # Cronjob settings
 CRONJOBS = [
     ('0 */6 * * *', 'jobs.cron.scrape_jobs'),
     ('0 */12 * * *', 'scholarships.cron.scrape_scholarships'),
+    ('30 3 * * *', 'core.tasks.prune_page_archive_task'),  # Runs in the cron process, no worker needed
+    ('45 3 * * *', 'core.tasks.prune_scrape_runs_task'),
 ]
 
 # Tailwind configuration
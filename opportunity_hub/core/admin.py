@@ -1,3 +1,46 @@
 from django.contrib import admin
+from .models import ScrapeRun, SourceRun, SourceState
 
-# Register your models here.
+@admin.register(SourceState)
+class SourceStateAdmin(admin.ModelAdmin):
+    list_display = ('source', 'fetch_strategy', 'strategy_checked_at', 'stealth_level', 'last_blocked_at', 'updated_at')
+    list_filter = ('fetch_strategy', 'stealth_level')
+    search_fields = ('source',)
+    ordering = ('source',)
+
+
+SOURCE_RUN_FIELDS = (
+    'source', 'pages_fetched', 'cards_found', 'records_extracted', 'created', 'updated', 'unchanged',
+    'errors', 'bytes_transferred', 'fetch_seconds', 'parse_seconds', 'persist_seconds',
+)
+
+
+class SourceRunInline(admin.TabularInline):
+    model = SourceRun
+    fields = SOURCE_RUN_FIELDS
+    readonly_fields = SOURCE_RUN_FIELDS
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ScrapeRun)
+class ScrapeRunAdmin(admin.ModelAdmin):
+    list_display = ('started_at', 'kind', 'status', 'duration', 'finished_at')
+    list_filter = ('kind', 'status')
+    date_hierarchy = 'started_at'
+    readonly_fields = ('kind', 'status', 'started_at', 'finished_at')
+    inlines = [SourceRunInline]
+
+
+@admin.register(SourceRun)
+class SourceRunAdmin(admin.ModelAdmin):
+    # Filter by source and sort a column to spot slow or degrading sources
+    list_display = ('run',) + SOURCE_RUN_FIELDS + ('wall_seconds',)
+    list_filter = ('source', 'run__kind')
+    list_select_related = ('run',)
+    search_fields = ('source',)
+    readonly_fields = ('run',) + SOURCE_RUN_FIELDS
+    date_hierarchy = 'run__started_at'
@@ -0,0 +1,213 @@
+"""
+Offline benchmark of every scraper's page parsing.
+
+The corpus is listing pages named ``<ScraperClass>.html`` (or
+``debug_<ScraperClass>.html``, as the scrapers' debug dumps are named) under
+``SCRAPER_BENCHMARK_CORPUS``, pages synthesised from the field specs of
+scrapers with an Extractor (see core.mock_sources), and optionally a day of
+the page archive. Each scraper's ``parse_page``
+runs over its pages once per installed parser backend, never touching the
+network or the database. Runs are appended to ``SCRAPER_BENCHMARK_HISTORY``
+(JSON lines) and compared with the previous run of the same scraper and
+backend to catch regressions. Run it with ``manage.py benchmark_parsers``.
+"""
+import json
+import logging
+import platform
+import re
+import subprocess
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from core.scraping.fetch import listing_scrapers
+from core.scraping.parsing import BACKENDS, _backend, count_cards
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_NAME = re.compile(r'^(?:debug_)?(\w+)\.html$')
+
+
+def installed_backends():
+    """Parser backends whose library is importable (the rest would silently fall back)"""
+    return [name for name in BACKENDS if _backend(name) is BACKENDS[name][0]]
+
+
+def _scrapers_by_class():
+    return {cls.__name__: cls for cls in listing_scrapers().values()}
+
+
+def _synthetic_pages(cls, pages, per_page):
+    from core.mock_sources import synthetic_page
+
+    try:
+        host = urlsplit(cls().page_urls(1)[0]).netloc
+    except Exception as e:
+        logger.warning(f"Can't build {cls.__name__} page URLs for synthetic pages: {str(e)}")
+        return []
+    return [synthetic_page(cls, host, page, per_page) for page in range(pages)]
+
+
+def load_corpus(directory=None, archive=None, day=None, synthetic=0, per_page=20):
+    """
+    Map scraper class to the HTML of its listing pages.
+
+    ``directory`` defaults to ``SCRAPER_BENCHMARK_CORPUS``; with an
+    ``archive`` (see core.scraping.archive) and ``day``, that day's archived
+    pages are added under their source's scraper. ``synthetic`` pages of
+    ``per_page`` cards each are added for every scraper with an Extractor.
+    """
+    directory = Path(directory or getattr(settings, 'SCRAPER_BENCHMARK_CORPUS', settings.BASE_DIR))
+    by_class = _scrapers_by_class()
+    corpus = defaultdict(list)
+    for path in sorted(directory.glob('*.html')):
+        match = CAPTURE_NAME.match(path.name)
+        cls = by_class.get(match.group(1)) if match else None
+        if cls is not None:
+            corpus[cls].append(path.read_text(encoding='utf-8', errors='replace'))
+    if archive is not None and day is not None:
+        by_source = {cls.source_name: cls for cls in by_class.values()}
+        for entry in archive.entries(day):
+            cls = by_source.get(entry.get('source'))
+            if cls is not None:
+                corpus[cls].append(archive.load(entry['sha256']))
+    if synthetic:
+        for cls in by_class.values():
+            if getattr(cls, 'extractor', None) is not None:
+                corpus[cls].extend(_synthetic_pages(cls, synthetic, per_page))
+    return {cls: pages for cls, pages in corpus.items() if pages}
+
+
+def _parse_all(scraper, pages):
+    records = 0
+    with count_cards() as cards:
+        for html in pages:
+            records += len(scraper.parse_page(html))
+    return records, cards[0]
+
+
+def benchmark(cls, pages, backend, repeat=3):
+    """
+    Parse ``pages`` with one scraper and backend; the fastest of ``repeat`` timed passes counts.
+
+    Peak memory comes from an extra pass under tracemalloc, so tracing
+    never slows the timed passes.
+    """
+    scraper = cls()
+    scraper.offline = True
+    with override_settings(SCRAPER_HTML_PARSER=backend):
+        best = None
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            records, cards = _parse_all(scraper, pages)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        _parse_all(scraper, pages)
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+        if not tracing:
+            tracemalloc.stop()
+
+    best = max(best, 1e-9)
+    return {
+        'scraper': cls.__name__,
+        'source': cls.source_name,
+        'backend': backend,
+        'pages': len(pages),
+        'cards': cards,
+        'records': records,
+        'seconds': round(best, 6),
+        'pages_per_second': round(len(pages) / best, 2),
+        'records_per_second': round(records / best, 2),
+        'peak_memory': peak,
+    }
+
+
+def run(corpus, backends=None, repeat=3):
+    """Benchmark every scraper in the corpus with every backend"""
+    backends = backends or installed_backends()
+    return [
+        benchmark(cls, pages, backend, repeat)
+        for cls, pages in sorted(corpus.items(), key=lambda item: item[0].__name__)
+        for backend in backends
+    ]
+
+
+def _history_path(path=None):
+    return Path(path or getattr(settings, 'SCRAPER_BENCHMARK_HISTORY',
+                                settings.BASE_DIR / 'benchmarks' / 'parsers.jsonl'))
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def last_run(path=None):
+    """The most recent run in the history file, or None"""
+    path = _history_path(path)
+    if not path.exists():
+        return None
+    last = None
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                last = json.loads(line)
+    return last
+
+
+def save_run(results, path=None):
+    """Append a run to the history file and return it"""
+    path = _history_path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    entry = {
+        'at': timezone.now().isoformat(),
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'results': results,
+    }
+    with open(path, 'a') as f:
+        f.write(json.dumps(entry) + '\n')
+    return entry
+
+
+def regressions(results, previous, tolerance=None):
+    """
+    Describe every result that got slower or hungrier than in ``previous``.
+
+    A drop in pages/s or a rise in peak memory beyond ``tolerance``
+    (``SCRAPER_BENCHMARK_TOLERANCE``, a fraction) counts. Results over a
+    different number of pages aren't compared.
+    """
+    if not previous:
+        return []
+    if tolerance is None:
+        tolerance = getattr(settings, 'SCRAPER_BENCHMARK_TOLERANCE', 0.2)
+    before = {(r['scraper'], r['backend']): r for r in previous.get('results', [])}
+    found = []
+    for result in results:
+        old = before.get((result['scraper'], result['backend']))
+        if old is None or old['pages'] != result['pages']:
+            continue
+        label = f"{result['scraper']} ({result['backend']})"
+        if result['pages_per_second'] < old['pages_per_second'] * (1 - tolerance):
+            found.append(f"{label}: {old['pages_per_second']} -> {result['pages_per_second']} pages/s")
+        if result['peak_memory'] > old['peak_memory'] * (1 + tolerance):
+            found.append(f"{label}: peak memory {old['peak_memory']} -> {result['peak_memory']} bytes")
+    return found
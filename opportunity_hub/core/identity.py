@@ -0,0 +1,107 @@
+import hashlib
+import logging
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that only say how a visitor got to a page
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'igshid', '_ga', '_gl',
+    'ref', 'ref_', 'referrer', 'trk', 'trkinfo', 'trackingid', 'refid', 'position', 'pagenum',
+    'from', 'tk',
+}
+TRACKING_PREFIXES = ('utm_', 'pk_', 'hsa_')
+
+
+def _is_tracking(name):
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def normalize_url(url):
+    """
+    Canonical form of a listing URL.
+
+    Lower-cases the scheme and host, drops ``www.``, default ports, the
+    fragment, tracking parameters and trailing slashes, and sorts what is
+    left of the query, so the same listing reached through different links
+    normalizes to the same string.
+    """
+    url = (url or '').strip()
+    if not url:
+        return ''
+    parts = urlsplit(url if '//' in url else f'//{url}')
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    port = parts.port
+    if port and (parts.scheme, port) not in (('http', 80), ('https', 443)):
+        host = f'{host}:{port}'
+    query = sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if not _is_tracking(name))
+    path = parts.path.rstrip('/')
+    if not host:
+        # Relative link; nothing to canonicalize but the path and query
+        return urlunsplit(('', '', path, urlencode(query), ''))
+    return urlunsplit(('https' if parts.scheme in ('http', 'https', '') else parts.scheme.lower(),
+                       host, path, urlencode(query), ''))
+
+
+def listing_identity(source, url, *fields):
+    """
+    Hash identifying one listing on one source.
+
+    Built from the source, the normalized URL and ``fields``, e.g. title and
+    organization. Many sources link every listing to the same page (a
+    careers or programme overview page, an API placeholder), and nothing
+    about such a URL says it is shared, so the fields are always hashed in:
+    listings only share an identity when their link and their fields match.
+    """
+    parts = [(source or '').strip().lower(), normalize_url(url)]
+    parts += [' '.join(str(value or '').lower().split()) for value in fields]
+    return hashlib.blake2b('\x1f'.join(parts).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def merge_duplicates(model, application_model, foreign_key, identity_of):
+    """
+    Recompute every row's identity and merge rows that now share one.
+
+    The newest row of each group is kept; users' applications to the
+    others are moved onto it unless they already applied to it. Works
+    with both real and migration-state models. Returns (updated, merged).
+    """
+    identities = {}
+    keep = {}
+    for row in model.objects.order_by('-id').iterator():
+        identity = identity_of(row)
+        identities[row.id] = (row, identity)
+        keep.setdefault(identity, row.id)
+
+    merged = 0
+    for row_id, (row, identity) in identities.items():
+        kept = keep[identity]
+        if kept == row_id:
+            continue
+        fk = f'{foreign_key}_id'
+        for application in application_model.objects.filter(**{fk: row_id}):
+            if application_model.objects.filter(user_id=application.user_id, **{fk: kept}).exists():
+                application.delete()
+            else:
+                setattr(application, fk, kept)
+                application.save(update_fields=[foreign_key])
+        row.delete()
+        merged += 1
+
+    changed = [row for row_id, (row, identity) in identities.items()
+               if keep[identity] == row_id and row.identity != identity]
+    # Two passes so rows swapping identities never collide on the unique index
+    for row in changed:
+        row.identity = f'~{row.id}'
+    model.objects.bulk_update(changed, ['identity'], batch_size=500)
+    for row in changed:
+        row.identity = identities[row.id][1]
+    model.objects.bulk_update(changed, ['identity'], batch_size=500)
+
+    if merged or changed:
+        logger.info(f"{model.__name__}: {len(changed)} identities updated, {merged} duplicates merged")
+    return len(changed), merged
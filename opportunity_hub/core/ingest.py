@@ -0,0 +1,140 @@
+import logging
+from dataclasses import dataclass
+from itertools import islice
+
+from django.conf import settings
+from django.db import models, transaction
+
+from core.metrics import INGEST_BATCH_SECONDS, INGEST_ROWS, timed
+from core.profiling import stage
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IngestResult:
+    """How many rows a batch created, changed or found already up to date"""
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    def __add__(self, other):
+        return IngestResult(
+            self.created + other.created,
+            self.updated + other.updated,
+            self.unchanged + other.unchanged,
+        )
+
+    @property
+    def total(self):
+        return self.created + self.updated + self.unchanged
+
+    def __str__(self):
+        return f"{self.created} created, {self.updated} updated, {self.unchanged} unchanged"
+
+
+def unique_key(model):
+    """Fields of the model's first unique constraint, which upserts conflict on"""
+    for constraint in model._meta.constraints:
+        if isinstance(constraint, models.UniqueConstraint) and constraint.fields:
+            return tuple(constraint.fields)
+    raise ValueError(f"{model.__name__} has no unique constraint to upsert on")
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _clean(model, record):
+    """Coerce scraped values to what the model stores, e.g. datetimes for a DateField"""
+    cleaned = {}
+    for name, value in record.items():
+        field = model._meta.get_field(name)
+        cleaned[field.attname] = None if value is None else field.to_python(value)
+    return cleaned
+
+
+def _write_chunk(model, records, key, batch_size):
+    """Upsert one chunk of cleaned records, skipping rows that are already up to date"""
+    records = {tuple(record[name] for name in key): record for record in records}
+    fields = sorted({name for record in records.values() for name in record} - set(key))
+
+    # Only the first key field can go in an IN clause; the rest are matched here
+    lookup = {f'{key[0]}__in': {values[0] for values in records}}
+    existing = {
+        tuple(row[name] for name in key): row
+        for row in model.objects.filter(**lookup).values(*key, *fields)
+    }
+
+    result = IngestResult()
+    changed = []
+    for values, record in records.items():
+        current = existing.get(values)
+        if current is None:
+            result.created += 1
+        elif all(current[name] == value for name, value in record.items()):
+            result.unchanged += 1
+            continue
+        else:
+            result.updated += 1
+        changed.append(model(**record))
+
+    if changed:
+        update_fields = [
+            field.name for field in model._meta.concrete_fields
+            if field.attname in fields or getattr(field, 'auto_now', False)
+        ]
+        model.objects.bulk_create(
+            changed,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=key,
+            update_fields=update_fields,
+        )
+    return result
+
+
+def ingest(model, records, unique_fields=None, chunk_size=None):
+    """
+    Insert or update scraped records in bulk.
+
+    Models with an ``identity_of`` classmethod get their canonical identity
+    (see ``core.identity``) filled in first. Records are de-duplicated
+    within each chunk (the last one wins), compared against what is
+    already stored so untouched rows aren't rewritten, and the rest are
+    written with one upsert per chunk. Works on any iterable, including a
+    scraper's stream, holding at most ``SCRAPER_INGEST_CHUNK_SIZE``
+    records at a time.
+    """
+    key = tuple(unique_fields or unique_key(model))
+    chunk_size = chunk_size or getattr(settings, 'SCRAPER_INGEST_CHUNK_SIZE', 500)
+    batch_size = getattr(settings, 'SCRAPER_INGEST_BATCH_SIZE', 100)
+    key_attnames = tuple(model._meta.get_field(name).attname for name in key)
+
+    result = IngestResult()
+    for chunk in _chunks(records, chunk_size):
+        cleaned = []
+        for record in chunk:
+            try:
+                if hasattr(model, 'identity_of'):
+                    record = {**record, 'identity': model.identity_of(record)}
+                record = _clean(model, record)
+                missing = [name for name in key_attnames if record.get(name) is None]
+                missing += [name for name, value in record.items()
+                            if value is None and not model._meta.get_field(name).null]
+                if missing:
+                    raise ValueError(f"missing {', '.join(missing)}")
+                cleaned.append(record)
+            except Exception as e:
+                logger.error(f"Skipping invalid {model.__name__} record: {str(e)}")
+        if cleaned:
+            # Read and write under one transaction so the counts match what was stored
+            with stage('persist'), timed(INGEST_BATCH_SECONDS, model.__name__), transaction.atomic():
+                chunk_result = _write_chunk(model, cleaned, key_attnames, batch_size)
+            for outcome in ('created', 'updated', 'unchanged'):
+                INGEST_ROWS.labels(model.__name__, outcome).inc(getattr(chunk_result, outcome))
+            result += chunk_result
+    logger.info(f"Ingested {model.__name__}: {result}")
+    return result
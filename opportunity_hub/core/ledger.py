@@ -0,0 +1,79 @@
+import logging
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from core.ingest import IngestResult, ingest
+from core.models import ScrapeRun, SourceRun
+from core.scraping.fetch import listing_scrapers
+from core.scraping.watermark import incremental_enabled, remember_listings
+
+logger = logging.getLogger(__name__)
+
+
+def start_run(kind):
+    """Open a ScrapeRun and return its id, which tasks pass along to their subtasks"""
+    return ScrapeRun.objects.create(kind=kind).pk
+
+
+def record_source(run_id, source, **counts):
+    """
+    Add counts (see SourceRun's fields) to a source's row for a run.
+
+    Page subtasks of the same run report concurrently from different
+    workers, so the counters are incremented in the database.
+    """
+    if run_id is None:
+        return
+    counts = {name: value for name, value in counts.items() if value}
+    SourceRun.objects.get_or_create(run_id=run_id, source=source)
+    if counts:
+        SourceRun.objects.filter(run_id=run_id, source=source).update(
+            **{name: F(name) + value for name, value in counts.items()}
+        )
+
+
+def record_scraper(run_id, scraper):
+    """Write what a scraper instance has counted since it last reported"""
+    record_source(run_id, scraper.source_name, **scraper.stats.take())
+
+
+def ingest_for_run(run_id, model, records):
+    """
+    Ingest records source by source, recording each source's counts and persist time.
+
+    Once a listing scraper's records are stored they join its high-water
+    mark (see core.scraping.watermark), so the next run can stop at them.
+    """
+    by_source = defaultdict(list)
+    for record in records:
+        by_source[record.get('source_website') or 'Unknown'].append(record)
+
+    scrapers = listing_scrapers() if incremental_enabled() and hasattr(model, 'identity_of') else {}
+    total = IngestResult()
+    for source, source_records in by_source.items():
+        started = time.monotonic()
+        result = ingest(model, source_records)
+        record_source(run_id, source, created=result.created, updated=result.updated,
+                      unchanged=result.unchanged, persist_seconds=time.monotonic() - started)
+        if source in scrapers:
+            remember_listings(source, [model.identity_of(record) for record in source_records])
+        total += result
+    return total
+
+
+def finish_run(run_id, status=ScrapeRun.SUCCESS):
+    if run_id is not None:
+        ScrapeRun.objects.filter(pk=run_id).update(status=status, finished_at=timezone.now())
+
+
+def prune_runs(days=None):
+    """Delete runs older than SCRAPER_RUN_RETENTION_DAYS; returns how many went"""
+    days = days or getattr(settings, 'SCRAPER_RUN_RETENTION_DAYS', 90)
+    cutoff = timezone.now() - timezone.timedelta(days=days)
+    deleted, _ = ScrapeRun.objects.filter(started_at__lt=cutoff).delete()
+    logger.info(f"Pruned scrape runs older than {days} days ({deleted} rows)")
+    return deleted
@@ -0,0 +1,111 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import benchmark
+from core.scraping.archive import get_archive
+from core.scraping.parsing import BACKENDS
+
+
+class Command(BaseCommand):
+    help = 'Benchmark every scraper\'s page parsing over recorded and synthetic listing pages, offline'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--corpus',
+            help='Directory of <ScraperClass>.html listing pages (defaults to SCRAPER_BENCHMARK_CORPUS)',
+            default=None
+        )
+        parser.add_argument(
+            '--synthetic-pages',
+            type=int,
+            help='Pages synthesised for each scraper with an Extractor (0 to benchmark recorded pages only)',
+            default=5
+        )
+        parser.add_argument(
+            '--archive-date',
+            help='Also benchmark the pages archived on this day (YYYY-MM-DD)',
+            default=None
+        )
+        parser.add_argument(
+            '--scraper',
+            help='Only benchmark this scraper class, e.g. "CheetahScraper"',
+            default=None
+        )
+        parser.add_argument(
+            '--backend',
+            action='append',
+            choices=list(BACKENDS),
+            help='Parser backend to benchmark (repeatable; defaults to every installed one)'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            help='Timed passes per scraper and backend; the fastest counts',
+            default=3
+        )
+        parser.add_argument(
+            '--no-save',
+            action='store_true',
+            help='Don\'t append this run to SCRAPER_BENCHMARK_HISTORY'
+        )
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Exit with an error if anything regressed since the last saved run'
+        )
+        parser.add_argument(
+            '--allow-empty',
+            action='store_true',
+            help='Don\'t fail when a scraper finds no cards in its pages (block pages, changed markup)'
+        )
+
+    def handle(self, *args, **options):
+        archive, day = None, None
+        if options['archive_date']:
+            archive = get_archive()
+            if archive is None:
+                raise CommandError('Page archiving is disabled (SCRAPER_ARCHIVE_ENABLED)')
+            try:
+                day = date.fromisoformat(options['archive_date'])
+            except ValueError:
+                raise CommandError(f"Invalid date: {options['archive_date']}")
+
+        corpus = benchmark.load_corpus(options['corpus'], archive, day, synthetic=options['synthetic_pages'])
+        if options['scraper']:
+            corpus = {cls: pages for cls, pages in corpus.items() if cls.__name__ == options['scraper']}
+        if not corpus:
+            raise CommandError('No listing pages for any listing scraper')
+
+        backends = options['backend'] or benchmark.installed_backends()
+        missing = set(backends) - set(benchmark.installed_backends())
+        if missing:
+            raise CommandError(f"Parser backend not installed: {', '.join(sorted(missing))}")
+
+        results = benchmark.run(corpus, backends, options['repeat'])
+        for result in results:
+            self.stdout.write(
+                f"{result['scraper']:<36} {result['backend']:<12} "
+                f"{result['pages']:>3} pages {result['cards']:>5} cards {result['records']:>5} records  "
+                f"{result['pages_per_second']:>9.1f} pages/s {result['records_per_second']:>10.1f} records/s  "
+                f"peak {result['peak_memory'] / 1024:>8.0f} KiB"
+            )
+
+        # A page without cards (a block page, a 404, changed markup) times nothing worth comparing
+        empty = sorted({result['scraper'] for result in results if not result['cards']})
+        for name in empty:
+            self.stdout.write(self.style.WARNING(f'No cards found in any {name} page'))
+        results = [result for result in results if result['cards']]
+        for name in sorted({result['scraper'] for result in results if not result['records']}):
+            self.stdout.write(self.style.WARNING(f'{name} found cards but extracted no records'))
+
+        found = benchmark.regressions(results, benchmark.last_run())
+        for line in found:
+            self.stdout.write(self.style.WARNING(f'Regression: {line}'))
+        if results and not options['no_save']:
+            benchmark.save_run(results)
+            self.stdout.write(self.style.SUCCESS(f'Benchmarked {len(results)} scraper/backend pairs; saved to history'))
+        if empty and not options['allow_empty']:
+            raise CommandError(f"No cards found for {', '.join(empty)}")
+        if found and options['check']:
+            raise CommandError(f'{len(found)} benchmark regressions')
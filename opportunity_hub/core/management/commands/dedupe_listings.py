@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.identity import merge_duplicates
+from jobs.models import JobApplication, JobListing
+from scholarships.models import Scholarship, ScholarshipApplication
+
+
+class Command(BaseCommand):
+    help = 'Recompute canonical listing identities and merge listings that share one'
+
+    def handle(self, *args, **options):
+        # Re-run after changing URL normalization (e.g. core.identity.TRACKING_PARAMS)
+        for model, application_model, foreign_key in [
+            (JobListing, JobApplication, 'job'),
+            (Scholarship, ScholarshipApplication, 'scholarship'),
+        ]:
+            fields = model.IDENTITY_FIELDS
+            with transaction.atomic():
+                updated, merged = merge_duplicates(
+                    model, application_model, foreign_key,
+                    lambda row: model.identity_of({name: getattr(row, name) for name in fields}),
+                )
+            self.stdout.write(self.style.SUCCESS(
+                f'{model._meta.verbose_name_plural}: {updated} identities updated, {merged} duplicates merged'
+            ))
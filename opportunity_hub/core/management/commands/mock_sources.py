@@ -0,0 +1,110 @@
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Sum
+from django.test.utils import override_settings
+
+from core.mock_sources import MockConfig, MockSourceServer
+from core.models import ScrapeRun
+
+PIPELINES = ['jobs', 'scholarships', 'api']
+
+
+class Command(BaseCommand):
+    help = (
+        'Serve recorded and synthetic listing pages in place of the real sites. With --run, '
+        'run the scraping pipelines against them and report records/s '
+        '(they write to the configured database, so point it at a scratch one)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1', help='Address to listen on')
+        parser.add_argument('--port', type=int, default=8765, help='Port to listen on (0 picks a free one)')
+        parser.add_argument('--pages', type=int, default=5, help='Result pages per source before results run out')
+        parser.add_argument('--per-page', type=int, default=10, help='Listings per result page')
+        parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+        parser.add_argument('--jitter', type=float, default=0.0, help='Up to this many extra random seconds')
+        parser.add_argument('--error-rate', type=float, default=0.0, help='Share of requests that fail')
+        parser.add_argument('--error-status', type=int, default=503, help='HTTP status of failed requests')
+        parser.add_argument('--captcha-rate', type=float, default=0.0, help='Share of pages replaced by a CAPTCHA')
+        parser.add_argument('--seed', type=int, default=None, help='Seed for the error and CAPTCHA dice')
+        parser.add_argument(
+            '--corpus',
+            default=None,
+            help='Directory of recorded <ScraperClass>.html pages (defaults to SCRAPER_BENCHMARK_CORPUS)'
+        )
+        parser.add_argument(
+            '--run',
+            action='append',
+            choices=PIPELINES,
+            help='Run this pipeline eagerly against the mock and exit (repeatable)'
+        )
+
+    def handle(self, *args, **options):
+        config = MockConfig(
+            pages=options['pages'],
+            per_page=options['per_page'],
+            latency=options['latency'],
+            jitter=options['jitter'],
+            error_rate=options['error_rate'],
+            error_status=options['error_status'],
+            captcha_rate=options['captcha_rate'],
+            seed=options['seed'],
+        )
+        try:
+            server = MockSourceServer(config, options['host'], options['port'], options['corpus'])
+        except OSError as e:
+            raise CommandError(f"Can't listen on {options['host']}:{options['port']}: {str(e)}")
+
+        if not options['run']:
+            self.stdout.write(f'Mock sources listening on {server.url}')
+            self.stdout.write(f"Point the scrapers at it with SCRAPER_MOCK_SERVER = '{server.url}'")
+            try:
+                server.httpd.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                server.httpd.server_close()
+            return
+
+        with server, override_settings(SCRAPER_MOCK_SERVER=server.url):
+            for pipeline in options['run']:
+                self.report(pipeline, *self.run_pipeline(pipeline, options['pages']))
+
+    def run_pipeline(self, pipeline, pages):
+        """Run one pipeline to completion; returns (seconds, its ScrapeRun)"""
+        from config.celery import app
+        from jobs.tasks import scrape_jobs_task
+        from scholarships.tasks import scrape_scholarships_task
+
+        previous = ScrapeRun.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+        eager = app.conf.task_always_eager
+        app.conf.task_always_eager = True
+        started = time.perf_counter()
+        try:
+            if pipeline == 'jobs':
+                scrape_jobs_task.apply(kwargs={'num_pages': pages})
+            elif pipeline == 'scholarships':
+                scrape_scholarships_task.apply(kwargs={'num_pages': pages})
+            else:
+                call_command('scrape_api', pages=pages, stdout=self.stdout)
+        finally:
+            app.conf.task_always_eager = eager
+        elapsed = time.perf_counter() - started
+        return elapsed, ScrapeRun.objects.filter(pk__gt=previous).order_by('-pk').first()
+
+    def report(self, pipeline, elapsed, run):
+        if run is None:
+            self.stdout.write(self.style.WARNING(f'{pipeline}: no scrape run was recorded'))
+            return
+        totals = run.sources.aggregate(
+            extracted=Sum('records_extracted'), created=Sum('created'), updated=Sum('updated'),
+            unchanged=Sum('unchanged'), errors=Sum('errors'),
+        )
+        totals = {name: value or 0 for name, value in totals.items()}
+        saved = totals['created'] + totals['updated'] + totals['unchanged']
+        self.stdout.write(self.style.SUCCESS(
+            f"{pipeline}: {totals['extracted']} records extracted, {saved} saved in {elapsed:.2f}s "
+            f"({saved / elapsed:.1f} records/s, {totals['errors']} errors, run {run.pk} {run.status})"
+        ))
@@ -72,7 +72,8 @@ class Command(BaseCommand):
             salary_min = random.randint(50000, 100000)
             salary_max = salary_min + random.randint(20000, 50000)
 
-            job = JobListing.objects.create(
+            # Upsert on the listing identity so re-running never collides with earlier samples
+            fields = dict(
                 title=random.choice(job_titles),
                 company=random.choice(companies),
                 location=random.choice(locations),
@@ -90,6 +91,7 @@ class Command(BaseCommand):
                 application_url=f'https://example.com/jobs/{i+1}',
                 source_website='Example.com'
             )
+            job, _ = JobListing.objects.update_or_create(identity=JobListing.identity_of(fields), defaults=fields)
             jobs.append(job)
 
         # Create sample job applications
@@ -99,12 +101,14 @@ class Command(BaseCommand):
             random_jobs = random.sample(jobs, k=min(len(jobs), random.randint(2, 5)))
             for job in random_jobs:
                 status = random.choice(['SAVED', 'APPLIED', 'IN_PROGRESS'])
-                JobApplication.objects.create(
+                JobApplication.objects.update_or_create(
                     user=user,
                     job=job,
-                    status=status,
-                    applied_date=datetime.now() - timedelta(days=random.randint(1, 14)),
-                    notes=f'Sample application notes for {job.title}'
+                    defaults={
+                        'status': status,
+                        'applied_date': datetime.now() - timedelta(days=random.randint(1, 14)),
+                        'notes': f'Sample application notes for {job.title}'
+                    }
                 )
 
         # Sample data for scholarships
@@ -141,7 +145,7 @@ class Command(BaseCommand):
                 '$50,000 for entire program', '$10,000/semester'
             ]
 
-            scholarship = Scholarship.objects.create(
+            fields = dict(
                 title=f'{random.choice(organizations)} Scholarship Program {i+1}',
                 organization=random.choice(organizations),
                 description=f'This is a sample scholarship description for program {i+1}. '
@@ -159,6 +163,9 @@ class Command(BaseCommand):
                 website_url=f'https://example.com/scholarships/{i+1}',
                 source_website='Example.com'
             )
+            scholarship, _ = Scholarship.objects.update_or_create(
+                identity=Scholarship.identity_of(fields), defaults=fields
+            )
             scholarships.append(scholarship)
 
         # Create sample scholarship applications
@@ -168,12 +175,14 @@ class Command(BaseCommand):
             random_scholarships = random.sample(scholarships, k=min(len(scholarships), random.randint(2, 5)))
             for scholarship in random_scholarships:
                 status = random.choice(['SAVED', 'APPLIED', 'IN_PROGRESS'])
-                ScholarshipApplication.objects.create(
+                ScholarshipApplication.objects.update_or_create(
                     user=user,
                     scholarship=scholarship,
-                    status=status,
-                    applied_date=datetime.now() - timedelta(days=random.randint(1, 14)),
-                    notes=f'Sample application notes for {scholarship.title}'
+                    defaults={
+                        'status': status,
+                        'applied_date': datetime.now() - timedelta(days=random.randint(1, 14)),
+                        'notes': f'Sample application notes for {scholarship.title}'
+                    }
                 )
 
         self.stdout.write(self.style.SUCCESS('Successfully populated database with sample data'))
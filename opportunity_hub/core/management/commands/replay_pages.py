@@ -0,0 +1,99 @@
+import time
+from collections import Counter, defaultdict
+from datetime import date
+from functools import partial
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.profiling import profiled, stage
+from core.scraping.archive import get_archive
+from core.scraping.fetch import listing_scrapers
+
+
+class Command(BaseCommand):
+    help = 'Re-run scraper parsing over archived pages without touching the network'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--date',
+            help='Archive day to replay (YYYY-MM-DD, defaults to today)',
+            default=None
+        )
+        parser.add_argument(
+            '--source',
+            help='Only replay pages from this source, e.g. "Indeed"',
+            default=None
+        )
+        parser.add_argument(
+            '--show',
+            type=int,
+            help='Print this many parsed records per source',
+            default=0
+        )
+        parser.add_argument(
+            '--profile',
+            action='store_true',
+            help='Profile the run with cProfile and tracemalloc (dumps go to SCRAPER_PROFILE_DIR)'
+        )
+
+    def handle(self, *args, **options):
+        archive = get_archive()
+        if archive is None:
+            raise CommandError('Page archiving is disabled (SCRAPER_ARCHIVE_ENABLED)')
+
+        try:
+            day = date.fromisoformat(options['date']) if options['date'] else timezone.now().date()
+        except ValueError:
+            raise CommandError(f"Invalid date: {options['date']}")
+
+        parsers = {}
+        pages = defaultdict(int)
+        records = defaultdict(list)
+        skipped = Counter()
+        started = time.perf_counter()
+
+        with profiled(f'replay-{day}', enabled=options['profile']) as session:
+            for entry in archive.entries(day, source=options['source']):
+                source = entry.get('source')
+                if source not in parsers:
+                    parsers[source] = self.parser_for(source)
+                if parsers[source] is None:
+                    skipped[source] += 1
+                    continue
+
+                html = archive.load(entry['sha256'])
+                with stage('parse'):
+                    records[source].extend(parsers[source](html))
+                pages[source] += 1
+
+        elapsed = time.perf_counter() - started
+        if not pages and not skipped:
+            self.stdout.write(self.style.WARNING(f'No archived pages to replay for {day}'))
+            return
+
+        for source in sorted(pages):
+            self.stdout.write(f'{source}: {pages[source]} pages, {len(records[source])} records')
+            for record in records[source][:options['show']]:
+                self.stdout.write(f"  - {record.get('title')}")
+
+        for source, count in sorted(skipped.items(), key=lambda item: str(item[0])):
+            self.stdout.write(self.style.WARNING(f'Skipped {count} pages from {source}, which has no page parser'))
+        self.stdout.write(self.style.SUCCESS(
+            f'Replayed {sum(pages.values())} pages in {elapsed:.2f}s'
+        ))
+        for line in session.summary() if session else []:
+            self.stdout.write(line)
+
+    def parser_for(self, source):
+        """Function parsing one archived page of ``source`` into records, or None"""
+        from scholarships.scrapers.api_scraper import APIScholarshipScraper
+
+        registry = listing_scrapers()
+        if source in registry:
+            scraper = registry[source]()
+            scraper.offline = True
+            return scraper.parse_page
+        if source in APIScholarshipScraper.PAGE_PARSERS:
+            return partial(APIScholarshipScraper().parse_archived_page, source)
+        return None
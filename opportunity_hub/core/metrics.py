@@ -0,0 +1,136 @@
+"""
+Prometheus metrics for the scrapers and the busiest views.
+
+Metrics live in prometheus_client's default registry. With the standard
+``PROMETHEUS_MULTIPROC_DIR`` environment variable set (to the same empty
+directory for the web server and every Celery worker), each process writes
+its samples there and ``/metrics`` aggregates all of them. Without
+prometheus_client installed every metric is a no-op.
+"""
+import logging
+import os
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+logger = logging.getLogger(__name__)
+
+try:
+    import prometheus_client
+except ImportError:
+    prometheus_client = None
+
+# Page loads range from a fast static GET to a slow scrolled browser page
+FETCH_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+PARSE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+CARD_BUCKETS = (0, 1, 5, 10, 20, 25, 50, 100, 250, 500)
+VIEW_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+
+class _NoopMetric:
+    """Stands in for every metric type when prometheus_client isn't installed"""
+    def labels(self, *args, **kwargs):
+        return self
+
+    def observe(self, value):
+        pass
+
+    def inc(self, amount=1):
+        pass
+
+    def set(self, value):
+        pass
+
+
+def _metric(kind, name, documentation, labels, **kwargs):
+    if prometheus_client is None:
+        return _NoopMetric()
+    return getattr(prometheus_client, kind)(name, documentation, labels, **kwargs)
+
+
+PAGE_FETCH_SECONDS = _metric(
+    'Histogram', 'scraper_page_fetch_seconds', 'Time to fetch one listing page', ['source'],
+    buckets=FETCH_BUCKETS,
+)
+PAGE_PARSE_SECONDS = _metric(
+    'Histogram', 'scraper_page_parse_seconds', 'Time to parse one listing page', ['source'],
+    buckets=PARSE_BUCKETS,
+)
+CARDS_PER_PAGE = _metric(
+    'Histogram', 'scraper_cards_per_page', 'Listing cards found on one page', ['source'],
+    buckets=CARD_BUCKETS,
+)
+RECORDS_EXTRACTED = _metric(
+    'Counter', 'scraper_records_extracted', 'Records parsed out of listing pages', ['source'],
+)
+SCRAPE_ERRORS = _metric(
+    'Counter', 'scraper_errors', 'Failed page fetches, parses and detail loads', ['source', 'stage'],
+)
+INGEST_BATCH_SECONDS = _metric(
+    'Histogram', 'scraper_ingest_batch_seconds', 'Time to upsert one chunk of records', ['model'],
+)
+INGEST_ROWS = _metric(
+    'Counter', 'scraper_ingest_rows', 'Rows ingested, by outcome', ['model', 'outcome'],
+)
+BROWSER_POOL_LIVE = _metric(
+    'Gauge', 'scraper_browser_pool_live', 'Browsers running in the driver pool', ['pool'],
+    multiprocess_mode='livesum',
+)
+BROWSER_POOL_IN_USE = _metric(
+    'Gauge', 'scraper_browser_pool_in_use', 'Browsers checked out of the driver pool', ['pool'],
+    multiprocess_mode='livesum',
+)
+BROWSER_POOL_WAIT_SECONDS = _metric(
+    'Histogram', 'scraper_browser_pool_wait_seconds', 'Time spent waiting to check out a browser', ['pool'],
+)
+VIEW_SECONDS = _metric(
+    'Histogram', 'web_view_seconds', 'Response time of instrumented views', ['view'],
+    buckets=VIEW_BUCKETS,
+)
+
+
+def timed_view(name):
+    """Record a view's response time under ``name``, e.g. ``@timed_view('job_list')``"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            started = time.monotonic()
+            try:
+                return view(request, *args, **kwargs)
+            finally:
+                VIEW_SECONDS.labels(name).observe(time.monotonic() - started)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def timed(histogram, *labels):
+    """Observe how long the block took on a labelled histogram"""
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        histogram.labels(*labels).observe(time.monotonic() - started)
+
+
+def multiprocess_enabled():
+    return prometheus_client is not None and bool(os.environ.get('PROMETHEUS_MULTIPROC_DIR'))
+
+
+def render():
+    """Exposition-format text and content type for every process's metrics"""
+    from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, REGISTRY, generate_latest
+    if multiprocess_enabled():
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid=None):
+    """Drop an exited worker's live gauges from the multiprocess totals"""
+    if multiprocess_enabled():
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(pid or os.getpid())
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sourcestate',
+            name='last_blocked_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='sourcestate',
+            name='stealth_changed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='sourcestate',
+            name='stealth_level',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'Fast'), (1, 'Cautious'), (2, 'Human-like')], default=0),
+        ),
+    ]
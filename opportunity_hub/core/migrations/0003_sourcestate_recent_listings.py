@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_sourcestate_stealth'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sourcestate',
+            name='recent_listings',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
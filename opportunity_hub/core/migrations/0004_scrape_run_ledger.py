@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_sourcestate_recent_listings'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScrapeRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=50)),
+                ('status', models.CharField(choices=[('RUNNING', 'Running'), ('SUCCESS', 'Success'), ('FAILED', 'Failed')], default='RUNNING', max_length=20)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-started_at'],
+                'indexes': [models.Index(fields=['kind', 'started_at'], name='core_scrape_kind_bf57ab_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SourceRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=100)),
+                ('pages_fetched', models.PositiveIntegerField(default=0)),
+                ('cards_found', models.PositiveIntegerField(default=0)),
+                ('records_extracted', models.PositiveIntegerField(default=0)),
+                ('created', models.PositiveIntegerField(default=0)),
+                ('updated', models.PositiveIntegerField(default=0)),
+                ('unchanged', models.PositiveIntegerField(default=0)),
+                ('errors', models.PositiveIntegerField(default=0)),
+                ('bytes_transferred', models.PositiveBigIntegerField(default=0)),
+                ('fetch_seconds', models.FloatField(default=0)),
+                ('parse_seconds', models.FloatField(default=0)),
+                ('persist_seconds', models.FloatField(default=0)),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sources', to='core.scraperun')),
+            ],
+            options={
+                'ordering': ['run', 'source'],
+                'indexes': [models.Index(fields=['source', 'run'], name='core_source_source_0df0e1_idx')],
+                'constraints': [models.UniqueConstraint(fields=('run', 'source'), name='unique_source_run')],
+            },
+        ),
+    ]
@@ -0,0 +1,322 @@
+"""
+Local stand-in for the scraped sites, for end-to-end throughput tests.
+
+Point the scrapers at it with ``SCRAPER_MOCK_SERVER`` (see
+``core.scraping.redirect``); requests then arrive as
+``/<host>/<path>?<query>``. Listing pages of scrapers with an Extractor are
+synthesised from its field specs, other scrapers get their recorded
+``<ScraperClass>.html`` page from the benchmark corpus, CORDIS gets JSON and the other API
+sources a generic scholarship page. Latency, pagination, error and CAPTCHA
+rates are configurable. Run it with ``manage.py mock_sources``.
+"""
+import html
+import json
+import logging
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+from core.benchmark import load_corpus
+from core.scraping.fetch import listing_scrapers
+from core.scraping.parsing import simple_selector
+
+logger = logging.getLogger(__name__)
+
+CAPTCHA_PAGE = (
+    '<html><head><title>Security check</title></head><body>'
+    '<div id="challenge">Please verify you are a human to continue. CAPTCHA</div></body></html>'
+)
+EMPTY_PAGE = '<html><head><title>No results</title></head><body><p>No results found.</p></body></html>'
+
+
+@dataclass
+class MockConfig:
+    """How the mock sources behave; every rate is a probability per request"""
+    pages: int = 5
+    per_page: int = 10
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    captcha_rate: float = 0.0
+    seed: Optional[int] = None
+
+
+def _attributes(attrs):
+    return ''.join(f' {name}="{html.escape(str(value), quote=True)}"' for name, value in attrs.items())
+
+
+def _element(selector, text='', attrs=None):
+    """HTML matching a (descendant) CSS selector, with ``text`` and ``attrs`` on the innermost element"""
+    inner = html.escape(text)
+    parts = (selector or 'div').split()
+    for depth, part in enumerate(reversed(parts)):
+        tag, attr, value = simple_selector(part) or ('div', None, None)
+        element_attrs = dict(attrs or {}) if depth == 0 else {}
+        if attr is not None:
+            element_attrs[attr] = value or ''
+        inner = f'<{tag or "div"}{_attributes(element_attrs)}>{inner}</{tag or "div"}>'
+    return inner
+
+
+def _value(name, source, page, index):
+    """Plausible card text for a field, unique per page and card where that matters"""
+    if 'date' in name or 'deadline' in name:
+        return '2030-12-31'
+    if 'amount' in name or 'salary' in name:
+        return '$5,000'
+    if name == 'employment_type':
+        return 'Full-time'
+    if name == 'is_remote' or name == 'location':
+        return 'Remote'
+    return f"{source} {name.replace('_', ' ')} {page + 1}-{index + 1}"
+
+
+def synthetic_page(cls, host, page, per_page):
+    """A listing page whose cards match ``cls.extractor``, one element per distinct field selector"""
+    extractor = cls.extractor
+    cards = []
+    for index in range(per_page):
+        elements = defaultdict(lambda: {'text': '', 'attrs': {}, 'many': False})
+        for name, field in extractor.fields.items():
+            if field.selector is None:
+                continue
+            element = elements[field.selector]
+            element['many'] = element['many'] or field.many
+            if field.attr:
+                # Processed links are made absolute by the scraper, the rest must already be
+                path = f'/mock-listing/{page + 1}-{index + 1}'
+                element['attrs'][field.attr] = path if field.process else f'https://{host}{path}'
+            else:
+                element['text'] = _value(name, cls.source_name, page, index)
+        body = ''.join(
+            _element(selector, element['text'], element['attrs']) * (3 if element['many'] else 1)
+            for selector, element in elements.items()
+        )
+        tag, attr, value = simple_selector(extractor.card_selector) or ('div', None, None)
+        card_attrs = {attr: value or ''} if attr else {}
+        cards.append(f'<{tag or "div"}{_attributes(card_attrs)}>{body}</{tag or "div"}>')
+    return f'<html><head><title>{cls.source_name}</title></head><body>{"".join(cards)}</body></html>'
+
+
+def _page_counter(urls):
+    """
+    Find the number that counts pages in a scraper's page URLs.
+
+    Returns (position among the URL's integers, its value on the first
+    counted page, step, index of that page), or None when the URLs don't
+    differ by a single counter. Sites whose first page has no counter at
+    all (``/jobs`` then ``/jobs?p=2``) are counted from the second page.
+    """
+    for first_index in (0, 1):
+        numbers = [[int(n) for n in re.findall(r'\d+', url)] for url in urls[first_index:]]
+        if len(numbers) < 2 or len({len(n) for n in numbers}) != 1:
+            continue
+        for position in range(len(numbers[0])):
+            values = [n[position] for n in numbers]
+            step = values[1] - values[0]
+            if step and all(b - a == step for a, b in zip(values, values[1:])):
+                return position, values[0], step, first_index
+    return None
+
+
+class _Source:
+    """Listing pages of one scraper as served by the mock"""
+    def __init__(self, cls, pages, recorded):
+        self.cls = cls
+        self.recorded = recorded
+        try:
+            # A couple of pages past the last one, so requests for them are recognised too
+            urls = cls().page_urls(pages + 2)
+        except NotImplementedError:
+            urls = []
+        except Exception as e:
+            logger.warning(f"Mock sources can't build {cls.__name__} page URLs: {str(e)}")
+            urls = []
+        self.host = urlsplit(urls[0]).netloc if urls else None
+        self.page_keys = {self._key(url): number for number, url in enumerate(urls)}
+        self.counter = _page_counter(urls)
+
+    @staticmethod
+    def _key(url):
+        parts = urlsplit(url)
+        return f'{parts.path}?{parts.query}'
+
+    def page_number(self, path, query):
+        """Which result page a request is for; unrecognised URLs count as the first page"""
+        number = self.page_keys.get(f'{path}?{query}')
+        if number is not None:
+            return number
+        if self.counter is not None:
+            position, first, step, first_index = self.counter
+            numbers = [int(n) for n in re.findall(r'\d+', f'{path}?{query}')]
+            if len(numbers) > position:
+                return max(0, first_index + (numbers[position] - first) // step)
+        return 0
+
+    def render(self, page, per_page):
+        if getattr(self.cls, 'extractor', None) is not None:
+            return synthetic_page(self.cls, self.host, page, per_page)
+        if self.recorded:
+            return self.recorded[page % len(self.recorded)]
+        return EMPTY_PAGE
+
+
+class MockSources:
+    """
+    Turns a request path into a response; the HTTP server is a thin shell around it.
+
+    Every request waits ``latency`` (plus up to ``jitter``) seconds, then
+    fails with ``error_status`` or gets a CAPTCHA page at the configured
+    rates. Listing URLs beyond ``pages`` return a page without results.
+    """
+    def __init__(self, config=None, corpus=None):
+        from scholarships.scrapers.api_scraper import APIScholarshipScraper
+
+        self.config = config or MockConfig()
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        recorded = load_corpus(corpus)
+        self.sources = {}
+        for cls in listing_scrapers().values():
+            source = _Source(cls, self.config.pages, recorded.get(cls, []))
+            if source.host:
+                self.sources.setdefault(source.host, source)
+        self.detail_selectors = sorted({
+            cls.detail_selector for cls in listing_scrapers().values() if cls.detail_selector
+        })
+        self.cordis_host = urlsplit(APIScholarshipScraper.CORDIS_URL).netloc
+        self.api_hosts = {
+            urlsplit(url).netloc: name for name, url in (
+                ('DAAD', APIScholarshipScraper.DAAD_URL),
+                ('Erasmus+', APIScholarshipScraper.ERASMUS_URL),
+                ('Commonwealth', APIScholarshipScraper.COMMONWEALTH_URL),
+            )
+        }
+
+    def _roll(self, rate):
+        with self._lock:
+            return rate > 0 and self._random.random() < rate
+
+    def respond(self, target):
+        """(status, content type, body) for a request target such as ``/www.indeed.com/jobs?q=python``"""
+        config = self.config
+        if config.latency or config.jitter:
+            with self._lock:
+                extra = self._random.uniform(0, config.jitter) if config.jitter else 0
+            time.sleep(config.latency + extra)
+
+        parts = urlsplit(target)
+        host, _, path = parts.path.lstrip('/').partition('/')
+        path = '/' + path
+        if path == '/robots.txt':
+            return 200, 'text/plain', 'User-agent: *\nAllow: /\n'
+        if self._roll(config.error_rate):
+            return config.error_status, 'text/plain', 'Service unavailable'
+        if host == self.cordis_host:
+            return 200, 'application/json', json.dumps(self.cordis_page(parse_qs(parts.query)))
+        if self._roll(config.captcha_rate):
+            return 200, 'text/html', CAPTCHA_PAGE
+        if path.startswith('/mock-listing/'):
+            return 200, 'text/html', self.detail_page(host, path)
+        if host in self.api_hosts:
+            return 200, 'text/html', self.api_page(self.api_hosts[host])
+        source = self.sources.get(host)
+        if source is None:
+            return 404, 'text/plain', f'No mock source for {host}'
+        page = source.page_number(path, parts.query)
+        if page >= config.pages:
+            return 200, 'text/html', EMPTY_PAGE
+        return 200, 'text/html', source.render(page, config.per_page)
+
+    def detail_page(self, host, path):
+        text = f'Mock details for {host}{path}. Requirements: Python, SQL, 3+ years of experience.'
+        body = ''.join(_element(selector, text) for selector in self.detail_selectors)
+        return f'<html><body>{body}</body></html>'
+
+    def api_page(self, name):
+        # Matches the DAAD, Erasmus+ and Commonwealth parsers of APIScholarshipScraper alike
+        items = ''.join(
+            f'<article class="scholarship-result programme">'
+            f'<h3 class="title"><a href="/mock-listing/{index + 1}">{name} Mock Scholarship {index + 1}</a></h3>'
+            f'<p class="description text">Synthetic {name} scholarship for load tests.</p></article>'
+            for index in range(self.config.per_page)
+        )
+        return f'<html><body>{items}</body></html>'
+
+    def cordis_page(self, query):
+        page = int(query.get('page', ['1'])[0])
+        limit = int(query.get('limit', [str(self.config.per_page)])[0])
+        if page > self.config.pages:
+            return {'results': [], 'page': page}
+        results = [
+            {
+                'title': {'en': f'Mock EU grant {page}-{index + 1}'},
+                'fundingBody': 'European Commission',
+                'description': {'en': 'Synthetic grant for load tests.'},
+                'eligibilityCriteria': {'en': 'Open to researchers in EU member states.'},
+                'fundingInformation': {'maxAmount': 50000, 'fundingRate': 100},
+                'topic': {'type': 'RESEARCH', 'name': {'en': 'Computer Science'}},
+                'deadline': {'date': '2030-12-31', 'status': 'OPEN'},
+                'callUrl': f'https://{self.cordis_host}/mock-listing/{page}-{index + 1}',
+            }
+            for index in range(limit)
+        ]
+        return {'results': results, 'page': page}
+
+
+class MockSourceServer:
+    """
+    Serve ``MockSources`` over HTTP from a background thread.
+
+    ``port=0`` picks a free port; ``url`` is what ``SCRAPER_MOCK_SERVER``
+    should be set to.
+    """
+    def __init__(self, config=None, host='127.0.0.1', port=0, corpus=None):
+        self.sources = MockSources(config, corpus)
+        sources = self.sources
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, content_type, body = sources.respond(self.path)
+                data = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='mock-sources', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
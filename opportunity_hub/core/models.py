@@ -1,3 +1,100 @@
 from django.db import models
 
-# Create your models here.
+
+class SourceState(models.Model):
+    """Per-source scraping state that should survive between runs"""
+    STATIC = 'STATIC'
+    BROWSER = 'BROWSER'
+    FETCH_STRATEGY_CHOICES = [
+        (STATIC, 'Static HTML'),
+        (BROWSER, 'Headless browser'),
+    ]
+
+    FAST = 0
+    CAUTIOUS = 1
+    HUMAN = 2
+    STEALTH_LEVEL_CHOICES = [
+        (FAST, 'Fast'),
+        (CAUTIOUS, 'Cautious'),
+        (HUMAN, 'Human-like'),
+    ]
+
+    source = models.CharField(max_length=100, unique=True)
+    fetch_strategy = models.CharField(max_length=20, choices=FETCH_STRATEGY_CHOICES, blank=True)
+    strategy_checked_at = models.DateTimeField(null=True, blank=True)
+    stealth_level = models.PositiveSmallIntegerField(choices=STEALTH_LEVEL_CHOICES, default=FAST)
+    stealth_changed_at = models.DateTimeField(null=True, blank=True)
+    last_blocked_at = models.DateTimeField(null=True, blank=True)
+    # Newest listing identities seen, for incremental crawls (see core.scraping.watermark)
+    recent_listings = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.source
+
+    class Meta:
+        ordering = ['source']
+
+
+class ScrapeRun(models.Model):
+    """One scheduled or manual scrape, e.g. a scrape_jobs_task chord"""
+    RUNNING = 'RUNNING'
+    SUCCESS = 'SUCCESS'
+    FAILED = 'FAILED'
+    STATUS_CHOICES = [
+        (RUNNING, 'Running'),
+        (SUCCESS, 'Success'),
+        (FAILED, 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=50)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=RUNNING)
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.kind} run {self.started_at:%Y-%m-%d %H:%M}"
+
+    @property
+    def duration(self):
+        return (self.finished_at - self.started_at) if self.finished_at else None
+
+    class Meta:
+        ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['kind', 'started_at']),
+        ]
+
+
+class SourceRun(models.Model):
+    """What one source contributed to a ScrapeRun, and where the time went"""
+    run = models.ForeignKey(ScrapeRun, on_delete=models.CASCADE, related_name='sources')
+    source = models.CharField(max_length=100)
+    pages_fetched = models.PositiveIntegerField(default=0)
+    cards_found = models.PositiveIntegerField(default=0)
+    records_extracted = models.PositiveIntegerField(default=0)
+    created = models.PositiveIntegerField(default=0)
+    updated = models.PositiveIntegerField(default=0)
+    unchanged = models.PositiveIntegerField(default=0)
+    errors = models.PositiveIntegerField(default=0)
+    bytes_transferred = models.PositiveBigIntegerField(default=0)
+    fetch_seconds = models.FloatField(default=0)
+    parse_seconds = models.FloatField(default=0)
+    persist_seconds = models.FloatField(default=0)
+
+    def __str__(self):
+        return f"{self.source} in {self.run}"
+
+    @property
+    def wall_seconds(self):
+        return self.fetch_seconds + self.parse_seconds + self.persist_seconds
+
+    class Meta:
+        ordering = ['run', 'source']
+        constraints = [
+            models.UniqueConstraint(fields=['run', 'source'], name='unique_source_run'),
+        ]
+        indexes = [
+            models.Index(fields=['source', 'run']),
+        ]
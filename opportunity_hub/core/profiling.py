@@ -0,0 +1,191 @@
+"""
+Stage timers and opt-in profiling for scrape runs.
+
+The scraper base classes and ingestion wrap their hot sections in
+``stage('fetch' | 'parse' | 'extract' | 'persist')``. Outside a profiling
+session a stage costs one global lookup. Inside ``profiled(...)`` (the
+``--profile`` flag of the scraping commands, or ``profile=True`` on the
+scrape tasks) the process also runs cProfile and tracemalloc, and on exit
+writes to ``SCRAPER_PROFILE_DIR/run-<id>/`` (one set per process):
+
+* ``<label>-<pid>.prof``: pstats data, e.g. for ``snakeviz`` or ``flameprof``
+* ``<label>-<pid>.tracemalloc``: a tracemalloc snapshot (``Snapshot.load``)
+* ``<label>-<pid>.json``: wall time and calls per stage, plus peak traced memory
+
+Stage times are inclusive, so ``parse`` contains ``extract``.
+"""
+import cProfile
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+class ProfileSession:
+    """What one ``profiled`` block has collected so far"""
+    def __init__(self, label, memory=True):
+        self.label = label
+        self.memory = memory
+        self.stages = {}
+        self.peak_memory = 0
+        self.path = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._profiles = []
+
+    def add(self, name, seconds):
+        with self._lock:
+            total = self.stages.setdefault(name, {'seconds': 0.0, 'calls': 0})
+            total['seconds'] += seconds
+            total['calls'] += 1
+
+    def enter_thread(self):
+        """
+        Profile the current thread until its outermost stage exits.
+
+        Before Python 3.12 cProfile only sees the thread that enabled it, so
+        page and detail worker threads each get a profiler of their own and
+        are merged at the end. From 3.12 the first profiler sees every thread
+        and enabling another fails, which is fine.
+        """
+        depth = getattr(self._local, 'depth', 0)
+        self._local.depth = depth + 1
+        if depth or getattr(self._local, 'owner', False):
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            return
+        self._local.profile = profile
+
+    def exit_thread(self):
+        self._local.depth -= 1
+        profile = getattr(self._local, 'profile', None)
+        if self._local.depth or profile is None:
+            return
+        profile.disable()
+        self._local.profile = None
+        with self._lock:
+            self._profiles.append(profile)
+
+    def summary(self):
+        """One line per stage, slowest first, for command output"""
+        lines = [
+            f"{name}: {total['seconds']:.3f}s over {total['calls']} calls"
+            for name, total in sorted(self.stages.items(), key=lambda item: -item[1]['seconds'])
+        ]
+        if self.memory:
+            lines.append(f"peak traced memory: {self.peak_memory / 1024 / 1024:.1f} MiB")
+        if self.path:
+            lines.append(f"profile written to {self.path}.prof")
+        return lines
+
+
+class stage:
+    """
+    Time a section of a scrape, e.g. ``with stage('parse'):``.
+
+    A class rather than a generator so the per-card ``extract`` stage stays
+    cheap when nothing is being profiled.
+    """
+    __slots__ = ('name', 'session', 'started')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.session = _session
+        if self.session is not None:
+            self.session.enter_thread()
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.session is not None:
+            self.session.add(self.name, time.perf_counter() - self.started)
+            self.session.exit_thread()
+        return False
+
+
+def profile_dir(run_id=None):
+    root = Path(getattr(settings, 'SCRAPER_PROFILE_DIR', settings.BASE_DIR / 'profiles'))
+    return root / (f'run-{run_id}' if run_id is not None else timezone.now().strftime('%Y%m%d-%H%M%S'))
+
+
+@contextmanager
+def profiled(label, run_id=None, enabled=True, memory=None):
+    """
+    Profile the block with cProfile (and tracemalloc) and dump the results.
+
+    Yields the ProfileSession, or None when ``enabled`` is false or another
+    session is already running in this process (the outer one keeps
+    collecting). Dumps go under ``profile_dir(run_id)``, named after
+    ``label`` and the process id so subtasks of one run can share it.
+    """
+    global _session
+    if not enabled:
+        yield None
+        return
+    if memory is None:
+        memory = getattr(settings, 'SCRAPER_PROFILE_MEMORY', True)
+    session = ProfileSession(label, memory=memory)
+    with _session_lock:
+        if _session is not None:
+            session = None
+        else:
+            _session = session
+    if session is None:
+        yield None
+        return
+
+    started_tracing = memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start(getattr(settings, 'SCRAPER_PROFILE_MEMORY_FRAMES', 10))
+    main = cProfile.Profile()
+    main.enable()
+    session._local.owner = True
+    try:
+        yield session
+    finally:
+        main.disable()
+        with _session_lock:
+            _session = None
+        snapshot = None
+        if memory:
+            session.peak_memory = tracemalloc.get_traced_memory()[1]
+            snapshot = tracemalloc.take_snapshot()
+            if started_tracing:
+                tracemalloc.stop()
+        try:
+            _dump(session, main, snapshot, profile_dir(run_id))
+        except Exception as e:
+            logger.error(f"Error writing profile {label}: {str(e)}")
+
+
+def _dump(session, main, snapshot, directory):
+    directory.mkdir(parents=True, exist_ok=True)
+    base = directory / f'{session.label}-{os.getpid()}'
+    stats = pstats.Stats(main)
+    for profile in session._profiles:
+        stats.add(profile)
+    stats.dump_stats(f'{base}.prof')
+    if snapshot is not None:
+        snapshot.dump(f'{base}.tracemalloc')
+    with open(f'{base}.json', 'w') as f:
+        json.dump({'label': session.label, 'stages': session.stages, 'peak_memory': session.peak_memory}, f, indent=2)
+    session.path = base
+    logger.info(f"Wrote profile {base}.prof")
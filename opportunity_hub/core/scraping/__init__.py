@@ -0,0 +1,3 @@
+from .driver_pool import DriverPool, DriverPoolTimeout, PooledDriverMixin, get_pool
+
+__all__ = ['DriverPool', 'DriverPoolTimeout', 'PooledDriverMixin', 'get_pool']
@@ -0,0 +1,152 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class PageArchive:
+    """
+    Compressed, content-addressed store of fetched pages.
+
+    Page bodies are gzipped under ``objects/`` and named after the SHA-256
+    of their content, so a page that hasn't changed between runs is only
+    stored once. Every fetch appends a line to ``index/<date>.jsonl`` with
+    the URL, source, fetch time and content hash, which is what replay and
+    retention work from.
+    """
+    def __init__(self, directory, retention_days=14):
+        self.directory = Path(directory)
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+
+    @property
+    def index_dir(self):
+        return self.directory / 'index'
+
+    @property
+    def objects_dir(self):
+        return self.directory / 'objects'
+
+    def _object_path(self, digest):
+        return self.objects_dir / digest[:2] / f"{digest}.html.gz"
+
+    def save(self, url, html, source=None, fetched_at=None):
+        """Archive a page and return its index entry"""
+        fetched_at = fetched_at or timezone.now()
+        body = html.encode('utf-8')
+        digest = hashlib.sha256(body).hexdigest()
+
+        path = self._object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+            with gzip.open(tmp, 'wb') as f:
+                f.write(body)
+            os.replace(tmp, path)
+
+        entry = {
+            'url': url,
+            'source': source,
+            'fetched_at': fetched_at.isoformat(),
+            'sha256': digest,
+            'size': len(body),
+        }
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(self.index_dir / f"{fetched_at.date().isoformat()}.jsonl", 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+        return entry
+
+    def load(self, digest):
+        """Return the HTML stored under a content hash"""
+        with gzip.open(self._object_path(digest), 'rb') as f:
+            return f.read().decode('utf-8')
+
+    def days(self):
+        """Dates that have an index, oldest first"""
+        return sorted(date.fromisoformat(path.stem) for path in self.index_dir.glob('*.jsonl'))
+
+    def entries(self, day=None, source=None):
+        """Yield index entries for one day (default: every day), optionally for one source"""
+        days = [day] if day else self.days()
+        for d in days:
+            path = self.index_dir / f"{d.isoformat()}.jsonl"
+            if not path.exists():
+                continue
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if source is None or entry.get('source') == source:
+                        yield entry
+
+    def latest(self, url):
+        """Most recent entry for a URL, or None"""
+        for d in reversed(self.days()):
+            found = [entry for entry in self.entries(d) if entry['url'] == url]
+            if found:
+                return found[-1]
+        return None
+
+    def prune(self, retention_days=None):
+        """Drop index days past retention, then any page no remaining entry points to"""
+        retention_days = self.retention_days if retention_days is None else retention_days
+        cutoff = timezone.now().date() - timedelta(days=retention_days)
+        removed_days = 0
+        for d in self.days():
+            if d < cutoff:
+                (self.index_dir / f"{d.isoformat()}.jsonl").unlink(missing_ok=True)
+                removed_days += 1
+
+        keep = {entry['sha256'] for entry in self.entries()}
+        removed_pages = 0
+        if self.objects_dir.exists():
+            for path in self.objects_dir.glob('*/*.html.gz'):
+                if path.name.split('.')[0] not in keep:
+                    path.unlink(missing_ok=True)
+                    removed_pages += 1
+        return removed_days, removed_pages
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+_archive = None
+_archive_lock = threading.Lock()
+
+
+def get_archive():
+    """Return the shared page archive, or None when archiving is disabled"""
+    global _archive
+    if not getattr(settings, 'SCRAPER_ARCHIVE_ENABLED', True):
+        return None
+    with _archive_lock:
+        if _archive is None:
+            _archive = PageArchive(
+                getattr(settings, 'SCRAPER_ARCHIVE_DIR', Path(settings.BASE_DIR) / 'archive'),
+                retention_days=getattr(settings, 'SCRAPER_ARCHIVE_RETENTION_DAYS', 14),
+            )
+        return _archive
+
+
+def archive_page(url, html, source=None):
+    """Store a fetched page; archiving problems never fail a scrape"""
+    archive = get_archive()
+    if archive is None or not html:
+        return None
+    try:
+        return archive.save(url, html, source=source)
+    except OSError as e:
+        logger.warning(f"Could not archive {url}: {str(e)}")
+        return None
@@ -0,0 +1,159 @@
+import json
+import logging
+import threading
+import weakref
+from collections import Counter, defaultdict
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Network.setBlockedURLs only takes URL patterns, so resource types are
+# blocked by the file extensions they are served under
+RESOURCE_TYPE_PATTERNS = {
+    'Image': ['*.png*', '*.jpg*', '*.jpeg*', '*.gif*', '*.webp*', '*.svg*', '*.ico*', '*.avif*'],
+    'Font': ['*.woff*', '*.ttf*', '*.otf*', '*.eot*'],
+    'Stylesheet': ['*.css*'],
+    'Media': ['*.mp4*', '*.webm*', '*.mp3*', '*.ogg*', '*.m3u8*'],
+}
+
+DEFAULT_BLOCKED_TYPES = ['Image', 'Font', 'Stylesheet', 'Media']
+DEFAULT_BLOCKED_PATTERNS = [
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*googlesyndication.com*', '*facebook.net*', '*hotjar.com*', '*adservice.google.*',
+]
+
+# Rough transfer sizes per resource type, used to estimate what a blocked
+# request would have cost until real loads of that type have been seen
+TYPICAL_SIZES = {
+    'Image': 40 * 1024,
+    'Font': 30 * 1024,
+    'Stylesheet': 25 * 1024,
+    'Media': 500 * 1024,
+    'Script': 40 * 1024,
+}
+
+
+def blocked_urls(source=None):
+    """URL patterns to block for a source, from the global and per-source settings"""
+    policy = getattr(settings, 'SCRAPER_SOURCE_RESOURCE_POLICY', {}).get(source, {})
+    types = policy.get('types', getattr(settings, 'SCRAPER_BLOCKED_RESOURCE_TYPES', DEFAULT_BLOCKED_TYPES))
+    patterns = policy.get('patterns', getattr(settings, 'SCRAPER_BLOCKED_URL_PATTERNS', DEFAULT_BLOCKED_PATTERNS))
+    urls = [pattern for kind in types for pattern in RESOURCE_TYPE_PATTERNS.get(kind, [])]
+    return tuple(urls + list(patterns))
+
+
+class ResourceBlocker:
+    """
+    Keeps headless Chrome from downloading what the parsers never read.
+
+    ``apply`` sets a driver's blocked URL patterns over the DevTools
+    protocol, only talking to the browser when the source's policy differs
+    from what the driver already has. ``record`` drains the driver's
+    performance log after a page load, counting blocked requests and the
+    bytes actually downloaded; ``report`` logs and resets the totals.
+    """
+    def __init__(self):
+        self._applied = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._blocked = defaultdict(Counter)
+        self._downloaded = Counter()
+        # Running (bytes, count) per resource type from loads that went through
+        self._observed = defaultdict(lambda: [0, 0])
+
+    @property
+    def enabled(self):
+        return getattr(settings, 'SCRAPER_BLOCK_RESOURCES', True)
+
+    def apply(self, driver, source=None):
+        """Give a driver the blocking policy for a source"""
+        if not self.enabled:
+            return
+        urls = blocked_urls(source)
+        if self._applied.get(driver) == urls:
+            return
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(urls)})
+        except Exception as e:
+            logger.warning(f"Could not set resource blocking for {source or 'default'}: {str(e)}")
+        self._applied[driver] = urls
+
+    def record(self, driver, source=None):
+        """Account for the requests a driver made since the last call"""
+        if not self.enabled:
+            return
+        try:
+            entries = list(driver.get_log('performance'))
+        except Exception:
+            # Performance logging isn't enabled on this driver
+            return
+
+        types = {}
+        blocked = Counter()
+        downloaded = 0
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, TypeError, ValueError):
+                continue
+            method, params = message.get('method'), message.get('params', {})
+            if method in ('Network.requestWillBeSent', 'Network.responseReceived'):
+                types[params.get('requestId')] = params.get('type', 'Other')
+            elif method == 'Network.loadingFailed' and params.get('blockedReason'):
+                blocked[params.get('type') or types.get(params.get('requestId'), 'Other')] += 1
+            elif method == 'Network.loadingFinished':
+                size = int(params.get('encodedDataLength', 0))
+                downloaded += size
+                kind = types.get(params.get('requestId'), 'Other')
+                with self._lock:
+                    self._observed[kind][0] += size
+                    self._observed[kind][1] += 1
+
+        with self._lock:
+            self._blocked[source].update(blocked)
+            self._downloaded[source] += downloaded
+
+    def drain(self, driver):
+        """Drop a driver's unread performance log without counting it"""
+        try:
+            driver.get_log('performance')
+        except Exception:
+            pass
+
+    def estimated_size(self, kind):
+        """Average transfer size seen for a resource type, or a typical one"""
+        total, count = self._observed.get(kind, (0, 0))
+        return total // count if count else TYPICAL_SIZES.get(kind, TYPICAL_SIZES['Script'])
+
+    def report(self, source=None):
+        """Log and reset savings for one source (default: every source)"""
+        with self._lock:
+            sources = [source] if source is not None else list(set(self._blocked) | set(self._downloaded))
+            report = {}
+            for name in sources:
+                blocked = self._blocked.pop(name, Counter())
+                downloaded = self._downloaded.pop(name, 0)
+                if not blocked and not downloaded:
+                    continue
+                report[name] = {
+                    'blocked_requests': sum(blocked.values()),
+                    'bytes_saved': sum(self.estimated_size(kind) * count for kind, count in blocked.items()),
+                    'bytes_downloaded': downloaded,
+                }
+
+        for name, stats in report.items():
+            logger.info(
+                f"{name or 'Other pages'}: blocked {stats['blocked_requests']} requests, "
+                f"saving ~{stats['bytes_saved'] // 1024} KB "
+                f"({stats['bytes_downloaded'] // 1024} KB downloaded)"
+            )
+        return report
+
+
+_blocker = ResourceBlocker()
+
+
+def get_resource_blocker():
+    """Return the process-wide resource blocker"""
+    return _blocker
@@ -0,0 +1,159 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlencode
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class HttpCache:
+    """
+    On-disk store of response bodies and their HTTP validators.
+
+    Only responses that carry an ETag or Last-Modified header are kept,
+    since those are the ones a server can answer with ``304 Not Modified``.
+    A new entry stays pending, and its validators unsent, until ``commit``
+    is called for it once the records parsed from its body are saved.
+    Each entry is a single JSON file named after a hash of the request, so
+    several worker processes can share the directory. When the directory
+    grows past ``max_bytes`` the least recently used entries are removed.
+    """
+    def __init__(self, directory, max_bytes=100 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url, params=None):
+        if params:
+            url = f"{url}?{urlencode(sorted(params.items()), doseq=True)}"
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return self.directory / f"{key}.json"
+
+    def get(self, url, params=None):
+        """Return the cached entry for a request, or None"""
+        path = self._path(self.key(url, params))
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def conditional_headers(self, url, params=None):
+        """If-None-Match / If-Modified-Since headers for a cached request"""
+        entry = self.get(url, params)
+        if not entry or entry.get('pending'):
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url, params, headers, text):
+        """Save a 200 response if it has validators, pending until it is committed"""
+        headers = {name.lower(): value for name, value in headers.items()}
+        etag = headers.get('etag')
+        last_modified = headers.get('last-modified')
+        if not etag and not last_modified:
+            return
+        entry = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': time.time(),
+            'pending': True,
+            'text': text,
+        }
+        self._write(self._path(self.key(url, params)), entry)
+        self._evict()
+
+    def commit(self, url, params=None):
+        """Start sending a stored entry's validators; call once the records parsed from it are saved"""
+        entry = self.get(url, params)
+        if entry is None or not entry.get('pending'):
+            return
+        entry['pending'] = False
+        self._write(self._path(self.key(url, params)), entry)
+
+    def revalidated(self, url, params=None):
+        """Return the cached body after a 304, marking the entry as recently used"""
+        entry = self.get(url, params)
+        if entry is None:
+            return None
+        try:
+            os.utime(self._path(self.key(url, params)))
+        except OSError:
+            pass
+        return entry['text']
+
+    def clear(self):
+        for path in self.directory.glob('*.json'):
+            path.unlink(missing_ok=True)
+
+    def _write(self, path, entry):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file and rename so readers never see half an entry
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Could not write HTTP cache entry for {entry['url']}: {str(e)}")
+            Path(tmp).unlink(missing_ok=True)
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        with self._lock:
+            entries = []
+            total = 0
+            for item in os.scandir(self.directory):
+                if not item.name.endswith('.json'):
+                    continue
+                try:
+                    stat = item.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, item.path))
+                total += stat.st_size
+
+            if total <= self.max_bytes:
+                return
+            for _, size, path in sorted(entries):
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                if total <= self.max_bytes:
+                    break
+            logger.info(f"Evicted HTTP cache entries; {total} bytes remain")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_http_cache():
+    """Return the shared HTTP cache, or None when caching is disabled"""
+    global _cache
+    if not getattr(settings, 'SCRAPER_HTTP_CACHE_ENABLED', True):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = HttpCache(
+                getattr(settings, 'SCRAPER_HTTP_CACHE_DIR', Path(settings.BASE_DIR) / 'cache' / 'http'),
+                max_bytes=getattr(settings, 'SCRAPER_HTTP_CACHE_MAX_BYTES', 100 * 1024 * 1024),
+            )
+        return _cache
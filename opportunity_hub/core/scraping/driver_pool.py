@@ -0,0 +1,300 @@
+import atexit
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from selenium.common.exceptions import WebDriverException
+
+from core.metrics import BROWSER_POOL_IN_USE, BROWSER_POOL_LIVE, BROWSER_POOL_WAIT_SECONDS
+from .blocking import get_resource_blocker
+from .drivers import DRIVER_FACTORIES
+
+logger = logging.getLogger(__name__)
+
+
+class DriverPoolTimeout(Exception):
+    """Raised when no browser becomes available before the checkout timeout"""
+
+
+class DriverPool:
+    """
+    Process-wide pool of headless browsers.
+
+    Scrapers check a driver out, use it and check it back in instead of
+    starting and killing their own Chrome. At most ``max_size`` browsers are
+    alive at once; callers beyond that block until one is returned.
+    """
+    def __init__(self, factory, max_size=2, max_uses=50, name='chrome'):
+        self.factory = factory
+        self.max_size = max_size
+        self.max_uses = max_uses
+        self.name = name
+        self._idle = []
+        self._uses = {}
+        self._live = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    @property
+    def size(self):
+        """Number of live browsers, idle or checked out"""
+        return self._live
+
+    @property
+    def in_use(self):
+        """Number of browsers currently checked out"""
+        with self._cond:
+            return self._live - len(self._idle)
+
+    def _publish(self):
+        """Export occupancy to the metrics registry; call with the lock held"""
+        BROWSER_POOL_LIVE.labels(self.name).set(self._live)
+        BROWSER_POOL_IN_USE.labels(self.name).set(self._live - len(self._idle))
+
+    def checkout(self, timeout=None):
+        """Borrow a driver, starting a new browser only if under the cap"""
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError(f"The {self.name} driver pool has been shut down")
+                if self._idle:
+                    driver = self._idle.pop()
+                    self._publish()
+                    BROWSER_POOL_WAIT_SECONDS.labels(self.name).observe(time.monotonic() - started)
+                    break
+                if self._live < self.max_size:
+                    driver = None
+                    self._live += 1
+                    self._publish()
+                    BROWSER_POOL_WAIT_SECONDS.labels(self.name).observe(time.monotonic() - started)
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise DriverPoolTimeout(
+                        f"No {self.name} driver available after {timeout}s "
+                        f"({self._live} live, max {self.max_size})"
+                    )
+                self._cond.wait(remaining)
+
+        if driver is not None:
+            # Whatever the log still holds isn't this borrower's; don't let it count against its source
+            get_resource_blocker().drain(driver)
+            return driver
+
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._cond:
+                self._live -= 1
+                self._publish()
+                self._cond.notify()
+            raise
+
+        logger.info(f"Started {self.name} driver ({self._live}/{self.max_size} live)")
+        with self._cond:
+            self._uses[driver] = 0
+        return driver
+
+    def checkin(self, driver, discard=False):
+        """Return a driver to the pool, quitting it if broken or worn out"""
+        with self._cond:
+            uses = self._uses.get(driver, 0) + 1
+            self._uses[driver] = uses
+
+        if not discard and self._closed:
+            discard = True
+        if not discard and uses >= self.max_uses:
+            logger.info(f"Recycling {self.name} driver after {uses} uses")
+            discard = True
+        if not discard:
+            discard = not self._reset(driver)
+
+        if discard:
+            self._quit(driver)
+            with self._cond:
+                self._uses.pop(driver, None)
+                self._live -= 1
+                self._publish()
+                self._cond.notify()
+        else:
+            with self._cond:
+                self._idle.append(driver)
+                self._publish()
+                self._cond.notify()
+
+    @contextmanager
+    def driver(self, timeout=None):
+        """Context manager that checks a driver out and always returns it"""
+        driver = self.checkout(timeout=timeout)
+        discard = False
+        try:
+            yield driver
+        except WebDriverException:
+            # The browser may be in an unknown state; don't hand it to the next caller
+            discard = True
+            raise
+        finally:
+            self.checkin(driver, discard=discard)
+
+    def warm_up(self, count=None):
+        """Start browsers ahead of time so the first scrape doesn't pay for it"""
+        count = min(self.max_size if count is None else count, self.max_size)
+        drivers = []
+        try:
+            while self._live < count:
+                drivers.append(self.checkout(timeout=0))
+        except Exception as e:
+            logger.error(f"Error warming up {self.name} driver pool: {str(e)}")
+        for driver in drivers:
+            self.checkin(driver)
+        return len(drivers)
+
+    def shutdown(self):
+        """Quit every idle browser; checked-out ones are quit on checkin"""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._closed = True
+            self._cond.notify_all()
+        for driver in idle:
+            self._quit(driver)
+            with self._cond:
+                self._uses.pop(driver, None)
+                self._live -= 1
+                self._publish()
+
+    def _reset(self, driver):
+        """Close stray tabs so the next borrower starts from a clean window"""
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            # Drain what the last borrower loaded (unattributed, e.g. the legacy scrapers' pages,
+            # which never read the log themselves) and drop any per-source policy
+            blocker = get_resource_blocker()
+            if blocker.enabled:
+                blocker.record(driver)
+            else:
+                blocker.drain(driver)
+            blocker.apply(driver)
+            return True
+        except Exception as e:
+            logger.warning(f"Discarding unhealthy {self.name} driver: {str(e)}")
+            return False
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.error(f"Error quitting {self.name} driver: {str(e)}")
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(name='chrome'):
+    """Return the process-wide pool for the given driver flavour"""
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            pool = DriverPool(
+                DRIVER_FACTORIES[name],
+                max_size=getattr(settings, 'SCRAPER_DRIVER_POOL_SIZE', 2),
+                max_uses=getattr(settings, 'SCRAPER_DRIVER_MAX_USES', 50),
+                name=name,
+            )
+            _pools[name] = pool
+        return pool
+
+
+def checkout_timeout():
+    return getattr(settings, 'SCRAPER_DRIVER_CHECKOUT_TIMEOUT', 300)
+
+
+def warm_up_pools():
+    """Start the configured number of browsers in every pool"""
+    warmup = getattr(settings, 'SCRAPER_DRIVER_POOL_WARMUP', {})
+    for name, count in warmup.items():
+        started = get_pool(name).warm_up(count)
+        logger.info(f"Warmed up {started} {name} driver(s)")
+
+
+def shutdown_pools():
+    """Quit all pooled browsers, e.g. when a worker process exits"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown()
+
+
+# Management commands and shells don't get a worker shutdown signal
+atexit.register(shutdown_pools)
+
+
+class PooledDriverMixin:
+    """
+    Gives a scraper a ``driver`` attribute borrowed from the shared pool.
+
+    The browser is checked out on first use and handed back by ``close()``,
+    when leaving a ``with`` block, or when the scraper is garbage collected.
+    Worker threads that share one scraper wrap their work in
+    ``thread_driver()`` so each of them gets a browser of its own.
+    """
+    driver_pool = 'chrome'
+
+    def __init__(self):
+        self._driver = None
+
+    @property
+    def driver(self):
+        """Browser borrowed from the shared pool on first use"""
+        local = self.__dict__.get('_thread_drivers')
+        if local is not None and getattr(local, 'active', False):
+            if local.driver is None:
+                local.driver = get_pool(self.driver_pool).checkout(timeout=checkout_timeout())
+            return local.driver
+        if getattr(self, '_driver', None) is None:
+            self._driver = get_pool(self.driver_pool).checkout(timeout=checkout_timeout())
+        return self._driver
+
+    @contextmanager
+    def thread_driver(self):
+        """Within the block, ``self.driver`` is a separate browser for the calling thread"""
+        local = self.__dict__.setdefault('_thread_drivers', threading.local())
+        local.active, local.driver = True, None
+        discard = False
+        try:
+            yield
+        except WebDriverException:
+            discard = True
+            raise
+        finally:
+            driver, local.driver, local.active = local.driver, None, False
+            # Only checked out if the thread actually needed a browser
+            if driver is not None:
+                get_pool(self.driver_pool).checkin(driver, discard=discard)
+
+    def close(self):
+        """Return the borrowed browser to the pool"""
+        if getattr(self, '_driver', None) is not None:
+            driver, self._driver = self._driver, None
+            get_pool(self.driver_pool).checkin(driver)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
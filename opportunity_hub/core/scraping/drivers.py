@@ -0,0 +1,64 @@
+import logging
+import random
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+from .blocking import get_resource_blocker
+
+logger = logging.getLogger(__name__)
+
+
+def create_chrome_driver():
+    """Start a plain headless Chrome for the job scrapers"""
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')  # Run in headless mode
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    if get_resource_blocker().enabled:
+        # Network events let the resource blocker count what it saved
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    driver = webdriver.Chrome(options=chrome_options)
+    driver.implicitly_wait(10)
+    get_resource_blocker().apply(driver)
+    return driver
+
+
+def create_undetected_driver():
+    """Start an undetected-chromedriver instance for the scholarship scrapers"""
+    import undetected_chromedriver as uc
+    from fake_useragent import UserAgent
+
+    options = uc.ChromeOptions()
+    # Basic options
+    options.add_argument('--headless')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+
+    # Randomize viewport size to appear more human-like
+    width = random.randint(1024, 1920)
+    height = random.randint(768, 1080)
+    options.add_argument(f'--window-size={width},{height}')
+
+    # Add random user agent
+    ua = UserAgent()
+    options.add_argument(f'--user-agent={ua.random}')
+
+    # Add additional anti-detection measures
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    if get_resource_blocker().enabled:
+        options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+    driver = uc.Chrome(options=options)
+    get_resource_blocker().apply(driver)
+    # No implicit wait: scrapers wait explicitly, and human-like pacing is
+    # only added for sources whose stealth level calls for it
+    return driver
+
+
+DRIVER_FACTORIES = {
+    'chrome': create_chrome_driver,
+    'undetected': create_undetected_driver,
+}
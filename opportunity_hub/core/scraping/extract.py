@@ -0,0 +1,109 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Union
+
+from core.profiling import stage
+from .parsing import _matches, parse_cards, simple_selector
+
+
+class MissingField(ValueError):
+    """Raised when a required field is absent from a card"""
+
+
+@dataclass(frozen=True)
+class Field:
+    """
+    How to read one value out of a card.
+
+    ``selector`` is CSS relative to the card (None means the card itself).
+    The value is the element's stripped text, or ``attr`` if given. With
+    ``many`` every match is returned as a list. ``process`` is applied to
+    values that were found; it may be a callable or the name of a method on
+    the scraper passed to ``Extractor.extract``. Missing values fall back to
+    ``default`` unless the field is ``required``.
+    """
+    selector: Optional[str] = None
+    attr: Optional[str] = None
+    process: Union[Callable, str, None] = None
+    default: Any = None
+    required: bool = False
+    many: bool = False
+
+
+class Extractor:
+    """
+    A source's card selector and field specs, compiled once.
+
+    Fields whose selector is simple (tag, .class, [attr], ...) are all
+    matched during a single walk over the card's elements; anything more
+    complex falls back to a CSS query of its own. Extraction works on the
+    page HTML, so the browser, static HTTP and replay paths share it.
+    """
+    def __init__(self, card_selector, fields):
+        self.card_selector = card_selector
+        self.fields = fields
+        self._walked = []
+        self._queried = []
+        for name, field in fields.items():
+            if field.selector is None:
+                continue
+            target = simple_selector(field.selector)
+            if target is None:
+                self._queried.append((name, field))
+            else:
+                self._walked.append((name, field, target))
+        self._stop_early = not any(field.many for _, field, _ in self._walked)
+
+    def cards(self, html):
+        """Card nodes of a listing page"""
+        return parse_cards(html, self.card_selector)
+
+    def extract(self, card, owner=None):
+        """Return a dict with every field of one card"""
+        with stage('extract'):
+            nodes = self._match(card)
+            values = {}
+            for name, field in self.fields.items():
+                node = card if field.selector is None else nodes.get(name)
+                if field.many:
+                    value = [v for v in (self._read(n, field) for n in node or []) if v is not None]
+                    value = value or None
+                else:
+                    value = self._read(node, field) if node is not None else None
+
+                if value is None:
+                    if field.required:
+                        raise MissingField(f"No '{name}' ({field.selector}) in card")
+                    values[name] = field.default
+                    continue
+                if field.process is not None:
+                    process = getattr(owner, field.process) if isinstance(field.process, str) else field.process
+                    value = process(value)
+                values[name] = value
+            return values
+
+    def _match(self, card):
+        """Find the nodes for every field, walking the card's elements once"""
+        found = {}
+        if self._walked:
+            pending = len(self._walked)
+            for node in card.iter():
+                tag, attrs = node.tag, node.attrs
+                for name, field, target in self._walked:
+                    if not _matches(tag, attrs, target):
+                        continue
+                    if field.many:
+                        found.setdefault(name, []).append(node)
+                    elif name not in found:
+                        found[name] = node
+                        pending -= 1
+                if self._stop_early and not pending:
+                    break
+        for name, field in self._queried:
+            found[name] = card.select(field.selector) if field.many else card.select_one(field.selector)
+        return found
+
+    @staticmethod
+    def _read(node, field):
+        if field.attr:
+            return node.get(field.attr)
+        return node.text.strip()
@@ -0,0 +1,475 @@
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.conf import settings
+from django.utils import timezone
+from selenium.webdriver.common.by import By
+
+from core.metrics import (
+    CARDS_PER_PAGE, PAGE_FETCH_SECONDS, PAGE_PARSE_SECONDS, RECORDS_EXTRACTED, SCRAPE_ERRORS,
+)
+from core.models import SourceState
+from core.profiling import stage
+from .archive import archive_page
+from .blocking import get_resource_blocker
+from .known import get_known_listings
+from .parsing import count_cards, parse_cards
+from .redirect import redirect_url
+from .scroll import scroll_until_idle
+from .stats import ScrapeStats
+from .stealth import report_block, stealth_level
+from .throttle import get_scheduler, parse_retry_after
+from .watermark import incremental_enabled, known_listings
+
+logger = logging.getLogger(__name__)
+
+STATIC_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                  '(KHTML, like Gecko) Chrome/124.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+# Process-local view of SourceState.fetch_strategy, so we only hit the
+# database when a source's strategy actually changes
+_strategies = {}
+_strategies_lock = threading.Lock()
+
+
+def remembered_strategy(source):
+    """Return the fetch strategy that last worked for a source, if still fresh"""
+    with _strategies_lock:
+        cached = _strategies.get(source)
+    if cached is None:
+        state = SourceState.objects.filter(source=source).first()
+        cached = (state.fetch_strategy, state.strategy_checked_at) if state else ('', None)
+        with _strategies_lock:
+            _strategies[source] = cached
+
+    strategy, checked_at = cached
+    if strategy == SourceState.BROWSER and checked_at:
+        # Sites change; every so often give the cheap path another chance
+        reprobe_after = timezone.timedelta(hours=getattr(settings, 'SCRAPER_STATIC_REPROBE_HOURS', 24))
+        if timezone.now() - checked_at > reprobe_after:
+            return ''
+    return strategy
+
+
+def remember_strategy(source, strategy):
+    """Persist the strategy that worked for a source"""
+    now = timezone.now()
+    with _strategies_lock:
+        _strategies[source] = (strategy, now)
+    SourceState.objects.update_or_create(
+        source=source,
+        defaults={'fetch_strategy': strategy, 'strategy_checked_at': now},
+    )
+    logger.info(f"Using {strategy.lower()} fetching for {source}")
+
+
+class PageFetchMixin:
+    """
+    Fetches listing pages with the cheapest strategy that works.
+
+    Sources that set ``static_first`` are first requested with a plain HTTP
+    GET; if the card selector is present in that HTML we never start a
+    browser. Otherwise (or for browser-only sources) the page is loaded in
+    the pooled browser, waited on and scrolled as before. Whichever strategy
+    produced cards is remembered per source in ``SourceState``. Every page
+    is also stored in the page archive so ``parse_page`` can be replayed
+    over it later.
+
+    ``stream`` fetches a whole result set: page URLs are built up front,
+    fetched by a few worker threads (each with its own pooled browser when
+    one is needed) and yielded back as per-page batches in page order.
+    Sources whose records need a detail page set ``detail_url_field`` and
+    ``detail_selector`` and implement ``apply_detail``; those pages are
+    loaded afterwards by a separate bounded pool of workers. Sources with a
+    ``listing_model`` crawl incrementally: a stream stops after the first
+    page made up entirely of listings seen on an earlier run.
+
+    Subclasses provide ``source_name``, ``card_selector``, ``parse_page``,
+    ``driver``, ``thread_driver`` and ``wait_for_element``.
+    """
+    source_name = None
+    card_selector = None
+    static_first = False
+    # Set when replaying archived pages; parsers must not reach for the network
+    offline = False
+    # Record key holding the detail page URL, what to read from that page,
+    # and the record keys apply_detail fills in
+    detail_url_field = None
+    detail_selector = None
+    detail_fields = ()
+    # Model whose identity_of() identifies this source's records, e.g. JobListing
+    listing_model = None
+
+    @property
+    def stats(self):
+        """Counters for the run ledger (see core.scraping.stats)"""
+        if getattr(self, '_stats', None) is None:
+            self._stats = ScrapeStats()
+        return self._stats
+
+    @property
+    def http(self):
+        """requests session used for static fetches"""
+        if getattr(self, '_http', None) is None:
+            self._http = requests.Session()
+            self._http.headers.update(STATIC_HEADERS)
+        return self._http
+
+    def parse_page(self, html, **filters):
+        """Turn the HTML of one listing page into records"""
+        raise NotImplementedError
+
+    def page_urls(self, num_pages=1, **filters):
+        """URLs of the first ``num_pages`` listing pages for these filters"""
+        raise NotImplementedError
+
+    def scrape_page(self, url, **filters):
+        """Fetch, parse and enrich a single listing page, e.g. from a Celery subtask"""
+        html = self.fetch_listing_page(url)
+        records = self._parse_page(html, **filters)
+        self.page_is_known(records)
+        records = self.enrich_details(records)
+        get_resource_blocker().report(self.source_name)
+        return records
+
+    def fetch_listing_page(self, url):
+        """
+        HTML of one listing page as ``scrape_page`` loads it.
+
+        Scrapers whose own ``stream`` loads pages in a special way (block
+        detection, retries, warm-up visits) override this so per-page
+        subtasks load them the same way.
+        """
+        return self.fetch_page(url, self.card_selector)
+
+    def _parse_page(self, html, **filters):
+        """parse_page, timed and counted for the run ledger"""
+        started = time.monotonic()
+        with stage('parse'), count_cards() as cards:
+            records = self.parse_page(html, **filters)
+        elapsed = time.monotonic() - started
+        self.stats.add(cards_found=cards[0], records_extracted=len(records), parse_seconds=elapsed)
+        PAGE_PARSE_SECONDS.labels(self.source_name).observe(elapsed)
+        CARDS_PER_PAGE.labels(self.source_name).observe(cards[0])
+        RECORDS_EXTRACTED.labels(self.source_name).inc(len(records))
+        return records
+
+    def page_is_known(self, records):
+        """
+        Whether every listing on a page is in the source's high-water mark.
+
+        If so, the crawl has caught up with the previous run and can stop
+        paginating. The mark itself only moves once listings are stored
+        (see ``core.ledger.ingest_for_run``), so a run whose save fails
+        doesn't make the next one skip the listings it lost.
+        """
+        if not records or self.offline or self.listing_model is None or not incremental_enabled():
+            return False
+        identities = [self.listing_model.identity_of(record) for record in records]
+        return known_listings(self.source_name).issuperset(identities)
+
+    @property
+    def stealth_level(self):
+        """Current anti-detection level for this source (see core.scraping.stealth)"""
+        return stealth_level(self.source_name or self.__class__.__name__)
+
+    def report_block(self, reason):
+        """Tell the stealth policy this source pushed back"""
+        return report_block(self.source_name or self.__class__.__name__, reason)
+
+    def page_concurrency(self):
+        """How many pages of this source may be fetched at once"""
+        limits = getattr(settings, 'SCRAPER_SOURCE_PAGE_CONCURRENCY', {})
+        return max(1, limits.get(self.source_name, getattr(settings, 'SCRAPER_PAGE_CONCURRENCY', 2)))
+
+    def fetch_pages(self, urls, card_selector):
+        """
+        Yield the HTML of each URL in order, or None where the fetch failed.
+
+        Up to ``page_concurrency()`` pages are in flight at once; a page is
+        only started once the consumer has taken the one it replaces, so a
+        slow consumer never has more than that many pages held in memory.
+        """
+        def fetch(url):
+            try:
+                with self.thread_driver():
+                    return self.fetch_page(url, card_selector)
+            except Exception as e:
+                logger.error(f"Error fetching {self.source_name} page {url}: {str(e)}")
+                self.stats.add(errors=1)
+                SCRAPE_ERRORS.labels(self.source_name, 'fetch').inc()
+                return None
+
+        urls = list(urls)
+        workers = min(self.page_concurrency(), len(urls))
+        if workers <= 1:
+            for url in urls:
+                yield fetch(url)
+            return
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'{self.source_name}-pages') as executor:
+            pending = deque(executor.submit(fetch, url) for url in urls[:workers])
+            upcoming = iter(urls[workers:])
+            while pending:
+                html = pending.popleft().result()
+                url = next(upcoming, None)
+                if url is not None:
+                    pending.append(executor.submit(fetch, url))
+                yield html
+
+    def iter_pages(self, urls, **filters):
+        """Yield each listing page's records, in page order, as soon as they are ready"""
+        pages = self.fetch_pages(urls, self.card_selector)
+        try:
+            for number, html in enumerate(pages, start=1):
+                if html is None:
+                    continue
+                try:
+                    records = self._parse_page(html, **filters)
+                except Exception as e:
+                    logger.error(f"Error parsing {self.source_name} page {number}: {str(e)}")
+                    self.stats.add(errors=1)
+                    SCRAPE_ERRORS.labels(self.source_name, 'parse').inc()
+                    continue
+                known = self.page_is_known(records)
+                yield self.enrich_details(records)
+                if known:
+                    logger.info(f"{self.source_name} page {number} held no new listings; stopping")
+                    break
+        finally:
+            # Don't start any more page fetches once we've stopped
+            pages.close()
+        get_resource_blocker().report(self.source_name)
+
+    def stream(self, num_pages=1, **filters):
+        """
+        Page-sized batches of records for the first ``num_pages`` pages.
+
+        This is the streaming counterpart of ``scrape_jobs`` /
+        ``scrape_scholarships``: consumers can save or export each batch
+        before the next page has been fetched.
+        """
+        return self.iter_pages(self.page_urls(num_pages, **filters), **filters)
+
+    def scrape_pages(self, urls, **filters):
+        """Fetch listing pages concurrently and return all their records in page order"""
+        return [record for page in self.iter_pages(urls, **filters) for record in page]
+
+    def detail_concurrency(self):
+        """How many detail pages of this source may be loaded at once"""
+        limits = getattr(settings, 'SCRAPER_SOURCE_DETAIL_CONCURRENCY', {})
+        return max(1, limits.get(self.source_name, getattr(settings, 'SCRAPER_DETAIL_CONCURRENCY', 2)))
+
+    def enrich_details(self, records):
+        """
+        Load every record's detail page and let ``apply_detail`` fill it in.
+
+        Listings we already store with fresh details are filled in from
+        the database instead (see ``reuse_stored_details``). The other
+        detail URLs go into a queue that a bounded pool of workers drains,
+        each worker reusing one browser for all the pages it takes. Records
+        are updated in place, so they keep their listing order; a record
+        whose detail page fails keeps the values parsed from its card.
+        """
+        if self.offline or not self.detail_url_field:
+            return records
+        pending = queue.Queue()
+        for record in self.reuse_stored_details(records):
+            if record.get(self.detail_url_field):
+                pending.put(record)
+        if pending.empty():
+            return records
+        loaded = []
+
+        def drain():
+            with self.thread_driver():
+                while True:
+                    try:
+                        record = pending.get_nowait()
+                    except queue.Empty:
+                        return
+                    url = record[self.detail_url_field]
+                    try:
+                        self.apply_detail(record, self.fetch_detail(url))
+                        loaded.append(record)
+                    except Exception as e:
+                        logger.error(f"Error loading {self.source_name} detail page {url}: {str(e)}")
+                        self.stats.add(errors=1)
+                        SCRAPE_ERRORS.labels(self.source_name, 'detail').inc()
+
+        workers = min(self.detail_concurrency(), pending.qsize())
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'{self.source_name}-details') as executor:
+            for future in [executor.submit(drain) for _ in range(workers)]:
+                future.result()
+        logger.info(f"Loaded {self.source_name} detail pages with {workers} workers in {time.monotonic() - started:.1f}s")
+        if self.listing_model is not None:
+            get_known_listings().touch(self.listing_model, [self.listing_model.identity_of(record) for record in loaded])
+        return records
+
+    def reuse_stored_details(self, records):
+        """
+        Copy ``detail_fields`` from stored listings whose details are fresh.
+
+        Returns the records that still need their detail page: new
+        listings, stale ones, and any the database no longer has.
+        """
+        if self.listing_model is None or not self.detail_fields:
+            return records
+        identities = [self.listing_model.identity_of(record) for record in records]
+        fresh = get_known_listings().fresh(self.listing_model, identities)
+        if not fresh:
+            return records
+        stored = {
+            row.pop('identity'): row
+            for row in self.listing_model.objects.filter(identity__in=fresh).values('identity', *self.detail_fields)
+        }
+        remaining = []
+        for identity, record in zip(identities, records):
+            if identity in stored:
+                record.update(stored[identity])
+            else:
+                remaining.append(record)
+        if stored:
+            logger.info(f"Reused stored details for {len(records) - len(remaining)} known {self.source_name} listings")
+        return remaining
+
+    def fetch_detail(self, url):
+        """Text of ``detail_selector`` on a detail page, loaded in this thread's browser"""
+        started = time.monotonic()
+        with stage('fetch'):
+            self.load_page(url)
+            self.wait_for_element(By.CSS_SELECTOR, self.detail_selector)
+            text = self.driver.find_element(By.CSS_SELECTOR, self.detail_selector).text
+        get_resource_blocker().record(self.driver, self.source_name)
+        self.stats.add(bytes_transferred=len(text.encode('utf-8')), fetch_seconds=time.monotonic() - started)
+        return text
+
+    def apply_detail(self, record, text):
+        """Update a record from the text of its detail page"""
+        raise NotImplementedError
+
+    def fetch_page(self, url, card_selector):
+        """Return the HTML of a listing page whose cards match ``card_selector``"""
+        started = time.monotonic()
+        with stage('fetch'):
+            html = self._fetch_page(url, card_selector)
+        elapsed = time.monotonic() - started
+        self.stats.add(pages_fetched=1, bytes_transferred=len((html or '').encode('utf-8')), fetch_seconds=elapsed)
+        PAGE_FETCH_SECONDS.labels(self.source_name).observe(elapsed)
+        archive_page(url, html, self.source_name)
+        return html
+
+    def _fetch_page(self, url, card_selector):
+        source = self.source_name or self.__class__.__name__
+        strategy = remembered_strategy(source) if self.static_first else SourceState.BROWSER
+        if strategy != SourceState.BROWSER:
+            retries = getattr(settings, 'SCRAPER_STATIC_RETRIES', 2)
+            for attempt in range(retries + 1):
+                status, html = self._fetch_static(url, card_selector)
+                if html is not None:
+                    if strategy != SourceState.STATIC:
+                        remember_strategy(source, SourceState.STATIC)
+                    return html
+                if status == 200:
+                    # Only a page that loaded fine but has no cards says the site needs a browser
+                    logger.info(f"Static HTML for {source} has no '{card_selector}' cards; using the browser")
+                    remember_strategy(source, SourceState.BROWSER)
+                    break
+                if status is not None and status != 429 and status < 500:
+                    break
+                # Throttled or a server hiccup: the scheduler holds the domain before the retry
+            else:
+                logger.info(f"Static fetch of {url} kept failing; loading this page in the browser")
+
+        return self._fetch_with_browser(url, card_selector)
+
+    def _fetch_static(self, url, card_selector):
+        """
+        Plain GET; returns (status, html).
+
+        ``html`` is None unless the response already contains cards, and
+        ``status`` is None when the request itself failed. Throttling and
+        server errors put the domain on hold in the scheduler, for as long
+        as Retry-After asks or ``SCRAPER_STATIC_RETRY_DELAY`` seconds.
+        """
+        scheduler = get_scheduler()
+        scheduler.wait(url)
+        started = time.monotonic()
+        try:
+            response = self.http.get(redirect_url(url), timeout=getattr(settings, 'SCRAPER_HTTP_TIMEOUT', 30))
+        except requests.RequestException as e:
+            scheduler.record(url, error=True, retry_after=getattr(settings, 'SCRAPER_STATIC_RETRY_DELAY', 10))
+            logger.warning(f"Static fetch of {url} failed: {str(e)}")
+            return None, None
+        status = response.status_code
+        retry_after = None
+        if status == 429 or status >= 500:
+            retry_after = (parse_retry_after(response.headers.get('Retry-After'))
+                           or getattr(settings, 'SCRAPER_STATIC_RETRY_DELAY', 10))
+        scheduler.record(url, time.monotonic() - started, status=status, error=status >= 500,
+                         retry_after=retry_after)
+        if status in (403, 429):
+            self.report_block(f"HTTP {status}")
+        if status != 200:
+            logger.info(f"Static fetch of {url} returned {status}")
+            return status, None
+        html = response.text
+        if not parse_cards(html, card_selector):
+            return status, None
+        return status, html
+
+    def _fetch_with_browser(self, url, card_selector):
+        self.load_page(url)
+        if self.wait_for_element(By.CSS_SELECTOR, card_selector) is None:
+            self.report_block(f"no '{card_selector}' cards")
+        self.scroll_page(card_selector)
+        html = self.driver.page_source
+        get_resource_blocker().record(self.driver, self.source_name)
+        return html
+
+    def scroll_page(self, card_selector=None):
+        """Load the rest of an infinite-scroll page, stopping once no new cards appear"""
+        return scroll_until_idle(self.driver, card_selector or self.card_selector)
+
+    def load_page(self, url):
+        """
+        Load a URL in the browser, paced and with this source's resource blocking.
+
+        Every browser visit should go through here so it is also sent to the
+        mock server or a base URL override when one is set (see core.scraping.redirect).
+        """
+        get_resource_blocker().apply(self.driver, self.source_name)
+        scheduler = get_scheduler()
+        scheduler.wait(url)
+        started = time.monotonic()
+        try:
+            self.driver.get(redirect_url(url))
+        except Exception:
+            scheduler.record(url, error=True)
+            raise
+        scheduler.record(url, time.monotonic() - started)
+
+
+def listing_scrapers():
+    """Map ``source_name`` to class for every scraper that can parse pages"""
+    # Importing the scraper packages registers every listing scraper
+    import jobs.scrapers  # noqa: F401
+    import scholarships.scrapers  # noqa: F401
+
+    found = {}
+    pending = list(PageFetchMixin.__subclasses__())
+    while pending:
+        cls = pending.pop()
+        pending.extend(cls.__subclasses__())
+        if cls.source_name and cls.parse_page is not PageFetchMixin.parse_page:
+            found[cls.source_name] = cls
+    return found
@@ -0,0 +1,244 @@
+import asyncio
+import concurrent.futures
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+
+import aiohttp
+import requests
+from django.conf import settings
+
+from .archive import archive_page
+from .redirect import redirect_url
+from .throttle import get_scheduler, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+
+class FetchError(Exception):
+    """Raised for non-2xx responses by FetchResult.raise_for_status()"""
+
+
+@dataclass
+class FetchResult:
+    """Body and metadata of a completed HTTP request"""
+    url: str
+    status: int
+    text: str
+    headers: dict = field(default_factory=dict)
+    elapsed: float = 0.0
+    pending: tuple = field(default=None, repr=False)
+
+    @property
+    def ok(self):
+        return 200 <= self.status < 300
+
+    @property
+    def not_modified(self):
+        """True when a conditional request found nothing new; ``text`` is the cached body"""
+        return self.status == 304
+
+    def commit(self):
+        """
+        Let later fetches of this page be answered with 304 Not Modified.
+
+        Call it once the records parsed from ``text`` are saved. Until then
+        the page is fetched in full again, so a failed parse or ingest can't
+        leave its listings unstored behind a 304.
+        """
+        if self.pending is not None:
+            cache, url, params = self.pending
+            cache.commit(url, params)
+            self.pending = None
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if not self.ok and not self.not_modified:
+            raise FetchError(f"HTTP {self.status} for {self.url}")
+
+
+def _cache_params(params, vary):
+    """Request params plus anything else the parsed records depend on, as the cache keys them"""
+    if not vary:
+        return params
+    return {**(params or {}), **{f'vary:{name}': value for name, value in vary.items() if value is not None}}
+
+
+def _conditional_headers(cache, url, params, headers):
+    if cache is None:
+        return headers
+    return {**(headers or {}), **cache.conditional_headers(url, params)}
+
+
+def _update_cache(cache, url, params, result):
+    """Store a fresh body, or swap the cached one in after a 304"""
+    if cache is None:
+        return
+    if result.status == 200:
+        cache.store(url, params, result.headers, result.text)
+        result.pending = (cache, url, params)
+    elif result.not_modified:
+        result.text = cache.revalidated(url, params) or ''
+        logger.info(f"{url} not modified since last fetch")
+
+
+class AsyncFetcher:
+    """
+    Async HTTP client for scraping many pages at once.
+
+    One ``aiohttp`` session is shared by every request made inside the
+    ``async with`` block, so connections are kept alive and reused. The
+    connector caps open connections overall and per host, which doubles as
+    a per-host concurrency limit: extra requests simply queue for a slot.
+
+    With a ``cache`` (see ``core.scraping.cache``) requests are made
+    conditional and unchanged pages come back as ``not_modified``, but only
+    after ``FetchResult.commit()`` was called for an earlier fetch. Fresh
+    bodies are stored in the page archive under the given ``source``.
+    """
+    def __init__(self, headers=None, timeout=None, max_connections=None, per_host=None, cache=None):
+        self.headers = headers or {}
+        self.cache = cache
+        self.timeout = timeout or getattr(settings, 'SCRAPER_HTTP_TIMEOUT', 30)
+        self.max_connections = max_connections or getattr(settings, 'SCRAPER_HTTP_MAX_CONNECTIONS', 20)
+        self.per_host = per_host or getattr(settings, 'SCRAPER_HTTP_PER_HOST_LIMIT', 4)
+        self._session = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(
+            limit=self.max_connections,
+            limit_per_host=self.per_host,
+            keepalive_timeout=30,
+            ttl_dns_cache=300,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self._session.close()
+        self._session = None
+
+    async def fetch(self, url, params=None, headers=None, source=None, vary=None):
+        """
+        GET a URL and return its decoded body; network errors propagate.
+
+        ``vary`` holds whatever else the caller's parsed records depend on
+        (a field filter, say). It is never sent, but keys the cache, so a
+        304 only comes back for a request that was parsed the same way.
+        """
+        scheduler = get_scheduler()
+        await scheduler.wait_async(url)
+        cache_params = _cache_params(params, vary)
+        headers = _conditional_headers(self.cache, url, cache_params, headers)
+        started = time.monotonic()
+        try:
+            async with self._session.get(redirect_url(url), params=params, headers=headers) as response:
+                text = await response.text(errors='replace')
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            await scheduler.record_async(url, error=True)
+            raise
+
+        result = FetchResult(
+            url=str(response.url),
+            status=response.status,
+            text=text,
+            headers=dict(response.headers),
+            elapsed=time.monotonic() - started,
+        )
+        await scheduler.record_async(
+            url, result.elapsed, status=result.status,
+            retry_after=parse_retry_after(result.headers.get('Retry-After')),
+        )
+        _update_cache(self.cache, url, cache_params, result)
+        if result.status == 200:
+            archive_page(result.url, result.text, source)
+        return result
+
+    async def fetch_all(self, urls, **kwargs):
+        """Fetch several URLs concurrently, returning results in input order"""
+        return await asyncio.gather(*(self.fetch(url, **kwargs) for url in urls))
+
+
+def fetch_url(url, params=None, headers=None, session=None, cache=None, timeout=None, source=None, vary=None):
+    """Blocking counterpart of ``AsyncFetcher.fetch`` built on requests"""
+    session = session or requests
+    scheduler = get_scheduler()
+    scheduler.wait(url)
+    cache_params = _cache_params(params, vary)
+    started = time.monotonic()
+    try:
+        response = session.get(
+            redirect_url(url),
+            params=params,
+            headers=_conditional_headers(cache, url, cache_params, headers),
+            timeout=timeout or getattr(settings, 'SCRAPER_HTTP_TIMEOUT', 30),
+        )
+    except requests.RequestException:
+        scheduler.record(url, error=True)
+        raise
+
+    result = FetchResult(
+        url=response.url,
+        status=response.status_code,
+        text=response.text,
+        headers=dict(response.headers),
+        elapsed=time.monotonic() - started,
+    )
+    scheduler.record(
+        url, result.elapsed, status=result.status,
+        retry_after=parse_retry_after(result.headers.get('Retry-After')),
+    )
+    _update_cache(cache, url, cache_params, result)
+    if result.status == 200:
+        archive_page(result.url, result.text, source)
+    return result
+
+
+def run_async(coro):
+    """Run a coroutine to completion from synchronous scraper code"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # Already inside an event loop (e.g. an async view); use a private one
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+def iter_async(agen):
+    """
+    Iterate an async generator from synchronous scraper code.
+
+    Each item is handed over as soon as the generator yields it, so callers
+    can save the first results while the rest are still downloading.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        # Can't block this loop item by item; collect everything on a private one
+        async def collect():
+            return [item async for item in agen]
+        yield from run_async(collect())
+        return
+
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                item = loop.run_until_complete(agen.__anext__())
+            except StopAsyncIteration:
+                break
+            yield item
+    finally:
+        loop.run_until_complete(agen.aclose())
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
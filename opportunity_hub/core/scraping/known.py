@@ -0,0 +1,69 @@
+import threading
+import time
+
+from django.conf import settings
+from django.utils import timezone
+
+
+def _max_age():
+    return timezone.timedelta(hours=getattr(settings, 'SCRAPER_DETAIL_MAX_AGE_HOURS', 168))
+
+
+class KnownListings:
+    """
+    Process-local index of stored listings whose details are still fresh.
+
+    The first check for a model loads the identity (and ``updated_at``) of
+    every row changed within ``SCRAPER_DETAIL_MAX_AGE_HOURS``; after that
+    only rows changed since the last load are fetched, at most every
+    ``SCRAPER_KNOWN_LISTINGS_REFRESH`` seconds. Membership checks in
+    between never touch the database.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._seen = {}
+        self._loaded = {}
+
+    def _refresh(self, model):
+        interval = getattr(settings, 'SCRAPER_KNOWN_LISTINGS_REFRESH', 300)
+        loaded = self._loaded.get(model)
+        if loaded and time.monotonic() - loaded[0] < interval:
+            return
+        now = timezone.now()
+        since = loaded[1] if loaded else now - _max_age()
+        seen = self._seen.setdefault(model, {})
+        for identity, updated_at in model.objects.filter(updated_at__gte=since).values_list('identity', 'updated_at'):
+            seen[identity] = max(updated_at, seen.get(identity, updated_at))
+        cutoff = now - _max_age()
+        for identity in [identity for identity, at in seen.items() if at < cutoff]:
+            del seen[identity]
+        self._loaded[model] = (time.monotonic(), now)
+
+    def fresh(self, model, identities):
+        """The identities that are stored with details newer than the max age"""
+        cutoff = timezone.now() - _max_age()
+        with self._lock:
+            self._refresh(model)
+            seen = self._seen[model]
+            return {identity for identity in identities if seen.get(identity, cutoff) > cutoff}
+
+    def touch(self, model, identities):
+        """Mark listings whose details were just loaded as fresh"""
+        now = timezone.now()
+        with self._lock:
+            seen = self._seen.setdefault(model, {})
+            for identity in identities:
+                seen[identity] = now
+
+    def clear(self):
+        with self._lock:
+            self._seen.clear()
+            self._loaded.clear()
+
+
+_known = KnownListings()
+
+
+def get_known_listings():
+    """Return the process-wide index of known listings"""
+    return _known
@@ -0,0 +1,355 @@
+import logging
+import re
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Card selectors simple enough to match while the page is still being tokenized:
+# tag, tag.class, .class, tag#id, tag[attr] and tag[attr="value"]
+_SIMPLE_SELECTOR = re.compile(
+    r'^(?P<tag>[a-zA-Z][\w-]*)?'
+    r'(?:\.(?P<cls>[\w-]+)|#(?P<id>[\w-]+)|\[(?P<attr>[\w-]+)(?:="(?P<value>[^"]*)")?\])?$'
+)
+
+
+@lru_cache(maxsize=256)
+def simple_selector(css):
+    """Split a simple selector into (tag, attribute, value), or None if it isn't one"""
+    match = _SIMPLE_SELECTOR.match(css.strip())
+    if not match or not any(match.groupdict().values()):
+        return None
+    if match['cls']:
+        return match['tag'], 'class', match['cls']
+    if match['id']:
+        return match['tag'], 'id', match['id']
+    return match['tag'], match['attr'], match['value']
+
+
+def _matches(tag, attrs, target):
+    """Does an element with this tag and attribute dict match a simple selector?"""
+    want_tag, attr, value = target
+    if want_tag and tag != want_tag.lower():
+        return False
+    if attr is None:
+        return True
+    actual = attrs.get(attr)
+    if actual is None:
+        return False
+    if attr == 'class':
+        return value in actual.split()
+    return value is None or actual == value
+
+
+class Node:
+    """
+    Backend-neutral HTML element.
+
+    Scrapers only use CSS selection (``select`` / ``select_one``), ``text``
+    and attribute access (``node['href']`` / ``node.get('href')``), which
+    every parser backend below can do natively and quickly.
+    """
+    __slots__ = ('_el',)
+
+    def __init__(self, el):
+        self._el = el
+
+    @classmethod
+    def parse(cls, html):
+        raise NotImplementedError
+
+    @classmethod
+    def parse_cards(cls, html, card_selector):
+        """Return just the cards; backends override this to skip the rest of the page"""
+        return cls.parse(html).select(card_selector)
+
+    def select(self, css):
+        raise NotImplementedError
+
+    def select_one(self, css):
+        raise NotImplementedError
+
+    def iter(self):
+        """Descendant elements in document order"""
+        raise NotImplementedError
+
+    @property
+    def tag(self):
+        raise NotImplementedError
+
+    @property
+    def attrs(self):
+        """Attribute dict with string values"""
+        raise NotImplementedError
+
+    @property
+    def text(self):
+        raise NotImplementedError
+
+    def get(self, name, default=None):
+        raise NotImplementedError
+
+    def __getitem__(self, name):
+        value = self.get(name)
+        if value is None:
+            raise KeyError(name)
+        return value
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.text[:40]!r}>"
+
+
+class SoupNode(Node):
+    """BeautifulSoup with the pure-Python parser; always available"""
+    __slots__ = ()
+
+    @classmethod
+    def parse(cls, html):
+        return cls(BeautifulSoup(html, 'html.parser'))
+
+    @classmethod
+    def parse_cards(cls, html, card_selector):
+        """Build tree nodes only for the cards, SoupStrainer style"""
+        target = simple_selector(card_selector)
+        if target is None:
+            return cls.parse(html).select(card_selector)
+        tag, attr, value = target
+        if attr == 'class':
+            attrs = {'class': re.compile(rf'(^|\s){re.escape(value)}(\s|$)')}
+        elif attr is not None:
+            attrs = {attr: True if value is None else value}
+        else:
+            attrs = {}
+        soup = BeautifulSoup(html, 'html.parser', parse_only=SoupStrainer(tag, attrs=attrs))
+        return [cls(el) for el in soup.select(card_selector)]
+
+    def select(self, css):
+        return [SoupNode(el) for el in self._el.select(css)]
+
+    def select_one(self, css):
+        el = self._el.select_one(css)
+        return SoupNode(el) if el is not None else None
+
+    def iter(self):
+        return (SoupNode(el) for el in self._el.descendants if isinstance(el, Tag))
+
+    @property
+    def tag(self):
+        return self._el.name
+
+    @property
+    def attrs(self):
+        return {name: ' '.join(value) if isinstance(value, list) else value
+                for name, value in self._el.attrs.items()}
+
+    @property
+    def text(self):
+        return self._el.get_text()
+
+    def get(self, name, default=None):
+        value = self._el.get(name, default)
+        # bs4 returns multi-valued attributes such as class as lists
+        return ' '.join(value) if isinstance(value, list) else value
+
+
+@lru_cache(maxsize=256)
+def _lxml_selector(css):
+    from lxml.cssselect import CSSSelector
+    return CSSSelector(css)
+
+
+class LxmlNode(Node):
+    """lxml's C parser with selectors compiled to XPath once per CSS string"""
+    __slots__ = ()
+
+    @classmethod
+    def parse(cls, html):
+        import lxml.html
+        if not html or not html.strip():
+            html = '<html></html>'
+        # Encode first: lxml refuses str input that carries an XML encoding declaration
+        parser = lxml.html.HTMLParser(encoding='utf-8')
+        return cls(lxml.html.document_fromstring(html.encode('utf-8'), parser=parser))
+
+    @classmethod
+    def parse_cards(cls, html, card_selector, chunk_size=64 * 1024):
+        """
+        Stream the page through lxml's pull parser, keeping only the cards.
+
+        Each card is detached once its end tag is seen and everything else
+        is cleared as soon as it closes, so the tree held in memory never
+        grows much beyond the cards themselves.
+        """
+        import lxml.etree
+        import lxml.html
+        target = simple_selector(card_selector)
+        if target is None:
+            return cls.parse(html).select(card_selector)
+
+        parser = lxml.etree.HTMLPullParser(events=('start', 'end'), encoding='utf-8')
+        # lxml.html elements, as parse() builds, so cards have text_content() and friends
+        parser.set_element_class_lookup(lxml.html.HtmlElementClassLookup())
+        data = (html or '').encode('utf-8')
+        cards = []
+        depth = 0
+
+        def handle(events):
+            nonlocal depth
+            for event, el in events:
+                if not isinstance(el.tag, str):
+                    continue
+                if event == 'start':
+                    if depth or _matches(el.tag, el.attrib, target):
+                        depth += 1
+                elif depth:
+                    depth -= 1
+                    if depth == 0:
+                        cards.append(el)
+                        parent = el.getparent()
+                        if parent is not None:
+                            parent.remove(el)
+                else:
+                    el.clear()
+                    while el.getprevious() is not None:
+                        del el.getparent()[0]
+
+        for start in range(0, len(data), chunk_size):
+            parser.feed(data[start:start + chunk_size])
+            handle(parser.read_events())
+        try:
+            parser.close()
+        except lxml.etree.XMLSyntaxError:
+            pass
+        handle(parser.read_events())
+        return [cls(el) for el in cards]
+
+    def select(self, css):
+        return [LxmlNode(el) for el in _lxml_selector(css)(self._el)]
+
+    def select_one(self, css):
+        found = _lxml_selector(css)(self._el)
+        return LxmlNode(found[0]) if found else None
+
+    def iter(self):
+        return (LxmlNode(el) for el in self._el.iterdescendants() if isinstance(el.tag, str))
+
+    @property
+    def tag(self):
+        return self._el.tag
+
+    @property
+    def attrs(self):
+        return self._el.attrib
+
+    @property
+    def text(self):
+        return self._el.text_content()
+
+    def get(self, name, default=None):
+        return self._el.get(name, default)
+
+
+class SelectolaxNode(Node):
+    """
+    selectolax (lexbor), the fastest option for large listing pages.
+
+    lexbor has no partial-parse mode, but it builds the whole tree in C
+    faster than the other backends can skip over it, so ``parse_cards``
+    keeps the default full parse.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def parse(cls, html):
+        try:
+            from selectolax.lexbor import LexborHTMLParser as HTMLParser
+        except ImportError:
+            from selectolax.parser import HTMLParser
+        return cls(HTMLParser(html or ''))
+
+    def select(self, css):
+        return [SelectolaxNode(el) for el in self._el.css(css)]
+
+    def select_one(self, css):
+        el = self._el.css_first(css)
+        return SelectolaxNode(el) if el is not None else None
+
+    def iter(self):
+        nodes = self._el.traverse(include_text=False)
+        next(nodes, None)  # traverse() starts with the node itself
+        return (SelectolaxNode(el) for el in nodes)
+
+    @property
+    def tag(self):
+        return self._el.tag
+
+    @property
+    def attrs(self):
+        return {name: value or '' for name, value in self._el.attributes.items()}
+
+    @property
+    def text(self):
+        return self._el.text(deep=True)
+
+    def get(self, name, default=None):
+        value = self._el.attributes.get(name, default)
+        # Valueless attributes (e.g. <time datetime>) come back as None
+        return '' if value is None and name in self._el.attributes else value
+
+
+BACKENDS = {
+    'selectolax': (SelectolaxNode, 'selectolax'),
+    'lxml': (LxmlNode, 'lxml.cssselect'),
+    'html.parser': (SoupNode, 'bs4'),
+}
+
+
+@lru_cache(maxsize=None)
+def _backend(name):
+    """Node class for a backend name, falling back to html.parser if it isn't installed"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend '{name}'; choose from {', '.join(BACKENDS)}")
+    node_class, module = BACKENDS[name]
+    try:
+        __import__(module)
+    except ImportError:
+        logger.warning(f"HTML parser backend '{name}' is not installed; using html.parser")
+        return SoupNode
+    return node_class
+
+
+def parse_html(html, backend=None):
+    """Parse a page with the configured backend and return its root Node"""
+    return _backend(backend or getattr(settings, 'SCRAPER_HTML_PARSER', 'html.parser')).parse(html)
+
+
+_card_counts = threading.local()
+
+
+@contextmanager
+def count_cards():
+    """Count the cards ``parse_cards`` returns in this thread; yields a one-item list"""
+    counts = [0]
+    previous = getattr(_card_counts, 'counts', None)
+    _card_counts.counts = counts
+    try:
+        yield counts
+    finally:
+        _card_counts.counts = previous
+
+
+def parse_cards(html, card_selector, backend=None):
+    """Return the card Nodes of a listing page, parsing as little else as the backend allows"""
+    node_class = _backend(backend or getattr(settings, 'SCRAPER_HTML_PARSER', 'html.parser'))
+    if not getattr(settings, 'SCRAPER_PARTIAL_PARSE', True):
+        cards = node_class.parse(html).select(card_selector)
+    else:
+        cards = node_class.parse_cards(html, card_selector)
+    counts = getattr(_card_counts, 'counts', None)
+    if counts is not None:
+        counts[0] += len(cards)
+    return cards
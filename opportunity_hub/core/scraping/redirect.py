@@ -0,0 +1,28 @@
+from urllib.parse import urlsplit
+
+from django.conf import settings
+
+
+def redirect_url(url):
+    """
+    Where a scraper request for ``url`` is actually sent.
+
+    ``SCRAPER_BASE_URL_OVERRIDES`` maps a base URL (scheme and host, e.g.
+    ``'https://www.indeed.com'``) to a replacement; the longest matching
+    prefix wins. Otherwise, with ``SCRAPER_MOCK_SERVER`` set, every absolute
+    URL goes to ``<mock server>/<host><path>?<query>`` (see
+    ``core.mock_sources``). Records keep the real URLs either way.
+    """
+    overrides = getattr(settings, 'SCRAPER_BASE_URL_OVERRIDES', {})
+    for base in sorted(overrides, key=len, reverse=True):
+        if url.startswith(base):
+            return overrides[base].rstrip('/') + url[len(base.rstrip('/')):]
+
+    mock = getattr(settings, 'SCRAPER_MOCK_SERVER', '')
+    if not mock:
+        return url
+    parts = urlsplit(url)
+    if not parts.netloc:
+        return url
+    target = f"{mock.rstrip('/')}/{parts.netloc}{parts.path or '/'}"
+    return f'{target}?{parts.query}' if parts.query else target
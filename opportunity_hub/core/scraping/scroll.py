@@ -0,0 +1,76 @@
+import logging
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Runs inside the page as one async script: scroll to the bottom, and every
+# time new cards (or, without a selector, any new nodes) appear, scroll
+# again. Resolves once nothing new has arrived for ``idleMs``, or when the
+# card or time cap is hit.
+SCROLL_SCRIPT = """
+const [selector, idleMs, maxCards, maxMs, done] = arguments;
+const started = performance.now();
+const count = () => selector ? document.querySelectorAll(selector).length : 0;
+let seen = count();
+let idleTimer = null;
+let pending = false;
+let finished = false;
+
+const finish = (reason) => {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(idleTimer);
+    clearTimeout(hardStop);
+    done({cards: count(), height: document.body.scrollHeight, reason: reason,
+          elapsed: Math.round(performance.now() - started)});
+};
+
+const step = () => {
+    pending = false;
+    if (maxCards && count() >= maxCards) return finish('max_cards');
+    window.scrollTo(0, document.body.scrollHeight);
+    clearTimeout(idleTimer);
+    idleTimer = setTimeout(() => finish('idle'), idleMs);
+};
+
+const observer = new MutationObserver(() => {
+    if (finished || pending) return;
+    if (selector) {
+        const now = count();
+        if (now <= seen) return;
+        seen = now;
+    }
+    // Coalesce a burst of mutations into one scroll
+    pending = true;
+    setTimeout(step, 50);
+});
+observer.observe(document.body, {childList: true, subtree: true});
+const hardStop = setTimeout(() => finish('timeout'), maxMs);
+step();
+"""
+
+
+def scroll_until_idle(driver, card_selector=None, idle_ms=None, max_cards=None, max_seconds=None):
+    """
+    Scroll an infinite-scroll page until no new cards load.
+
+    One WebDriver round trip for the whole page instead of a sleep and
+    three calls per step. Returns the script's summary, e.g.
+    ``{'cards': 75, 'height': 18210, 'reason': 'idle', 'elapsed': 2310}``,
+    or None if the page couldn't be scrolled.
+    """
+    idle_ms = idle_ms or getattr(settings, 'SCRAPER_SCROLL_IDLE_MS', 1500)
+    max_cards = max_cards or getattr(settings, 'SCRAPER_SCROLL_MAX_CARDS', 500)
+    max_seconds = max_seconds or getattr(settings, 'SCRAPER_SCROLL_MAX_SECONDS', 30)
+    try:
+        driver.set_script_timeout(max_seconds + 5)
+        summary = driver.execute_async_script(
+            SCROLL_SCRIPT, card_selector, idle_ms, max_cards, int(max_seconds * 1000)
+        )
+    except Exception as e:
+        logger.error(f"Error scrolling page: {str(e)}")
+        return None
+    logger.debug(f"Scrolled to {summary}")
+    return summary
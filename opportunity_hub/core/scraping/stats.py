@@ -0,0 +1,33 @@
+import threading
+from dataclasses import dataclass, field, fields
+
+
+@dataclass
+class ScrapeStats:
+    """
+    Counters one scraper instance accumulates while it runs.
+
+    Safe to update from the page and detail worker threads. ``take``
+    returns the totals and starts over, which is what a task does before
+    writing them to its SourceRun (see ``core.ledger``).
+    """
+    pages_fetched: int = 0
+    cards_found: int = 0
+    records_extracted: int = 0
+    errors: int = 0
+    bytes_transferred: int = 0
+    fetch_seconds: float = 0.0
+    parse_seconds: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def take(self):
+        with self._lock:
+            totals = {f.name: getattr(self, f.name) for f in fields(self) if f.name != '_lock'}
+            for name, value in totals.items():
+                setattr(self, name, type(value)())
+        return totals
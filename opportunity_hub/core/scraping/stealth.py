@@ -0,0 +1,70 @@
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.utils import timezone
+
+from core.models import SourceState
+
+logger = logging.getLogger(__name__)
+
+FAST = SourceState.FAST
+CAUTIOUS = SourceState.CAUTIOUS
+HUMAN = SourceState.HUMAN
+LEVEL_NAMES = dict(SourceState.STEALTH_LEVEL_CHOICES)
+
+# Process-local view of SourceState.stealth_level: source -> (level, when it last
+# changed, when we read it). Other workers change levels too, so entries are
+# re-read after SCRAPER_STEALTH_CACHE_SECONDS
+_levels = {}
+_levels_lock = threading.Lock()
+
+
+def _save(source, level, now, blocked=False):
+    defaults = {'stealth_level': level, 'stealth_changed_at': now}
+    if blocked:
+        defaults['last_blocked_at'] = now
+    with _levels_lock:
+        _levels[source] = (level, now, time.monotonic())
+    SourceState.objects.update_or_create(source=source, defaults=defaults)
+
+
+def stealth_level(source):
+    """
+    How much anti-detection work a source currently needs.
+
+    Every source starts at FAST. A level only goes up when the site pushes
+    back (see ``report_block``) and steps back down one level after
+    ``SCRAPER_STEALTH_DECAY_HOURS`` without a block.
+    """
+    max_age = getattr(settings, 'SCRAPER_STEALTH_CACHE_SECONDS', 60)
+    with _levels_lock:
+        cached = _levels.get(source)
+    if cached is None or time.monotonic() - cached[2] > max_age:
+        state = SourceState.objects.filter(source=source).first()
+        cached = (state.stealth_level, state.stealth_changed_at) if state else (FAST, None)
+        cached += (time.monotonic(),)
+        with _levels_lock:
+            _levels[source] = cached
+
+    level, changed_at, _ = cached
+    if level > FAST and changed_at:
+        decay_after = timezone.timedelta(hours=getattr(settings, 'SCRAPER_STEALTH_DECAY_HOURS', 24))
+        now = timezone.now()
+        if now - changed_at > decay_after:
+            level -= 1
+            _save(source, level, now)
+            logger.info(f"No blocks from {source} lately; stealth level now {LEVEL_NAMES[level]}")
+    return level
+
+
+def report_block(source, reason):
+    """Escalate a source's stealth level after a CAPTCHA, 403, empty page or similar"""
+    # Escalate from the stored level, which another worker may have raised already
+    with _levels_lock:
+        _levels.pop(source, None)
+    level = min(stealth_level(source) + 1, HUMAN)
+    _save(source, level, timezone.now(), blocked=True)
+    logger.warning(f"{source} pushed back ({reason}); stealth level now {LEVEL_NAMES[level]}")
+    return level
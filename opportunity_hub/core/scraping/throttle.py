@@ -0,0 +1,267 @@
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import requests
+from django.conf import settings
+from django.core.cache import caches
+
+from .redirect import redirect_url
+
+logger = logging.getLogger(__name__)
+
+# Responses that mean "slow down" rather than "this page is broken"
+BACKOFF_STATUSES = {403, 429, 503}
+
+
+def parse_retry_after(value):
+    """Seconds a Retry-After header asks for (delta-seconds or an HTTP date), or None"""
+    value = value.strip() if isinstance(value, str) else ''
+    if value.isdigit():
+        return int(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        return None
+    return max(0, int(when.timestamp() - time.time()))
+
+
+class DomainThrottle:
+    """
+    Token bucket for a single domain whose refill rate follows the site.
+
+    Requests spend one token each; tokens refill at ``rate`` per second up
+    to ``burst``. Fast, successful responses nudge the rate up (additive
+    increase), while throttling responses, errors and slow pages cut it
+    (multiplicative decrease). The rate never exceeds what robots.txt asks
+    for via Crawl-delay / Request-rate.
+
+    With a ``cache`` (a Django cache every worker process can reach, e.g.
+    Redis) the bucket lives there, so all processes draw from one bucket
+    per domain instead of each pacing itself at the full rate; ``clock``
+    must then be wall-clock time. If the cache stops answering, the
+    throttle carries on in this process alone.
+    """
+    # Seconds to wait for the shared bucket's lock, and how long a lock lives if its holder dies
+    lock_wait = 2
+    lock_timeout = 5
+
+    def __init__(self, domain, rate=0.5, burst=3, min_rate=0.05, max_rate=2.0,
+                 target_latency=2.0, slow_latency=8.0, clock=time.monotonic, cache=None):
+        self.domain = domain
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.target_latency = target_latency
+        self.slow_latency = slow_latency
+        self.clock = clock
+        self.tokens = float(burst)
+        self.cooldown_until = 0.0
+        self._updated = clock()
+        self._lock = threading.Lock()
+        self.cache = cache
+        self._key = f'scraper:throttle:{domain}'
+
+    @contextmanager
+    def _locked(self):
+        """Hold the bucket, loading the shared state first and writing it back after"""
+        with self._lock:
+            shared, token = self._load() if self.cache is not None else (False, None)
+            try:
+                yield
+            finally:
+                if shared:
+                    self._save(token)
+
+    def _load(self):
+        """Read the shared bucket; returns (whether it was read, our lock token or None without the lock)"""
+        lock = f'{self._key}:lock'
+        token = uuid.uuid4().hex
+        try:
+            # Only one caller's add() succeeds; the lock expires by itself if its holder dies
+            deadline = time.monotonic() + self.lock_wait
+            while not self.cache.add(lock, token, timeout=self.lock_timeout):
+                if time.monotonic() > deadline:
+                    logger.warning(f"Throttle lock for {self.domain} looks stuck; going ahead without it")
+                    token = None
+                    break
+                time.sleep(0.01)
+            state = self.cache.get(self._key)
+        except Exception as e:
+            self._lose_cache(e)
+            return False, None
+        if state:
+            self.rate, self.tokens, self.cooldown_until, self._updated = state
+            self.rate = min(self.rate, self.max_rate)
+        return True, token
+
+    def _save(self, token):
+        lock = f'{self._key}:lock'
+        try:
+            # Without the lock (or after it expired and someone else took it) the holder's write wins
+            if token is None or self.cache.get(lock) != token:
+                return
+            self.cache.set(self._key, (self.rate, self.tokens, self.cooldown_until, self._updated), timeout=86400)
+            self.cache.delete(lock)
+        except Exception as e:
+            self._lose_cache(e)
+
+    def _lose_cache(self, error):
+        logger.warning(f"Shared throttle state for {self.domain} unavailable, pacing per process: {str(error)}")
+        self.cache = None
+
+    def apply_crawl_delay(self, delay):
+        """Cap the rate at one request per ``delay`` seconds"""
+        if not delay or delay <= 0:
+            return
+        with self._locked():
+            self.max_rate = min(self.max_rate, 1.0 / delay)
+            self.rate = min(self.rate, self.max_rate)
+            self.min_rate = min(self.min_rate, self.max_rate)
+            self.burst = 1
+            self.tokens = min(self.tokens, 1.0)
+
+    def reserve(self):
+        """Take a token and return how many seconds to wait before using it"""
+        with self._locked():
+            now = self.clock()
+            self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            wait = max(0.0, self.cooldown_until - now)
+            if self.tokens < 1:
+                wait = max(wait, (1 - self.tokens) / self.rate)
+            # Tokens may go negative so concurrent callers queue up behind each other
+            self.tokens -= 1
+            return wait
+
+    def record(self, latency=None, status=None, error=False, retry_after=None):
+        """Adapt the rate to how the last request went"""
+        with self._locked():
+            if error or status in BACKOFF_STATUSES:
+                self.rate = max(self.min_rate, self.rate * 0.5)
+                if retry_after:
+                    self.cooldown_until = max(self.cooldown_until, self.clock() + retry_after)
+                logger.info(f"Backing off {self.domain} to {self.rate:.2f} req/s")
+            elif latency is not None and latency > self.slow_latency:
+                self.rate = max(self.min_rate, self.rate * 0.75)
+            elif latency is not None and latency < self.target_latency:
+                self.rate = min(self.max_rate, self.rate + 0.1 * self.max_rate)
+
+    def backoff(self, seconds):
+        """Hold every request to this domain for ``seconds`` and slow down afterwards"""
+        with self._locked():
+            self.cooldown_until = max(self.cooldown_until, self.clock() + seconds)
+            self.rate = max(self.min_rate, self.rate * 0.5)
+            self.tokens = min(self.tokens, 0.0)
+        logger.info(f"Pausing {self.domain} for {seconds:.0f}s")
+
+
+class PolitenessScheduler:
+    """
+    Central per-domain rate limiter shared by every fetch path.
+
+    Call ``wait(url)`` (or ``await wait_async(url)``) right before a request
+    and ``record(url, ...)`` (or ``await record_async(url, ...)``) once it
+    finishes. Waiting only covers the time
+    left until the domain's next slot, so requests that are naturally slower
+    than the rate never sleep at all, and different domains never wait on
+    each other.
+
+    Buckets live in the ``SCRAPER_THROTTLE_CACHE`` cache so every Celery
+    worker process shares one per domain. Without that cache each process
+    paces itself, and N processes send a domain N times the rate.
+    """
+    def __init__(self):
+        self._throttles = {}
+        self._lock = threading.Lock()
+        alias = getattr(settings, 'SCRAPER_THROTTLE_CACHE', None)
+        self.cache = caches[alias] if alias else None
+
+    def throttle_for(self, url):
+        domain = urlsplit(url).netloc.lower()
+        with self._lock:
+            throttle = self._throttles.get(domain)
+            if throttle is not None:
+                return throttle
+            throttle = DomainThrottle(
+                domain,
+                rate=getattr(settings, 'SCRAPER_DOMAIN_RATES', {}).get(
+                    domain, getattr(settings, 'SCRAPER_DEFAULT_RATE', 0.5)
+                ),
+                burst=getattr(settings, 'SCRAPER_DEFAULT_BURST', 3),
+                min_rate=getattr(settings, 'SCRAPER_MIN_RATE', 0.05),
+                max_rate=getattr(settings, 'SCRAPER_MAX_RATE', 2.0),
+                # Shared buckets are compared across processes, so they need wall-clock time
+                clock=time.time if self.cache is not None else time.monotonic,
+                cache=self.cache,
+            )
+            self._throttles[domain] = throttle
+
+        if getattr(settings, 'SCRAPER_RESPECT_ROBOTS_TXT', True):
+            throttle.apply_crawl_delay(self._robots_delay(url))
+        return throttle
+
+    def wait(self, url):
+        delay = self.throttle_for(url).reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self, url):
+        # The shared bucket is read and written with blocking cache calls; keep them off the event loop
+        throttle = await asyncio.to_thread(self.throttle_for, url)
+        delay = await asyncio.to_thread(throttle.reserve)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def record(self, url, latency=None, status=None, error=False, retry_after=None):
+        self.throttle_for(url).record(latency, status=status, error=error, retry_after=retry_after)
+
+    async def record_async(self, url, latency=None, status=None, error=False, retry_after=None):
+        await asyncio.to_thread(self.record, url, latency, status=status, error=error, retry_after=retry_after)
+
+    def backoff(self, url, seconds):
+        self.throttle_for(url).backoff(seconds)
+
+    def _robots_delay(self, url):
+        """Seconds between requests asked for by the domain's robots.txt, if any"""
+        parts = urlsplit(url)
+        try:
+            response = requests.get(redirect_url(f"{parts.scheme}://{parts.netloc}/robots.txt"), timeout=10)
+        except requests.RequestException as e:
+            logger.warning(f"Could not read robots.txt for {parts.netloc}: {str(e)}")
+            return None
+        if response.status_code != 200:
+            return None
+
+        parser = RobotFileParser()
+        parser.parse(response.text.splitlines())
+        delay = parser.crawl_delay('*')
+        rate = parser.request_rate('*')
+        if rate and rate.requests:
+            delay = max(delay or 0, rate.seconds / rate.requests)
+        if delay:
+            logger.info(f"robots.txt for {parts.netloc} asks for {delay}s between requests")
+        return delay
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """Return the process-wide politeness scheduler"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = PolitenessScheduler()
+        return _scheduler
@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.db import transaction
+
+from core.models import SourceState
+
+
+def incremental_enabled():
+    """Whether paginated scrapes may stop at the first page of already-seen listings"""
+    return getattr(settings, 'SCRAPER_INCREMENTAL', True)
+
+
+def known_listings(source):
+    """Identities of the listings a source returned most recently (its high-water mark)"""
+    state = SourceState.objects.filter(source=source).only('recent_listings').first()
+    return set(state.recent_listings) if state else set()
+
+
+def remember_listings(source, identities):
+    """
+    Move a page's listing identities to the front of the source's mark.
+
+    Only the newest ``SCRAPER_RECENT_LISTINGS`` are kept: enough to cover
+    the first few result pages, which is where new listings show up.
+    """
+    if not identities:
+        return
+    limit = getattr(settings, 'SCRAPER_RECENT_LISTINGS', 1000)
+    with transaction.atomic():
+        state, _ = SourceState.objects.select_for_update().get_or_create(source=source)
+        recent = list(dict.fromkeys(list(identities) + list(state.recent_listings)))[:limit]
+        if recent != state.recent_listings:
+            state.recent_listings = recent
+            state.save(update_fields=['recent_listings', 'updated_at'])
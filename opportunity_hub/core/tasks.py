@@ -0,0 +1,93 @@
+import logging
+
+from celery import shared_task
+
+from core.ledger import prune_runs, record_scraper, record_source
+from core.profiling import profiled
+from core.scraping.archive import get_archive
+from core.scraping.fetch import listing_scrapers
+from core.scraping.watermark import incremental_enabled, known_listings
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def prune_page_archive_task():
+    """Drop archived pages older than SCRAPER_ARCHIVE_RETENTION_DAYS"""
+    archive = get_archive()
+    if archive is None:
+        return "Page archiving is disabled."
+
+    removed_days, removed_pages = archive.prune()
+    return f"Pruned {removed_days} archive days and {removed_pages} pages."
+
+
+@shared_task
+def prune_scrape_runs_task():
+    """Drop ScrapeRun history older than SCRAPER_RUN_RETENTION_DAYS"""
+    deleted = prune_runs()
+    return f"Pruned {deleted} scrape run rows."
+
+
+@shared_task
+def scrape_page_task(source, url, filters=None, run_id=None, profile=False):
+    """
+    Scrape one listing page of one source.
+
+    Failures are logged and turn into an empty page, so a blocked or broken
+    source never keeps the chord callback from running for the others.
+    Counts go to the run's SourceRun either way. With ``profile`` the page
+    is profiled into the run's profile directory (see core.profiling).
+    """
+    try:
+        with profiled(f'{source}-page', run_id, enabled=profile), listing_scrapers()[source]() as scraper:
+            try:
+                return scraper.scrape_page(url, **(filters or {}))
+            finally:
+                record_scraper(run_id, scraper)
+    except Exception as e:
+        logger.error(f"Error scraping {source} page {url}: {str(e)}")
+        record_source(run_id, source, errors=1)
+        return []
+
+
+@shared_task
+def scrape_source_task(source, num_pages=1, filters=None, run_id=None, profile=False):
+    """Scrape a source's pages in order, stopping at the first one with no new listings"""
+    try:
+        with profiled(source, run_id, enabled=profile), listing_scrapers()[source]() as scraper:
+            try:
+                return [record for page in scraper.stream(num_pages, **(filters or {})) for record in page]
+            finally:
+                record_scraper(run_id, scraper)
+    except Exception as e:
+        logger.error(f"Error scraping {source}: {str(e)}")
+        record_source(run_id, source, errors=1)
+        return []
+
+
+def page_tasks(sources, num_pages=1, run_id=None, profile=False, **filters):
+    """
+    Scrape signatures for these sources, ready for a group or chord.
+
+    Usually one ``scrape_page_task`` per source and page. Once a source has
+    a high-water mark, later pages are mostly listings we already have, so
+    it gets a single ``scrape_source_task`` that stops paginating early.
+    With a ``run_id`` every subtask reports to that ScrapeRun, and with
+    ``profile`` every subtask is profiled.
+    """
+    registry = listing_scrapers()
+    run = {'run_id': run_id} if run_id is not None else {}
+    if profile:
+        run['profile'] = True
+    signatures = []
+    for source in sources:
+        scraper = registry[source]()
+        incremental = num_pages > 1 and incremental_enabled() and scraper.listing_model is not None
+        if incremental and known_listings(source):
+            signatures.append(scrape_source_task.s(source, num_pages, filters, **run))
+            continue
+        # Building URLs doesn't touch the network or borrow a browser
+        for url in scraper.page_urls(num_pages, **filters):
+            signatures.append(scrape_page_task.s(source, url, filters, **run))
+    return signatures
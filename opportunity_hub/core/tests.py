@@ -1,3 +1,1444 @@
-from django.test import TestCase
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import nullcontext
+from datetime import timedelta
+from io import StringIO
+from unittest import skipUnless
+from unittest.mock import Mock, patch
 
-# Create your tests here.
+import requests
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core import benchmark, metrics
+from core.identity import listing_identity, normalize_url
+from core.ingest import IngestResult, ingest
+from core.ledger import finish_run, ingest_for_run, prune_runs, record_source, start_run
+from core.mock_sources import CAPTCHA_PAGE, EMPTY_PAGE, MockConfig, MockSources, MockSourceServer
+from core.models import ScrapeRun, SourceRun, SourceState
+from core.profiling import profiled, stage
+from core.scraping import archive, fetch, stealth
+from core.scraping.archive import PageArchive
+from core.scraping.blocking import ResourceBlocker, blocked_urls
+from core.scraping.cache import HttpCache
+from core.scraping.driver_pool import DriverPool, DriverPoolTimeout, PooledDriverMixin
+from core.scraping.extract import Extractor, Field, MissingField
+from core.scraping.http import fetch_url, iter_async
+from core.scraping.known import get_known_listings
+from core.scraping.parsing import BACKENDS, _backend, parse_cards, parse_html, simple_selector
+from core.scraping.redirect import redirect_url
+from core.scraping.scroll import SCROLL_SCRIPT, scroll_until_idle
+from core.scraping.throttle import DomainThrottle, PolitenessScheduler, parse_retry_after
+from core.tasks import page_tasks, scrape_page_task, scrape_source_task
+from jobs.models import JobApplication, JobListing
+
+
+def make_fake_driver():
+    driver = Mock()
+    driver.window_handles = ['main']
+    return driver
+
+
+class DriverPoolTests(SimpleTestCase):
+    def test_checkin_reuses_browser(self):
+        factory = Mock(side_effect=make_fake_driver)
+        pool = DriverPool(factory, max_size=2)
+
+        first = pool.checkout()
+        pool.checkin(first)
+        second = pool.checkout()
+
+        self.assertIs(first, second)
+        self.assertEqual(factory.call_count, 1)
+
+    def test_checkout_drops_the_previous_borrowers_network_log(self):
+        pool = DriverPool(make_fake_driver, max_size=1)
+        driver = pool.checkout()
+        pool.checkin(driver)
+        driver.get_log.reset_mock()
+
+        pool.checkout()
+
+        driver.get_log.assert_called_once_with('performance')
+
+    @override_settings(SCRAPER_BLOCK_RESOURCES=False)
+    def test_network_log_only_kept_while_savings_are_measured(self):
+        from core.scraping.drivers import create_chrome_driver
+
+        with patch('core.scraping.drivers.webdriver.Chrome') as chrome:
+            create_chrome_driver()
+
+        self.assertNotIn('goog:loggingPrefs', chrome.call_args.kwargs['options'].to_capabilities())
+
+    def test_checkout_respects_cap(self):
+        pool = DriverPool(make_fake_driver, max_size=1)
+        pool.checkout()
+
+        with self.assertRaises(DriverPoolTimeout):
+            pool.checkout(timeout=0.01)
+        self.assertEqual(pool.size, 1)
+
+    def test_worn_out_browser_is_recycled(self):
+        pool = DriverPool(make_fake_driver, max_size=1, max_uses=2)
+        driver = pool.checkout()
+        pool.checkin(driver)
+        pool.checkout()
+        pool.checkin(driver)
+
+        driver.quit.assert_called_once()
+        self.assertEqual(pool.size, 0)
+
+    def test_failed_start_releases_slot(self):
+        pool = DriverPool(Mock(side_effect=RuntimeError('no chrome')), max_size=1)
+
+        with self.assertRaises(RuntimeError):
+            pool.checkout()
+        self.assertEqual(pool.size, 0)
+
+    def test_warm_up_and_shutdown(self):
+        pool = DriverPool(make_fake_driver, max_size=3)
+
+        self.assertEqual(pool.warm_up(2), 2)
+        self.assertEqual(pool.size, 2)
+        self.assertEqual(pool.in_use, 0)
+
+        pool.shutdown()
+        self.assertEqual(pool.size, 0)
+
+    def test_thread_driver_is_separate_per_thread(self):
+        pool = DriverPool(make_fake_driver, max_size=3)
+        scraper = PooledDriverMixin()
+        seen = []
+
+        def work():
+            with scraper.thread_driver():
+                seen.append(scraper.driver)
+                time.sleep(0.01)
+
+        with patch('core.scraping.driver_pool.get_pool', return_value=pool):
+            threads = [threading.Thread(target=work) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertIsNot(seen[0], seen[1])
+            self.assertEqual(pool.in_use, 0)
+            self.assertIsNone(scraper._driver)
+
+
+class FakeListingScraper(fetch.PageFetchMixin):
+    source_name = 'Example'
+    static_first = True
+
+    def __init__(self, static_html):
+        self._http = Mock()
+        self._http.get.return_value = Mock(status_code=200, text=static_html)
+        self.driver = Mock(page_source='<div class="card">browser</div>')
+        self.wait_for_element = Mock()
+        self.scroll_page = Mock()
+
+
+class PageFetchTests(TestCase):
+    def setUp(self):
+        fetch._strategies.clear()
+        stealth._levels.clear()
+        for name in ('get_scheduler', 'archive_page'):
+            patcher = patch(f'core.scraping.fetch.{name}')
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_static_page_skips_browser(self):
+        scraper = FakeListingScraper('<div class="card">static</div>')
+
+        html = scraper.fetch_page('https://example.com/', 'div.card')
+
+        self.assertIn('static', html)
+        scraper.driver.get.assert_not_called()
+        self.assertEqual(SourceState.objects.get(source='Example').fetch_strategy, SourceState.STATIC)
+
+    def test_missing_cards_fall_back_to_browser(self):
+        scraper = FakeListingScraper('<div id="app"></div>')
+
+        html = scraper.fetch_page('https://example.com/', 'div.card')
+
+        self.assertIn('browser', html)
+        self.assertEqual(SourceState.objects.get(source='Example').fetch_strategy, SourceState.BROWSER)
+
+        # The next page goes straight to the browser
+        scraper.fetch_page('https://example.com/?page=2', 'div.card')
+        self.assertEqual(scraper.http.get.call_count, 1)
+
+    def test_forbidden_static_fetch_raises_stealth_level(self):
+        scraper = FakeListingScraper('')
+        scraper.http.get.return_value = Mock(status_code=403, text='Forbidden')
+
+        scraper.fetch_page('https://example.com/', 'div.card')
+
+        self.assertEqual(SourceState.objects.get(source='Example').stealth_level, SourceState.CAUTIOUS)
+
+    @override_settings(SCRAPER_MOCK_SERVER='http://127.0.0.1:8765')
+    def test_browser_visits_go_to_the_mock_server(self):
+        scraper = FakeListingScraper('')
+
+        scraper.load_page('https://scholarship-positions.com')
+
+        scraper.driver.get.assert_called_once_with('http://127.0.0.1:8765/scholarship-positions.com/')
+
+    def test_server_errors_are_retried_without_switching_to_the_browser(self):
+        scraper = FakeListingScraper('')
+        scraper.http.get.side_effect = [
+            Mock(status_code=503, text='', headers={'Retry-After': '30'}),
+            Mock(status_code=200, text='<div class="card">static</div>', headers={}),
+        ]
+
+        html = scraper.fetch_page('https://example.com/', 'div.card')
+
+        self.assertIn('static', html)
+        scraper.driver.get.assert_not_called()
+        self.assertEqual(fetch.get_scheduler.return_value.record.call_args_list[0].kwargs['retry_after'], 30)
+        self.assertEqual(SourceState.objects.get(source='Example').fetch_strategy, SourceState.STATIC)
+
+    @override_settings(SCRAPER_STATIC_RETRIES=1)
+    def test_persistent_throttling_does_not_pin_the_browser(self):
+        scraper = FakeListingScraper('')
+        scraper.http.get.return_value = Mock(status_code=429, text='', headers={})
+
+        html = scraper.fetch_page('https://example.com/', 'div.card')
+
+        self.assertIn('browser', html)
+        self.assertEqual(scraper.http.get.call_count, 2)
+        self.assertNotEqual(SourceState.objects.get(source='Example').fetch_strategy, SourceState.BROWSER)
+
+
+class StealthTests(TestCase):
+    def setUp(self):
+        stealth._levels.clear()
+
+    def test_starts_fast_and_escalates_on_blocks(self):
+        self.assertEqual(stealth.stealth_level('Example'), stealth.FAST)
+
+        stealth.report_block('Example', 'CAPTCHA')
+        self.assertEqual(stealth.stealth_level('Example'), stealth.CAUTIOUS)
+        stealth.report_block('Example', 'CAPTCHA')
+        stealth.report_block('Example', 'CAPTCHA')
+        self.assertEqual(stealth.stealth_level('Example'), stealth.HUMAN)
+
+        # Persisted for the next run
+        stealth._levels.clear()
+        self.assertEqual(stealth.stealth_level('Example'), stealth.HUMAN)
+        self.assertIsNotNone(SourceState.objects.get(source='Example').last_blocked_at)
+
+    @override_settings(SCRAPER_STEALTH_DECAY_HOURS=6)
+    def test_decays_after_quiet_period(self):
+        SourceState.objects.create(
+            source='Example',
+            stealth_level=SourceState.HUMAN,
+            stealth_changed_at=timezone.now() - timedelta(hours=7),
+        )
+
+        self.assertEqual(stealth.stealth_level('Example'), stealth.CAUTIOUS)
+        # The clock restarts, so it doesn't drop again straight away
+        self.assertEqual(stealth.stealth_level('Example'), stealth.CAUTIOUS)
+        self.assertEqual(SourceState.objects.get(source='Example').stealth_level, SourceState.CAUTIOUS)
+
+    def test_sees_levels_changed_by_other_workers(self):
+        self.assertEqual(stealth.stealth_level('Example'), stealth.FAST)
+        # Another worker escalates the source
+        SourceState.objects.update_or_create(
+            source='Example', defaults={'stealth_level': SourceState.HUMAN, 'stealth_changed_at': timezone.now()},
+        )
+
+        self.assertEqual(stealth.stealth_level('Example'), stealth.FAST)
+        with override_settings(SCRAPER_STEALTH_CACHE_SECONDS=0):
+            self.assertEqual(stealth.stealth_level('Example'), stealth.HUMAN)
+
+
+class SlowPagesScraper(fetch.PageFetchMixin):
+    source_name = 'Example'
+    card_selector = 'div.card'
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.started = []
+        self.lock = threading.Lock()
+
+    def thread_driver(self):
+        return nullcontext()
+
+    def fetch_page(self, url, card_selector):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.started.append(url)
+        page = int(url.rsplit('=', 1)[1])
+        # Later pages finish first
+        time.sleep(0.02 * (4 - page))
+        with self.lock:
+            self.active -= 1
+        if page == 2:
+            raise RuntimeError('blocked')
+        return f'<p>{page}</p>'
+
+    def parse_page(self, html, **filters):
+        return [html]
+
+
+class ConcurrentPaginationTests(SimpleTestCase):
+    urls = [f'https://example.com/?page={page}' for page in range(4)]
+
+    @override_settings(SCRAPER_PAGE_CONCURRENCY=3)
+    def test_pages_fetched_concurrently_and_merged_in_order(self):
+        scraper = SlowPagesScraper()
+
+        records = scraper.scrape_pages(self.urls)
+
+        self.assertEqual(records, ['<p>0</p>', '<p>1</p>', '<p>3</p>'])
+        self.assertEqual(scraper.peak, 3)
+
+    @override_settings(SCRAPER_PAGE_CONCURRENCY=3, SCRAPER_SOURCE_PAGE_CONCURRENCY={'Example': 1})
+    def test_per_source_cap(self):
+        scraper = SlowPagesScraper()
+
+        scraper.scrape_pages(self.urls)
+
+        self.assertEqual(scraper.peak, 1)
+
+    @override_settings(SCRAPER_PAGE_CONCURRENCY=2)
+    def test_iter_pages_yields_page_batches_lazily(self):
+        scraper = SlowPagesScraper()
+        pages = scraper.iter_pages(self.urls)
+
+        self.assertEqual(next(pages), ['<p>0</p>'])
+        # Only the window of in-flight pages has been started, not the whole run
+        self.assertLessEqual(len(scraper.started), 3)
+        pages.close()
+        self.assertLess(len(scraper.started), len(self.urls))
+
+
+class DetailPagesScraper(SlowPagesScraper):
+    detail_url_field = 'url'
+    detail_selector = '.description'
+
+    def fetch_detail(self, url):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.02)
+        with self.lock:
+            self.active -= 1
+        if url.endswith('/2'):
+            raise RuntimeError('timed out')
+        return f'details of {url}'
+
+    def apply_detail(self, record, text):
+        record['description'] = text
+
+
+class DetailEnrichmentTests(SimpleTestCase):
+    def make_records(self):
+        return [{'url': f'https://example.com/jobs/{n}', 'description': 'none'} for n in range(4)]
+
+    @override_settings(SCRAPER_DETAIL_CONCURRENCY=3)
+    def test_details_loaded_concurrently_and_joined_back(self):
+        scraper = DetailPagesScraper()
+
+        records = scraper.enrich_details(self.make_records())
+
+        self.assertEqual([record['description'] for record in records], [
+            'details of https://example.com/jobs/0',
+            'details of https://example.com/jobs/1',
+            'none',
+            'details of https://example.com/jobs/3',
+        ])
+        self.assertEqual(scraper.peak, 3)
+
+    def test_offline_skips_details(self):
+        scraper = DetailPagesScraper()
+        scraper.offline = True
+
+        records = scraper.enrich_details(self.make_records())
+
+        self.assertEqual({record['description'] for record in records}, {'none'})
+        self.assertEqual(scraper.peak, 0)
+
+
+def performance_entry(method, **params):
+    return {'message': json.dumps({'message': {'method': method, 'params': params}})}
+
+
+class ResourceBlockerTests(SimpleTestCase):
+    @override_settings(
+        SCRAPER_BLOCKED_RESOURCE_TYPES=['Font'],
+        SCRAPER_BLOCKED_URL_PATTERNS=['*ads.example*'],
+        SCRAPER_SOURCE_RESOURCE_POLICY={'Example': {'types': ['Image'], 'patterns': []}},
+    )
+    def test_policy_per_source(self):
+        self.assertIn('*.woff*', blocked_urls())
+        self.assertIn('*ads.example*', blocked_urls())
+        self.assertIn('*.png*', blocked_urls('Example'))
+        self.assertNotIn('*.woff*', blocked_urls('Example'))
+
+    def test_policy_only_sent_when_it_changes(self):
+        blocker = ResourceBlocker()
+        driver = make_fake_driver()
+
+        blocker.apply(driver, 'Example')
+        blocker.apply(driver, 'Example')
+
+        self.assertEqual(driver.execute_cdp_cmd.call_count, 2)
+        method, params = driver.execute_cdp_cmd.call_args[0]
+        self.assertEqual(method, 'Network.setBlockedURLs')
+        self.assertEqual(params['urls'], list(blocked_urls('Example')))
+
+    def test_report_counts_blocked_and_downloaded(self):
+        blocker = ResourceBlocker()
+        driver = make_fake_driver()
+        driver.get_log.return_value = [
+            performance_entry('Network.responseReceived', requestId='1', type='Image'),
+            performance_entry('Network.loadingFinished', requestId='1', encodedDataLength=1000),
+            performance_entry('Network.responseReceived', requestId='2', type='Document'),
+            performance_entry('Network.loadingFinished', requestId='2', encodedDataLength=5000),
+            performance_entry('Network.loadingFailed', requestId='3', type='Image', blockedReason='inspector'),
+            performance_entry('Network.loadingFailed', requestId='4', type='Image', blockedReason='inspector'),
+            performance_entry('Network.loadingFailed', requestId='5', type='Font', errorText='net::ERR_FAILED'),
+        ]
+
+        blocker.record(driver, 'Example')
+        report = blocker.report('Example')
+
+        self.assertEqual(report['Example'], {
+            'blocked_requests': 2,
+            'bytes_saved': 2000,
+            'bytes_downloaded': 6000,
+        })
+        self.assertEqual(blocker.report('Example'), {})
+
+
+class ScrollTests(SimpleTestCase):
+    @override_settings(SCRAPER_SCROLL_IDLE_MS=800, SCRAPER_SCROLL_MAX_CARDS=100, SCRAPER_SCROLL_MAX_SECONDS=20)
+    def test_scrolls_in_one_async_script(self):
+        driver = make_fake_driver()
+        driver.execute_async_script.return_value = {'cards': 40, 'reason': 'idle'}
+
+        summary = scroll_until_idle(driver, 'li.card')
+
+        self.assertEqual(summary['cards'], 40)
+        driver.execute_async_script.assert_called_once_with(SCROLL_SCRIPT, 'li.card', 800, 100, 20000)
+        driver.set_script_timeout.assert_called_once_with(25)
+        driver.execute_script.assert_not_called()
+
+    def test_script_errors_are_not_fatal(self):
+        driver = make_fake_driver()
+        driver.execute_async_script.side_effect = RuntimeError('script timeout')
+
+        self.assertIsNone(scroll_until_idle(driver, 'li.card'))
+
+
+class PagedScraper(SlowPagesScraper):
+    def page_urls(self, num_pages=1, keywords=None):
+        return [f'https://example.com/{keywords}?page={page}' for page in range(num_pages)]
+
+    def scrape_page(self, url, **filters):
+        if url.endswith('=1'):
+            raise RuntimeError('blocked')
+        return [{'url': url, **filters}]
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+@patch('core.tasks.listing_scrapers', return_value={'Example': PagedScraper})
+class ScrapeCanvasTests(SimpleTestCase):
+    def test_one_subtask_per_source_and_page(self, registry):
+        signatures = page_tasks(['Example'], 2, keywords='python')
+
+        self.assertEqual([sig.task for sig in signatures], ['core.tasks.scrape_page_task'] * 2)
+        self.assertEqual(
+            [sig.args for sig in signatures],
+            [('Example', 'https://example.com/python?page=0', {'keywords': 'python'}),
+             ('Example', 'https://example.com/python?page=1', {'keywords': 'python'})],
+        )
+
+    def test_failed_page_returns_no_records(self, registry):
+        ok = scrape_page_task('Example', 'https://example.com/python?page=0', {'keywords': 'python'})
+        failed = scrape_page_task('Example', 'https://example.com/python?page=1', {'keywords': 'python'})
+
+        self.assertEqual(ok, [{'url': 'https://example.com/python?page=0', 'keywords': 'python'}])
+        self.assertEqual(failed, [])
+
+
+class ScholarshipsDotComPageTests(TestCase):
+    def setUp(self):
+        stealth._levels.clear()
+        module = 'scholarships.scrapers.scholarships_dot_com_scraper'
+        for name in ('core.scraping.fetch.get_scheduler', f'{module}.get_scheduler', f'{module}.archive_page',
+                     f'{module}.time.sleep'):
+            patcher = patch(name)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_page_subtask_retries_block_pages(self):
+        from scholarships.scrapers.scholarships_dot_com_scraper import ScholarshipsDotComScraper
+        pages = iter([
+            '<html><title>Just a moment...</title>Checking your browser</html>',
+            '<div class="scholarship-listing"><h3 class="scholarship-title">STEM scholarship</h3>'
+            '<div class="scholarship-details">Undergraduate</div></div>',
+        ])
+        driver = Mock(title='Scholarships', current_url='https://www.scholarships.com/directory')
+        driver.get.side_effect = lambda url: setattr(driver, 'page_source', next(pages))
+        scraper = ScholarshipsDotComScraper()
+        scraper._driver = driver
+        scraper.wait_for_element = Mock()
+        scraper.simulate_human_interaction = Mock()
+        scraper.scroll_page = Mock()
+
+        records = scraper.scrape_page('https://www.scholarships.com/directory')
+        scraper._driver = None
+
+        self.assertEqual(driver.get.call_count, 2)
+        self.assertEqual([record['title'] for record in records], ['STEM scholarship'])
+        self.assertEqual(stealth.stealth_level('Scholarships.com'), stealth.CAUTIOUS)
+
+
+class IterAsyncTests(SimpleTestCase):
+    def test_items_are_handed_over_as_they_are_yielded(self):
+        produced = []
+
+        async def numbers():
+            for number in range(3):
+                produced.append(number)
+                yield number
+
+        items = iter_async(numbers())
+
+        self.assertEqual(next(items), 0)
+        self.assertEqual(produced, [0])
+        self.assertEqual(list(items), [1, 2])
+
+    def test_closing_early_finalizes_the_generator(self):
+        finalized = []
+
+        async def numbers():
+            try:
+                for number in range(3):
+                    yield number
+            finally:
+                finalized.append(True)
+
+        items = iter_async(numbers())
+        next(items)
+        items.close()
+
+        self.assertEqual(finalized, [True])
+
+
+def scraped_job(title, **overrides):
+    return {
+        'title': title,
+        'company': 'Acme',
+        'location': 'Remote',
+        'employment_type': 'FULL_TIME',
+        'description': 'Build things',
+        'requirements': 'Python',
+        'application_url': f'https://example.com/{title}',
+        'source_website': 'Example',
+        'posted_date': timezone.now(),
+        'is_remote': True,
+        'is_active': True,
+        **overrides,
+    }
+
+
+class IngestTests(TestCase):
+    def test_counts_created_updated_and_unchanged(self):
+        ingest(JobListing, [scraped_job('a'), scraped_job('b')])
+
+        result = ingest(JobListing, [scraped_job('a'), scraped_job('b', location='Berlin'), scraped_job('c')])
+
+        self.assertEqual(result, IngestResult(created=1, updated=1, unchanged=1))
+        self.assertEqual(JobListing.objects.count(), 3)
+        self.assertEqual(JobListing.objects.get(title='b').location, 'Berlin')
+
+    def test_duplicates_within_a_batch_are_written_once(self):
+        result = ingest(JobListing, [scraped_job('a'), scraped_job('a', location='Berlin')])
+
+        self.assertEqual(result, IngestResult(created=1))
+        self.assertEqual(JobListing.objects.get().location, 'Berlin')
+
+    def test_writes_in_chunks_without_a_query_per_row(self):
+        jobs = [scraped_job(str(number)) for number in range(10)]
+
+        # A lookup plus an upsert per chunk of four, each inside its own transaction
+        with self.assertNumQueries(3 * 4):
+            result = ingest(JobListing, jobs, chunk_size=4)
+
+        self.assertEqual(result.created, 10)
+
+    def test_invalid_records_are_skipped(self):
+        result = ingest(JobListing, [scraped_job('a', application_url=None), scraped_job('b')])
+
+        self.assertEqual(result.total, 1)
+
+    def test_tracking_parameters_do_not_make_a_new_listing(self):
+        ingest(JobListing, [scraped_job('a', application_url='https://www.example.com/jobs/1?utm_source=x')])
+
+        result = ingest(JobListing, [scraped_job('a', application_url='https://example.com/jobs/1/?trk=feed')])
+
+        self.assertEqual(result.unchanged + result.updated, 1)
+        self.assertEqual(JobListing.objects.count(), 1)
+
+
+class ListingIdentityTests(TestCase):
+    def test_normalize_url(self):
+        self.assertEqual(
+            normalize_url('HTTP://www.Indeed.com/viewjob/?jk=1&utm_source=x&from=serp#top'),
+            'https://indeed.com/viewjob?jk=1',
+        )
+        self.assertEqual(normalize_url('/jobs/1?b=2&a=1'), '/jobs/1?a=1&b=2')
+
+    def test_title_and_organization_are_always_part_of_the_identity(self):
+        # A shared programme page, not just a bare home page, must not merge listings
+        self.assertNotEqual(
+            listing_identity('DAAD', 'https://www.daad.de/en/scholarships/', 'Programme A', 'DAAD'),
+            listing_identity('DAAD', 'https://daad.de/en/scholarships', 'Programme B', 'DAAD'),
+        )
+        self.assertEqual(
+            listing_identity('DAAD', 'https://www.daad.de/en/scholarships/?utm_source=x', 'Programme  A', 'DAAD'),
+            listing_identity('DAAD', 'https://daad.de/en/scholarships', 'programme a', 'DAAD'),
+        )
+
+    def test_dedupe_keeps_listings_sharing_a_careers_page(self):
+        for title in ('Backend Developer', 'Data Scientist'):
+            JobListing.objects.create(**scraped_job(
+                title, application_url='https://example.com/careers', posted_date=timezone.now().date(),
+            ))
+
+        call_command('dedupe_listings', stdout=StringIO())
+
+        self.assertEqual(JobListing.objects.count(), 2)
+
+    def test_populate_db_can_run_twice(self):
+        call_command('populate_db', stdout=StringIO())
+        call_command('populate_db', stdout=StringIO())
+
+        self.assertGreaterEqual(JobListing.objects.count(), 20)
+
+    def test_dedupe_command_merges_listings_and_keeps_applications(self):
+        user = get_user_model().objects.create_user(username='ada', email='ada@example.com', password='x')
+        older = JobListing.objects.create(**scraped_job(
+            'b', application_url='https://example.com/old', posted_date=timezone.now().date(),
+        ))
+        newer = JobListing.objects.create(**scraped_job('b', posted_date=timezone.now().date()))
+        JobApplication.objects.create(user=user, job=older)
+        # Stored before tracking parameters were stripped
+        JobListing.objects.filter(pk=older.pk).update(identity='stale', application_url='https://example.com/b?utm_medium=x')
+
+        call_command('dedupe_listings', stdout=StringIO())
+
+        self.assertEqual(list(JobListing.objects.values_list('pk', flat=True)), [newer.pk])
+        self.assertEqual(JobApplication.objects.get().job_id, newer.pk)
+
+
+class IncrementalScraper(SlowPagesScraper):
+    listing_model = JobListing
+
+    def __init__(self, fresh=()):
+        super().__init__()
+        self.fresh = set(fresh)
+
+    def page_urls(self, num_pages=1, **filters):
+        return [f'https://example.com/?page={page}' for page in range(num_pages)]
+
+    def fetch_page(self, url, card_selector):
+        self.started.append(url)
+        return url.rsplit('=', 1)[1]
+
+    def parse_page(self, html, **filters):
+        page = int(html)
+        jobs = [scraped_job(f'{page}-{number}') for number in range(2)]
+        if page in self.fresh:
+            jobs.append(scraped_job(f'{page}-new'))
+        return jobs
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+@override_settings(SCRAPER_PAGE_CONCURRENCY=1)
+class IncrementalCrawlTests(TestCase):
+    def test_stops_at_the_first_page_of_known_listings(self):
+        first = IncrementalScraper()
+        pages = list(first.stream(4))
+        self.assertEqual(len(pages), 4)
+        ingest_for_run(None, JobListing, [job for page in pages for job in page])
+
+        steady = IncrementalScraper()
+        self.assertEqual(len(list(steady.stream(4))), 1)
+        self.assertEqual(steady.started, ['https://example.com/?page=0'])
+
+        # Something new on page 0 means page 1 is worth a look
+        busy = IncrementalScraper(fresh={0})
+        self.assertEqual(len(list(busy.stream(4))), 2)
+
+    def test_listings_only_count_as_known_once_stored(self):
+        # The scrape ran but saving its records failed
+        list(IncrementalScraper().stream(4))
+
+        self.assertEqual(len(list(IncrementalScraper().stream(4))), 4)
+
+    @override_settings(SCRAPER_INCREMENTAL=False)
+    def test_can_be_turned_off(self):
+        pages = list(IncrementalScraper().stream(4))
+        ingest_for_run(None, JobListing, [job for page in pages for job in page])
+
+        self.assertEqual(len(list(IncrementalScraper().stream(4))), 4)
+
+    @patch('core.tasks.listing_scrapers', return_value={'Example': IncrementalScraper})
+    def test_known_sources_get_one_early_stopping_task(self, registry):
+        self.assertEqual(len(page_tasks(['Example'], 4)), 4)
+        ingest_for_run(None, JobListing, scrape_page_task('Example', 'https://example.com/?page=0'))
+
+        signatures = page_tasks(['Example'], 4)
+
+        self.assertEqual([sig.task for sig in signatures], ['core.tasks.scrape_source_task'])
+        self.assertEqual(len(scrape_source_task(*signatures[0].args)), 2)
+
+
+class KnownDetailsScraper(DetailPagesScraper):
+    listing_model = JobListing
+    detail_url_field = 'application_url'
+    detail_fields = ('description',)
+
+    def __init__(self):
+        super().__init__()
+        self.loaded = []
+
+    def fetch_detail(self, url):
+        self.loaded.append(url)
+        return f'details of {url}'
+
+
+class KnownListingTests(TestCase):
+    def setUp(self):
+        get_known_listings().clear()
+        self.addCleanup(get_known_listings().clear)
+
+    def test_known_listings_reuse_stored_details(self):
+        ingest(JobListing, [scraped_job('1', description='Stored description')])
+        scraper = KnownDetailsScraper()
+
+        records = scraper.enrich_details([scraped_job('1'), scraped_job('3')])
+
+        self.assertEqual(scraper.loaded, ['https://example.com/3'])
+        self.assertEqual([record['description'] for record in records],
+                         ['Stored description', 'details of https://example.com/3'])
+
+    def test_stale_listings_are_loaded_again(self):
+        ingest(JobListing, [scraped_job('1')])
+        JobListing.objects.update(updated_at=timezone.now() - timedelta(days=30))
+        scraper = KnownDetailsScraper()
+
+        scraper.enrich_details([scraped_job('1')])
+
+        self.assertEqual(scraper.loaded, ['https://example.com/1'])
+
+    def test_membership_checks_are_served_from_memory(self):
+        ingest(JobListing, [scraped_job('1')])
+        known = get_known_listings()
+        identity = JobListing.identity_of(scraped_job('1'))
+        known.fresh(JobListing, [identity])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(known.fresh(JobListing, [identity, 'unknown']), {identity})
+
+
+class LedgerScraper(IncrementalScraper):
+    card_selector = 'div.card'
+    fetch_page = fetch.PageFetchMixin.fetch_page
+
+    def _fetch_page(self, url, card_selector):
+        if url.endswith('=9'):
+            raise RuntimeError('blocked')
+        return '<div class="card">a</div><div class="card">b</div><div class="card"></div>'
+
+    def parse_page(self, html, **filters):
+        return [scraped_job(card.text) for card in parse_cards(html, self.card_selector) if card.text]
+
+
+@patch('core.scraping.fetch.archive_page')
+@patch('core.tasks.listing_scrapers', return_value={'Example': LedgerScraper})
+class ScrapeLedgerTests(TestCase):
+    def test_page_subtasks_add_up_per_source(self, registry, archive_page):
+        run_id = start_run('jobs')
+
+        scrape_page_task('Example', 'https://example.com/?page=0', run_id=run_id)
+        scrape_page_task('Example', 'https://example.com/?page=1', run_id=run_id)
+        scrape_page_task('Example', 'https://example.com/?page=9', run_id=run_id)
+
+        source = SourceRun.objects.get(run_id=run_id, source='Example')
+        self.assertEqual((source.pages_fetched, source.cards_found, source.records_extracted, source.errors),
+                         (2, 6, 4, 1))
+        self.assertEqual(source.bytes_transferred, 2 * len(LedgerScraper()._fetch_page('', '')))
+        self.assertGreater(source.fetch_seconds, 0)
+
+    def test_ingest_and_finish_record_persistence(self, registry, archive_page):
+        run_id = start_run('jobs')
+
+        ingest_for_run(run_id, JobListing, [scraped_job('a'), scraped_job('b', source_website='Other')])
+        finish_run(run_id)
+
+        run = ScrapeRun.objects.get(pk=run_id)
+        self.assertEqual(run.status, ScrapeRun.SUCCESS)
+        self.assertIsNotNone(run.finished_at)
+        self.assertEqual(sorted(run.sources.values_list('source', 'created')), [('Example', 1), ('Other', 1)])
+
+    def test_old_runs_are_pruned(self, registry, archive_page):
+        old = start_run('jobs')
+        record_source(old, 'Example', pages_fetched=1)
+        ScrapeRun.objects.filter(pk=old).update(started_at=timezone.now() - timedelta(days=100))
+        recent = start_run('jobs')
+
+        prune_runs(days=90)
+
+        self.assertEqual(list(ScrapeRun.objects.values_list('pk', flat=True)), [recent])
+        self.assertFalse(SourceRun.objects.exists())
+
+    def test_prune_is_scheduled(self, registry, archive_page):
+        from django.conf import settings
+
+        self.assertIn('core.tasks.prune_scrape_runs_task', [job[1] for job in settings.CRONJOBS])
+
+
+
+def sample(name, **labels):
+    return metrics.prometheus_client.REGISTRY.get_sample_value(name, labels) or 0
+
+
+@skipUnless(metrics.prometheus_client, 'prometheus-client is not installed')
+class MetricsTests(TestCase):
+    def test_fetch_and_parse_are_observed_per_source(self):
+        scraper = FakeListingScraper('<div class="card">static</div>')
+        scraper.parse_page = Mock(return_value=[{'title': 'a'}])
+        fetched = sample('scraper_page_fetch_seconds_count', source='Example')
+        extracted = sample('scraper_records_extracted_total', source='Example')
+
+        with patch('core.scraping.fetch.get_scheduler'), patch('core.scraping.fetch.archive_page'):
+            scraper._parse_page(scraper.fetch_page('https://example.com/', 'div.card'))
+
+        self.assertEqual(sample('scraper_page_fetch_seconds_count', source='Example'), fetched + 1)
+        self.assertEqual(sample('scraper_records_extracted_total', source='Example'), extracted + 1)
+
+    def test_pool_occupancy_is_published(self):
+        pool = DriverPool(make_fake_driver, max_size=2, name='metrics-test')
+
+        driver = pool.checkout()
+        self.assertEqual(sample('scraper_browser_pool_in_use', pool='metrics-test'), 1)
+        pool.checkin(driver)
+        self.assertEqual(sample('scraper_browser_pool_in_use', pool='metrics-test'), 0)
+        self.assertEqual(sample('scraper_browser_pool_live', pool='metrics-test'), 1)
+
+    def test_endpoint_exposes_view_timings(self):
+        before = sample('web_view_seconds_count', view='job_list')
+        self.client.get(reverse('jobs:job-list'))
+
+        response = self.client.get(reverse('core:metrics'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'web_view_seconds_count{view="job_list"}', response.content)
+        self.assertEqual(sample('web_view_seconds_count', view='job_list'), before + 1)
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_endpoint_can_be_disabled(self):
+        self.assertEqual(self.client.get(reverse('core:metrics')).status_code, 404)
+
+
+class ProfilingTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        patcher = override_settings(SCRAPER_PROFILE_DIR=self.directory.name)
+        patcher.enable()
+        self.addCleanup(patcher.disable)
+
+    def test_stages_are_noops_outside_a_session(self):
+        with stage('parse') as timer:
+            pass
+        self.assertIsNone(timer.session)
+
+    def test_session_times_stages_across_threads_and_dumps(self):
+        def work():
+            with stage('fetch'):
+                with stage('parse'):
+                    sum(range(1000))
+
+        with profiled('Example-page', run_id=7) as session:
+            work()
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+
+        self.assertEqual(session.stages['fetch']['calls'], 2)
+        self.assertEqual(session.stages['parse']['calls'], 2)
+        self.assertGreater(session.peak_memory, 0)
+        self.assertEqual(os.path.dirname(session.path), os.path.join(self.directory.name, 'run-7'))
+        for suffix in ('.prof', '.tracemalloc', '.json'):
+            self.assertTrue(os.path.exists(f'{session.path}{suffix}'))
+        with open(f'{session.path}.json') as f:
+            self.assertEqual(json.load(f)['stages']['fetch']['calls'], 2)
+
+    def test_nested_and_disabled_sessions_yield_none(self):
+        with profiled('outer', memory=False) as outer:
+            with profiled('inner') as inner:
+                pass
+        with profiled('off', enabled=False) as off:
+            pass
+
+        self.assertIsNotNone(outer)
+        self.assertIsNone(inner)
+        self.assertIsNone(off)
+        self.assertEqual(os.listdir(self.directory.name), [os.path.basename(os.path.dirname(outer.path))])
+
+
+class BenchScraper(fetch.PageFetchMixin):
+    source_name = 'Bench'
+    card_selector = 'li.card'
+
+    def parse_page(self, html, **filters):
+        return [{'title': card.select_one('h2').text} for card in parse_cards(html, self.card_selector)]
+
+
+class ParserBenchmarkTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_corpus_maps_captures_to_scrapers(self):
+        for name in ('debug_BenchScraper.html', 'debug_NoSuchScraper.html', 'notes.html'):
+            with open(os.path.join(self.directory.name, name), 'w') as f:
+                f.write(LISTING_PAGE)
+
+        corpus = benchmark.load_corpus(self.directory.name)
+
+        self.assertEqual(corpus, {BenchScraper: [LISTING_PAGE]})
+
+    def test_reports_throughput_and_memory_per_backend(self):
+        results = benchmark.run({BenchScraper: [LISTING_PAGE] * 3}, ['html.parser'], repeat=1)
+
+        self.assertEqual(len(results), 1)
+        result = results[0]
+        self.assertEqual((result['scraper'], result['backend']), ('BenchScraper', 'html.parser'))
+        self.assertEqual((result['pages'], result['cards'], result['records']), (3, 6, 6))
+        self.assertGreater(result['pages_per_second'], 0)
+        self.assertGreater(result['peak_memory'], 0)
+
+    def test_history_flags_regressions(self):
+        history = os.path.join(self.directory.name, 'parsers.jsonl')
+        result = {'scraper': 'BenchScraper', 'backend': 'lxml', 'pages': 3,
+                  'pages_per_second': 100.0, 'peak_memory': 1000}
+        benchmark.save_run([result], history)
+
+        slower = dict(result, pages_per_second=50.0)
+        hungrier = dict(result, peak_memory=5000)
+        other_corpus = dict(slower, pages=4)
+        previous = benchmark.last_run(history)
+
+        self.assertEqual(previous['results'], [result])
+        self.assertEqual(benchmark.regressions([result], previous, tolerance=0.2), [])
+        self.assertEqual(len(benchmark.regressions([slower], previous, tolerance=0.2)), 1)
+        self.assertIn('peak memory', benchmark.regressions([hungrier], previous, tolerance=0.2)[0])
+        self.assertEqual(benchmark.regressions([other_corpus], previous, tolerance=0.2), [])
+
+    def test_shipped_and_synthetic_pages_cover_every_listing_scraper(self):
+        corpus = benchmark.load_corpus(synthetic=1, per_page=3)
+
+        shipped = {cls for cls in fetch.listing_scrapers().values() if cls.__module__.startswith(('jobs.', 'scholarships.'))}
+        self.assertEqual(set(corpus), shipped)
+        for result in benchmark.run(corpus, ['html.parser'], repeat=1):
+            self.assertGreater(result['cards'], 0, result['scraper'])
+            self.assertEqual(result['records'], result['cards'], result['scraper'])
+
+    def test_command_fails_when_pages_have_no_cards(self):
+        with open(os.path.join(self.directory.name, 'debug_RemoteOKScraper.html'), 'w') as f:
+            f.write(CAPTCHA_PAGE)
+        options = dict(corpus=self.directory.name, synthetic_pages=0, backend=['html.parser'], repeat=1, no_save=True)
+
+        with self.assertRaisesMessage(CommandError, 'No cards found for RemoteOKScraper'):
+            call_command('benchmark_parsers', stdout=StringIO(), **options)
+        out = StringIO()
+        call_command('benchmark_parsers', allow_empty=True, stdout=out, **options)
+        self.assertIn('No cards found in any RemoteOKScraper page', out.getvalue())
+
+
+class MockSourcesTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.corpus = tempfile.TemporaryDirectory()
+        cls.sources = MockSources(MockConfig(pages=2, per_page=4), corpus=cls.corpus.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.corpus.cleanup()
+        super().tearDownClass()
+
+    @override_settings(SCRAPER_MOCK_SERVER='http://127.0.0.1:8765/', SCRAPER_BASE_URL_OVERRIDES={
+        'https://www.indeed.com': 'http://localhost:9000/indeed',
+    })
+    def test_urls_are_redirected(self):
+        self.assertEqual(redirect_url('https://www.indeed.com/jobs?q=python'), 'http://localhost:9000/indeed/jobs?q=python')
+        self.assertEqual(redirect_url('https://www.linkedin.com/jobs/search?start=25'),
+                         'http://127.0.0.1:8765/www.linkedin.com/jobs/search?start=25')
+        self.assertEqual(redirect_url('/relative'), '/relative')
+
+    def test_urls_are_untouched_by_default(self):
+        self.assertEqual(redirect_url('https://www.indeed.com/jobs'), 'https://www.indeed.com/jobs')
+
+    def test_synthetic_pages_parse_and_paginate(self):
+        from jobs.scrapers.indeed_scraper import IndeedScraper
+        scraper = IndeedScraper()
+        scraper.offline = True
+
+        pages = []
+        for url in scraper.page_urls(3, keywords='python'):
+            status, _, body = self.sources.respond(url.replace('https://', '/'))
+            self.assertEqual(status, 200)
+            pages.append(scraper.parse_page(body))
+
+        self.assertEqual([len(page) for page in pages], [4, 4, 0])
+        self.assertEqual(pages[1][0]['title'], 'Indeed title 2-1')
+        self.assertEqual(pages[1][0]['application_url'], 'https://indeed.com/mock-listing/2-1')
+
+    def test_cordis_json_matches_the_api_parser(self):
+        from scholarships.scrapers.api_scraper import APIScholarshipScraper
+
+        status, content_type, body = self.sources.respond('/api.tech.ec.europa.eu/funding/grants/grants?page=1&limit=3')
+        scholarships = APIScholarshipScraper()._parse_cordis_results(json.loads(body))
+
+        self.assertEqual((status, content_type), (200, 'application/json'))
+        self.assertEqual(len(scholarships), 3)
+        self.assertTrue(scholarships[0]['is_active'])
+
+    def test_errors_and_captchas(self):
+        failing = MockSources(MockConfig(error_rate=1.0, error_status=429), corpus=self.corpus.name)
+        captcha = MockSources(MockConfig(captcha_rate=1.0), corpus=self.corpus.name)
+
+        self.assertEqual(failing.respond('/www.indeed.com/jobs')[0], 429)
+        self.assertEqual(captcha.respond('/www.indeed.com/jobs')[2], CAPTCHA_PAGE)
+        self.assertEqual(self.sources.respond('/remoteok.com/remote-all-jobs')[2], EMPTY_PAGE)
+        self.assertEqual(self.sources.respond('/unknown.example/')[0], 404)
+
+    def test_server_serves_over_http(self):
+        with MockSourceServer(MockConfig(pages=1, per_page=2), port=0, corpus=self.corpus.name) as server:
+            response = requests.get(f'{server.url}/www.cheetah.org/scholarships/page/1/', timeout=10)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.text.count('class="scholarship-item"'), 2)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class DomainThrottleTests(SimpleTestCase):
+    def test_burst_then_paced(self):
+        clock = FakeClock()
+        throttle = DomainThrottle('example.com', rate=1.0, burst=2, clock=clock)
+
+        self.assertEqual(throttle.reserve(), 0)
+        self.assertEqual(throttle.reserve(), 0)
+        self.assertAlmostEqual(throttle.reserve(), 1.0)
+        # A concurrent caller queues behind the one already waiting
+        self.assertAlmostEqual(throttle.reserve(), 2.0)
+
+    def test_throttling_status_halves_rate(self):
+        throttle = DomainThrottle('example.com', rate=1.0, clock=FakeClock())
+
+        throttle.record(0.5, status=429)
+        self.assertAlmostEqual(throttle.rate, 0.5)
+
+        throttle.record(0.5, status=200)
+        self.assertGreater(throttle.rate, 0.5)
+
+    def test_retry_after_holds_domain(self):
+        clock = FakeClock()
+        throttle = DomainThrottle('example.com', rate=1.0, burst=3, clock=clock)
+
+        throttle.record(status=503, retry_after=30)
+        self.assertAlmostEqual(throttle.reserve(), 30)
+
+    def test_crawl_delay_caps_rate(self):
+        throttle = DomainThrottle('example.com', rate=1.0, burst=3, clock=FakeClock())
+        throttle.apply_crawl_delay(10)
+
+        for _ in range(20):
+            throttle.record(0.1, status=200)
+        self.assertLessEqual(throttle.rate, 0.1)
+        self.assertEqual(throttle.burst, 1)
+
+    def test_processes_share_one_bucket_through_the_cache(self):
+        from django.core.cache.backends.locmem import LocMemCache
+        cache = LocMemCache('throttle-tests', {})
+        clock = FakeClock()
+        # Two worker processes, each with its own throttle object for the domain
+        first = DomainThrottle('example.com', rate=1.0, burst=2, clock=clock, cache=cache)
+        second = DomainThrottle('example.com', rate=1.0, burst=2, clock=clock, cache=cache)
+
+        self.assertEqual(first.reserve(), 0)
+        self.assertEqual(second.reserve(), 0)
+        self.assertAlmostEqual(first.reserve(), 1.0)
+        second.record(status=429, retry_after=30)
+        self.assertAlmostEqual(first.reserve(), 30)
+
+    def test_only_the_lock_holder_frees_the_lock(self):
+        from django.core.cache.backends.locmem import LocMemCache
+        cache = LocMemCache('throttle-lock-tests', {})
+        throttle = DomainThrottle('example.com', rate=1.0, burst=2, clock=FakeClock(), cache=cache)
+        throttle.lock_wait = 0
+        lock = 'scraper:throttle:example.com:lock'
+
+        # Another process holds the bucket: go ahead, but leave its lock and its write alone
+        cache.set(lock, 'theirs')
+        throttle.reserve()
+        self.assertEqual(cache.get(lock), 'theirs')
+        self.assertIsNone(cache.get('scraper:throttle:example.com'))
+
+        # Our lock expired and a successor took it while we were still working
+        cache.delete(lock)
+        with throttle._locked():
+            cache.set(lock, 'successor')
+        self.assertEqual(cache.get(lock), 'successor')
+
+        cache.delete(lock)
+        throttle.reserve()
+        self.assertIsNone(cache.get(lock))
+        self.assertIsNotNone(cache.get('scraper:throttle:example.com'))
+
+    @override_settings(SCRAPER_THROTTLE_CACHE=None)
+    def test_async_callers_update_the_bucket_off_the_event_loop(self):
+        scheduler = PolitenessScheduler()
+        throttle = Mock()
+        threads = []
+        throttle.reserve.side_effect = lambda: threads.append(threading.get_ident()) or 0
+        throttle.record.side_effect = lambda *args, **kwargs: threads.append(threading.get_ident())
+
+        async def fetch():
+            await scheduler.wait_async('https://example.com/')
+            await scheduler.record_async('https://example.com/', 0.1, status=200)
+            return threading.get_ident()
+
+        with patch.object(scheduler, 'throttle_for', return_value=throttle):
+            loop_thread = asyncio.run(fetch())
+
+        self.assertEqual(len(threads), 2)
+        self.assertNotIn(loop_thread, threads)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after('120'), 120)
+        self.assertIsNone(parse_retry_after('soon'))
+        self.assertIsNone(parse_retry_after(None))
+        with patch('core.scraping.throttle.time.time', return_value=1704067140):
+            self.assertEqual(parse_retry_after('Mon, 01 Jan 2024 00:00:00 GMT'), 60)
+
+
+class HttpCacheTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache = HttpCache(tmp.name)
+        for name in ('get_scheduler', 'archive_page'):
+            patcher = patch(f'core.scraping.http.{name}')
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_validators_sent_once_committed(self):
+        self.cache.store('https://example.com/', None, {'ETag': '"v1"'}, '<html>v1</html>')
+        self.assertEqual(self.cache.conditional_headers('https://example.com/'), {})
+
+        self.cache.commit('https://example.com/')
+        headers = self.cache.conditional_headers('https://example.com/')
+
+        self.assertEqual(headers, {'If-None-Match': '"v1"'})
+        self.assertEqual(self.cache.conditional_headers('https://example.com/', {'page': 2}), {})
+
+    def test_responses_without_validators_are_not_stored(self):
+        self.cache.store('https://example.com/', None, {}, '<html></html>')
+
+        self.assertIsNone(self.cache.get('https://example.com/'))
+
+    def test_not_modified_returns_cached_body(self):
+        session = Mock()
+        session.get.return_value = Mock(
+            url='https://example.com/', status_code=200, text='<html>v1</html>',
+            headers={'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'},
+        )
+        fetch_url('https://example.com/', session=session, cache=self.cache).commit()
+
+        session.get.return_value = Mock(url='https://example.com/', status_code=304, text='', headers={})
+        result = fetch_url('https://example.com/', session=session, cache=self.cache)
+
+        sent = session.get.call_args.kwargs['headers']
+        self.assertEqual(sent['If-Modified-Since'], 'Mon, 01 Jan 2024 00:00:00 GMT')
+        self.assertTrue(result.not_modified)
+        self.assertEqual(result.text, '<html>v1</html>')
+
+    def test_page_refetched_in_full_until_its_records_are_saved(self):
+        from scholarships.scrapers.api_scraper import APIScholarshipScraper
+        scraper = APIScholarshipScraper()
+        session = Mock()
+        session.get.return_value = Mock(url='https://example.com/', status_code=200, text='<html></html>',
+                                        headers={'ETag': '"v1"'})
+        saved, lost = ['saved'], ['lost']
+        scraper._parsed(fetch_url('https://example.com/', session=session, cache=self.cache), saved)
+        scraper._parsed(fetch_url('https://example.com/other', session=session, cache=self.cache), lost)
+
+        scraper.batch_stored(saved)
+
+        self.assertEqual(self.cache.conditional_headers('https://example.com/'), {'If-None-Match': '"v1"'})
+        self.assertEqual(self.cache.conditional_headers('https://example.com/other'), {})
+
+    def test_cache_keyed_by_what_the_records_depend_on(self):
+        session = Mock()
+        session.get.return_value = Mock(url='https://example.com/', status_code=200, text='<html></html>',
+                                        headers={'ETag': '"v1"'})
+        fetch_url('https://example.com/', session=session, cache=self.cache, vary={'field': 'Law'}).commit()
+
+        fetch_url('https://example.com/', session=session, cache=self.cache, vary={'field': 'Physics'})
+        self.assertNotIn('If-None-Match', session.get.call_args.kwargs['headers'])
+        self.assertIsNone(session.get.call_args.kwargs['params'])
+        fetch_url('https://example.com/', session=session, cache=self.cache, vary={'field': 'Law'})
+        self.assertEqual(session.get.call_args.kwargs['headers']['If-None-Match'], '"v1"')
+
+    def test_retry_after_reaches_the_scheduler(self):
+        session = Mock()
+        session.get.return_value = Mock(
+            url='https://example.com/', status_code=429, text='', headers={'Retry-After': '45'},
+        )
+
+        with patch('core.scraping.http.get_scheduler') as get_scheduler:
+            fetch_url('https://example.com/', session=session)
+
+        self.assertEqual(get_scheduler.return_value.record.call_args.kwargs['retry_after'], 45)
+
+    def test_least_recently_used_entries_evicted(self):
+        total = 0
+        for n in range(3):
+            self.cache.store(f'https://example.com/{n}', None, {'ETag': str(n)}, 'x' * 100)
+            path = self.cache._path(self.cache.key(f'https://example.com/{n}'))
+            os.utime(path, (n, n))
+            total += path.stat().st_size
+        # Room for three entries (give or take a few bytes of timestamp), not four
+        self.cache.max_bytes = total + 50
+
+        self.cache.store('https://example.com/3', None, {'ETag': '3'}, 'x' * 100)
+
+        self.assertIsNone(self.cache.get('https://example.com/0'))
+        self.assertIsNotNone(self.cache.get('https://example.com/1'))
+        self.assertIsNotNone(self.cache.get('https://example.com/3'))
+
+
+REMOTEOK_PAGE = """
+<table>
+  <tr class="job">
+    <td><h2 itemprop="title">Python Developer</h2><h3 itemprop="name">Acme</h3>
+    <a class="job" href="/remote-jobs/1">apply</a></td>
+  </tr>
+</table>
+"""
+
+
+class PageArchiveTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.archive = PageArchive(tmp.name, retention_days=7)
+
+    def test_identical_pages_stored_once(self):
+        first = self.archive.save('https://example.com/?page=1', '<html>same</html>', source='Example')
+        second = self.archive.save('https://example.com/?page=2', '<html>same</html>', source='Example')
+
+        self.assertEqual(first['sha256'], second['sha256'])
+        self.assertEqual(len(list(self.archive.objects_dir.glob('*/*.html.gz'))), 1)
+        self.assertEqual(self.archive.load(first['sha256']), '<html>same</html>')
+        self.assertEqual(len(list(self.archive.entries(source='Example'))), 2)
+
+    def test_latest_entry_for_url(self):
+        yesterday = timezone.now() - timedelta(days=1)
+        self.archive.save('https://example.com/', '<html>old</html>', fetched_at=yesterday)
+        self.archive.save('https://example.com/', '<html>new</html>')
+
+        entry = self.archive.latest('https://example.com/')
+
+        self.assertEqual(self.archive.load(entry['sha256']), '<html>new</html>')
+
+    def test_prune_drops_old_days_and_orphaned_pages(self):
+        old = self.archive.save('https://example.com/', '<html>old</html>',
+                                fetched_at=timezone.now() - timedelta(days=30))
+        self.archive.save('https://example.com/', '<html>new</html>')
+
+        self.assertEqual(self.archive.prune(), (1, 1))
+        self.assertEqual(len(self.archive.days()), 1)
+        self.assertFalse(self.archive._object_path(old['sha256']).exists())
+
+    def test_prune_is_scheduled(self):
+        from django.conf import settings
+        from core.tasks import prune_page_archive_task
+
+        self.assertIn('core.tasks.prune_page_archive_task', [job[1] for job in settings.CRONJOBS])
+        with patch('core.tasks.get_archive', return_value=self.archive):
+            self.assertIn('Pruned', prune_page_archive_task())
+
+
+class ReplayPagesCommandTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings = override_settings(SCRAPER_ARCHIVE_DIR=tmp.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        archive._archive = None
+        self.addCleanup(setattr, archive, '_archive', None)
+
+    def test_replays_archived_pages_through_parser(self):
+        archive.archive_page('https://remoteok.com/remote-all-jobs', REMOTEOK_PAGE, source='RemoteOK')
+        archive.archive_page('https://example.com/api', '{}', source='Unknown API')
+        out = StringIO()
+
+        call_command('replay_pages', show=1, stdout=out)
+
+        self.assertIn('RemoteOK: 1 pages, 1 records', out.getvalue())
+        self.assertIn('Python Developer', out.getvalue())
+        self.assertIn('Skipped 1 pages from Unknown API', out.getvalue())
+
+    def test_replays_api_source_pages(self):
+        cordis = {'results': [{'title': {'en': 'EU grant'}, 'deadline': {'status': 'OPEN'}}]}
+        archive.archive_page('https://api.tech.ec.europa.eu/funding/grants/grants?page=1', json.dumps(cordis),
+                             source='EU Funding & Tenders')
+        archive.archive_page('https://cscuk.fcdo.gov.uk/scholarships/',
+                             '<article><h2>Commonwealth PhD Scholarship</h2></article>',
+                             source='Commonwealth Scholarship Commission')
+        out = StringIO()
+
+        call_command('replay_pages', show=1, stdout=out)
+
+        self.assertIn('EU Funding & Tenders: 1 pages, 1 records', out.getvalue())
+        self.assertIn('Commonwealth Scholarship Commission: 1 pages, 1 records', out.getvalue())
+        self.assertNotIn('Skipped', out.getvalue())
+
+
+LISTING_PAGE = """
+<ul>
+  <li class="card featured"><h2 class="title">First <b>job</b></h2>
+    <a class="apply" href="/jobs/1">Apply</a><time datetime="2024-01-01">Jan 1</time></li>
+  <li class="card"><h2 class="title">Second job</h2><a class="apply">Apply</a></li>
+</ul>
+"""
+
+
+class ParserBackendTests(SimpleTestCase):
+    def test_backends_agree(self):
+        for name in BACKENDS:
+            with self.subTest(backend=name):
+                if _backend(name) is not BACKENDS[name][0]:
+                    self.skipTest(f'{name} is not installed')
+                cards = parse_html(LISTING_PAGE, backend=name).select('li.card')
+
+                self.assertEqual(len(cards), 2)
+                self.assertEqual(cards[0].select_one('h2.title').text, 'First job')
+                self.assertEqual(cards[0].select_one('a.apply')['href'], '/jobs/1')
+                self.assertEqual(cards[0].select_one('time[datetime]').get('datetime'), '2024-01-01')
+                self.assertIsNone(cards[1].select_one('a.apply').get('href'))
+                self.assertIsNone(cards[1].select_one('time'))
+
+    def test_partial_parse_keeps_only_cards(self):
+        page = f'<header><p>nav</p></header>{LISTING_PAGE}<footer><p class="card">x</p></footer>'
+        for name in BACKENDS:
+            with self.subTest(backend=name):
+                if _backend(name) is not BACKENDS[name][0]:
+                    self.skipTest(f'{name} is not installed')
+                cards = parse_cards(page, 'li.card', backend=name)
+
+                self.assertEqual([card.select_one('h2').text for card in cards], ['First job', 'Second job'])
+                self.assertEqual(cards[0].select_one('a.apply')['href'], '/jobs/1')
+
+    def test_simple_selector(self):
+        self.assertEqual(simple_selector('div.job_seen_beacon'), ('div', 'class', 'job_seen_beacon'))
+        self.assertEqual(simple_selector('a[data-test="job-link"]'), ('a', 'data-test', 'job-link'))
+        self.assertIsNone(simple_selector('ul.results li.card'))
+
+    def test_missing_backend_falls_back_to_html_parser(self):
+        with patch.dict(BACKENDS, {'fast': (BACKENDS['lxml'][0], 'no_such_module')}):
+            _backend.cache_clear()
+            self.addCleanup(_backend.cache_clear)
+
+            cards = parse_html(LISTING_PAGE, backend='fast').select('li.card')
+
+        self.assertEqual(len(cards), 2)
+
+
+class ExtractorTests(SimpleTestCase):
+    def setUp(self):
+        self.extractor = Extractor('li.card', {
+            'title': Field('h2.title', required=True),
+            'url': Field('a.apply', attr='href', process=lambda href: 'https://example.com' + href),
+            'posted': Field('time', attr='datetime', default='unknown'),
+            'classes': Field(attr='class', process='split_classes'),
+            'links': Field('li.card a', many=True),
+        })
+
+    def split_classes(self, value):
+        return value.split()
+
+    def test_extracts_every_field(self):
+        cards = self.extractor.cards(LISTING_PAGE)
+        first, second = (self.extractor.extract(card, self) for card in cards)
+
+        self.assertEqual(first, {
+            'title': 'First job',
+            'url': 'https://example.com/jobs/1',
+            'posted': '2024-01-01',
+            'classes': ['card', 'featured'],
+            'links': ['Apply'],
+        })
+        self.assertIsNone(second['url'])
+        self.assertEqual(second['posted'], 'unknown')
+
+    def test_simple_fields_are_matched_in_one_walk(self):
+        self.assertEqual([name for name, _, _ in self.extractor._walked], ['title', 'url', 'posted'])
+        self.assertEqual([name for name, _ in self.extractor._queried], ['links'])
+
+    def test_missing_required_field_raises(self):
+        card = self.extractor.cards('<li class="card"><p>No title</p></li>')[0]
+
+        with self.assertRaises(MissingField):
+            self.extractor.extract(card, self)
+
+    def test_backends_agree(self):
+        expected = [self.extractor.extract(card, self) for card in parse_cards(LISTING_PAGE, 'li.card', backend='html.parser')]
+        for name in BACKENDS:
+            with self.subTest(backend=name):
+                if _backend(name) is not BACKENDS[name][0]:
+                    self.skipTest(f'{name} is not installed')
+                cards = parse_cards(LISTING_PAGE, 'li.card', backend=name)
+
+                self.assertEqual([self.extractor.extract(card, self) for card in cards], expected)
@@ -5,4 +5,5 @@ app_name = 'core'
 
 urlpatterns = [
     path('', views.home, name='home'),
+    path('metrics', views.metrics, name='metrics'),
 ]
\ No newline at end of file
@@ -1,4 +1,8 @@
+from django.conf import settings
+from django.http import Http404, HttpResponse
 from django.shortcuts import render
+
+from core import metrics as scrape_metrics
 from jobs.models import JobListing
 from scholarships.models import Scholarship
 
@@ -11,3 +15,11 @@ def home(request):
         'latest_scholarships': latest_scholarships,
     }
     return render(request, 'core/home.html', context)
+
+
+def metrics(request):
+    """Prometheus scrape target covering the web server and every Celery worker"""
+    if not getattr(settings, 'METRICS_ENABLED', True) or scrape_metrics.prometheus_client is None:
+        raise Http404("Metrics are disabled")
+    body, content_type = scrape_metrics.render()
+    return HttpResponse(body, content_type=content_type)
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:19
+
+from django.db import migrations, models
+
+
+def remove_duplicates(apps, schema_editor):
+    """
+    Keep the newest of rows that are the same listing, moving applications over to it.
+
+    Populated and scraped jobs often share one careers page link, so only
+    rows that also match on title and company count as duplicates.
+    """
+    JobListing = apps.get_model('jobs', 'JobListing')
+    JobApplication = apps.get_model('jobs', 'JobApplication')
+    keep = {}
+    for row in JobListing.objects.order_by('-id').values('id', 'source_website', 'application_url', 'title', 'company'):
+        duplicate_of = keep.setdefault(
+            (row['source_website'], row['application_url'], row['title'], row['company']), row['id']
+        )
+        if duplicate_of == row['id']:
+            continue
+        for application in JobApplication.objects.filter(job_id=row['id']):
+            if JobApplication.objects.filter(user_id=application.user_id, job_id=duplicate_of).exists():
+                application.delete()
+            else:
+                application.job_id = duplicate_of
+                application.save(update_fields=['job'])
+        JobListing.objects.filter(id=row['id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='joblisting',
+            constraint=models.UniqueConstraint(fields=('source_website', 'application_url', 'title', 'company'), name='unique_job_listing'),
+        ),
+    ]
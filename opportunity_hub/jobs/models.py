@@ -1,6 +1,8 @@
 from django.db import models
 from django.urls import reverse
 
+from core.identity import listing_identity
+
 class JobListing(models.Model):
     EMPLOYMENT_TYPE_CHOICES = [
         ('FULL_TIME', 'Full Time'),
@@ -25,6 +27,19 @@ class JobListing(models.Model):
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Hash of the source, canonical application_url, title and company (see core.identity)
+    identity = models.CharField(max_length=32, editable=False)
+
+    IDENTITY_FIELDS = ('source_website', 'application_url', 'title', 'company')
+
+    @classmethod
+    def identity_of(cls, record):
+        """Canonical identity of a scraped record or field dict"""
+        return listing_identity(*(record.get(name) for name in cls.IDENTITY_FIELDS))
+
+    def save(self, *args, **kwargs):
+        self.identity = self.identity_of({name: getattr(self, name) for name in self.IDENTITY_FIELDS})
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.title} at {self.company}"
@@ -40,6 +55,10 @@ class JobListing(models.Model):
             models.Index(fields=['employment_type']),
             models.Index(fields=['posted_date']),
         ]
+        constraints = [
+            # What scraped listings are looked up and upserted on (see core.ingest)
+            models.UniqueConstraint(fields=['identity'], name='unique_job_listing_identity'),
+        ]
 
 class JobApplication(models.Model):
     STATUS_CHOICES = [
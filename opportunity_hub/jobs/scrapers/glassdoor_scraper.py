@@ -1,70 +1,83 @@
 from .base import BaseScraper
-from selenium.webdriver.common.by import By
-from bs4 import BeautifulSoup
+from core.scraping.extract import Extractor, Field
 from django.utils import timezone
 import logging
 
 logger = logging.getLogger(__name__)
 
 class GlassdoorScraper(BaseScraper):
+    source_name = 'Glassdoor'
+    extractor = Extractor('li.jobCard', {
+        'title': Field('a[data-test="job-link"]', required=True),
+        'company': Field('div[data-test="employer-name"]', required=True),
+        'location': Field('span[data-test="location"]', default='Not specified'),
+        'employment_type': Field('span[data-test="job-type"]', process='_determine_employment_type', default='FULL_TIME'),
+        'salary_range': Field('span[data-test="detailSalary"]'),
+        'application_url': Field('a[data-test="job-link"]', attr='href', required=True, process='_absolute_url'),
+        'posted_date': Field('div[data-test="job-age"]', process='_parse_date'),
+    })
+    card_selector = extractor.card_selector
+    detail_url_field = 'application_url'
+    detail_selector = '.jobDescriptionContent'
+    detail_fields = ('description', 'requirements')
+
     def scrape_jobs(self, keywords=None, location=None, num_pages=1):
         """
         Scrape jobs from Glassdoor
         """
         jobs = []
-        keywords = keywords or "all"
-        location = location or "remote"
         
         try:
-            for page in range(num_pages):
-                url = f'https://www.glassdoor.com/Job/jobs.htm?sc.keyword={keywords}&locT=C&locId=1'
-                if page > 0:
-                    url += f'&p={page+1}'
-                
-                self.driver.get(url)
-                self.wait_for_element(By.CLASS_NAME, 'jobCard')
-                self.scroll_page()
-                
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-                job_cards = soup.find_all('li', class_='jobCard')
-                
-                for card in job_cards:
-                    try:
-                        # Extract salary range if available
-                        salary_elem = card.find('span', {'data-test': 'detailSalary'})
-                        salary_range = salary_elem.text.strip() if salary_elem else None
-
-                        # Determine if job is remote
-                        location_elem = card.find('span', {'data-test': 'location'})
-                        is_remote = location_elem and 'remote' in location_elem.text.lower()
-
-                        job = {
-                            'title': card.find('a', {'data-test': 'job-link'}).text.strip(),
-                            'company': card.find('div', {'data-test': 'employer-name'}).text.strip(),
-                            'location': location_elem.text.strip() if location_elem else 'Not specified',
-                            'employment_type': self._determine_employment_type(card),
-                            'description': self._extract_description(card),
-                            'requirements': self._extract_requirements(card),
-                            'salary_range': salary_range,
-                            'application_url': 'https://www.glassdoor.com' + card.find('a', {'data-test': 'job-link'})['href'],
-                            'source_website': 'Glassdoor',
-                            'posted_date': self._extract_date(card),
-                            'is_remote': is_remote,
-                            'is_active': True
-                        }
-                        jobs.append(job)
-                        
-                    except Exception as e:
-                        logger.error(f"Error extracting Glassdoor job data: {str(e)}")
-                        continue
+            urls = self.page_urls(num_pages, keywords=keywords, location=location)
+            # Keep what earlier pages produced if a later one fails
+            for page in self.iter_pages(urls, keywords=keywords, location=location):
+                jobs.extend(page)
 
         except Exception as e:
             logger.error(f"Error scraping Glassdoor: {str(e)}")
         
         return jobs
 
-    def _determine_employment_type(self, card):
-        """Determine employment type from job card"""
+    def page_urls(self, num_pages=1, keywords=None, location=None):
+        """URLs of the first ``num_pages`` result pages"""
+        keywords = keywords or "all"
+        urls = []
+        for page in range(num_pages):
+            url = f'https://www.glassdoor.com/Job/jobs.htm?sc.keyword={keywords}&locT=C&locId=1'
+            if page > 0:
+                url += f'&p={page+1}'
+            urls.append(url)
+        return urls
+
+    def parse_page(self, html, keywords=None, location=None):
+        """Extract jobs from the cards on one listing page"""
+        jobs = []
+
+        for card in self.extractor.cards(html):
+            try:
+                job = self.extractor.extract(card, self)
+                job.update({
+                    # Both filled in from the job page by enrich_details()
+                    'description': "No description available",
+                    'requirements': "No specific requirements listed",
+                    'source_website': 'Glassdoor',
+                    'posted_date': job['posted_date'] or timezone.now(),
+                    'is_remote': 'remote' in job['location'].lower(),
+                    'is_active': True
+                })
+                jobs.append(job)
+                
+            except Exception as e:
+                logger.error(f"Error extracting Glassdoor job data: {str(e)}")
+                continue
+
+        return jobs
+
+    def _absolute_url(self, href):
+        return 'https://www.glassdoor.com' + href
+
+    def _determine_employment_type(self, text):
+        """Determine employment type from the card's job type label"""
         job_types = {
             'full-time': 'FULL_TIME',
             'part-time': 'PART_TIME',
@@ -73,40 +86,19 @@ class GlassdoorScraper(BaseScraper):
             'remote': 'REMOTE'
         }
         
-        type_elem = card.find('span', {'data-test': 'job-type'})
-        if not type_elem:
-            return 'FULL_TIME'  # Default to full-time if not specified
-            
-        text = type_elem.text.lower()
+        text = text.lower()
         for key, value in job_types.items():
             if key in text:
                 return value
                 
         return 'FULL_TIME'
 
-    def _extract_description(self, card):
-        """Extract job description by clicking on the job card"""
-        try:
-            job_link = card.find('a', {'data-test': 'job-link'})['href']
-            self.driver.execute_script(f"window.open('https://www.glassdoor.com{job_link}', '_blank');")
-            self.driver.switch_to.window(self.driver.window_handles[-1])
-            
-            self.wait_for_element(By.CLASS_NAME, 'jobDescriptionContent')
-            description = self.driver.find_element(By.CLASS_NAME, 'jobDescriptionContent').text
-            
-            self.driver.close()
-            self.driver.switch_to.window(self.driver.window_handles[0])
-            
-            return description
-            
-        except Exception as e:
-            logger.error(f"Error extracting Glassdoor job description: {str(e)}")
-            return "Error loading description"
+    def apply_detail(self, job, description):
+        job['description'] = description
+        job['requirements'] = self._extract_requirements(description)
 
-    def _extract_requirements(self, card):
+    def _extract_requirements(self, description):
         """Extract requirements from job description"""
-        description = self._extract_description(card)
-        
         # Look for requirements section
         lines = description.split('\n')
         requirements = []
@@ -123,14 +115,10 @@ class GlassdoorScraper(BaseScraper):
                 
         return '\n'.join(requirements) if requirements else "No specific requirements listed"
 
-    def _extract_date(self, card):
-        """Extract and parse posting date"""
-        date_elem = card.find('div', {'data-test': 'job-age'})
-        if not date_elem:
-            return timezone.now()
-            
+    def _parse_date(self, date_text):
+        """Parse the posting date"""
         try:
-            date_text = date_elem.text.strip().lower()
+            date_text = date_text.lower()
             if 'hour' in date_text:
                 hours = int(date_text.split()[0])
                 return timezone.now() - timezone.timedelta(hours=hours)
@@ -1,70 +1,81 @@
 from .base import BaseScraper
-from selenium.webdriver.common.by import By
-from bs4 import BeautifulSoup
+from core.scraping.extract import Extractor, Field
 from django.utils import timezone
 import logging
 
 logger = logging.getLogger(__name__)
 
 class LinkedInScraper(BaseScraper):
+    source_name = 'LinkedIn'
+    extractor = Extractor('div.base-search-card', {
+        'title': Field('h3.base-search-card__title', required=True),
+        'company': Field('h4.base-search-card__subtitle', required=True),
+        'location': Field('span.job-search-card__location', required=True),
+        'employment_type': Field('span.job-search-card__employment-type', process='_determine_employment_type', default='FULL_TIME'),
+        'description': Field('p.base-search-card__metadata', default="No description available"),
+        'salary_range': Field('span.job-search-card__salary-info'),
+        'application_url': Field('a.base-card__full-link', attr='href', required=True),
+        'posted_date': Field('time.job-search-card__listdate', process='_parse_date'),
+        'is_remote': Field('span.workplace-type', process=lambda text: 'remote' in text.lower(), default=False),
+    })
+    card_selector = extractor.card_selector
+    detail_url_field = 'application_url'
+    detail_selector = '.description__text'
+    detail_fields = ('requirements',)
+
     def scrape_jobs(self, keywords=None, location=None, num_pages=1):
         """
         Scrape jobs from LinkedIn
         """
         jobs = []
-        keywords = keywords or "all"
         
         try:
-            for page in range(num_pages):
-                start = page * 25  # LinkedIn uses multiples of 25 for pagination
-                url = f'https://www.linkedin.com/jobs/search?keywords={keywords}&start={start}'
-                if location:
-                    url += f'&location={location}'
-                
-                self.driver.get(url)
-                self.wait_for_element(By.CLASS_NAME, 'base-search-card')
-                self.scroll_page()
-                
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-                job_cards = soup.find_all('div', class_='base-search-card')
-                
-                for card in job_cards:
-                    try:
-                        # Extract salary range if available
-                        salary_elem = card.find('span', class_='job-search-card__salary-info')
-                        salary_range = salary_elem.text.strip() if salary_elem else None
-
-                        # Determine if job is remote
-                        workplace_elem = card.find('span', class_='workplace-type')
-                        is_remote = workplace_elem and 'remote' in workplace_elem.text.lower()
-
-                        job = {
-                            'title': card.find('h3', class_='base-search-card__title').text.strip(),
-                            'company': card.find('h4', class_='base-search-card__subtitle').text.strip(),
-                            'location': card.find('span', class_='job-search-card__location').text.strip(),
-                            'employment_type': self._determine_employment_type(card),
-                            'description': self._extract_description(card),
-                            'requirements': self._extract_requirements(card),
-                            'salary_range': salary_range,
-                            'application_url': card.find('a', class_='base-card__full-link')['href'],
-                            'source_website': 'LinkedIn',
-                            'posted_date': self._extract_date(card),
-                            'is_remote': is_remote,
-                            'is_active': True
-                        }
-                        jobs.append(job)
-                        
-                    except Exception as e:
-                        logger.error(f"Error extracting LinkedIn job data: {str(e)}")
-                        continue
+            urls = self.page_urls(num_pages, keywords=keywords, location=location)
+            # Keep what earlier pages produced if a later one fails
+            for page in self.iter_pages(urls, keywords=keywords, location=location):
+                jobs.extend(page)
 
         except Exception as e:
             logger.error(f"Error scraping LinkedIn: {str(e)}")
         
         return jobs
 
-    def _determine_employment_type(self, card):
-        """Determine employment type from job card"""
+    def page_urls(self, num_pages=1, keywords=None, location=None):
+        """URLs of the first ``num_pages`` result pages"""
+        keywords = keywords or "all"
+        urls = []
+        for page in range(num_pages):
+            start = page * 25  # LinkedIn uses multiples of 25 for pagination
+            url = f'https://www.linkedin.com/jobs/search?keywords={keywords}&start={start}'
+            if location:
+                url += f'&location={location}'
+            urls.append(url)
+        return urls
+
+    def parse_page(self, html, keywords=None, location=None):
+        """Extract jobs from the cards on one listing page"""
+        jobs = []
+
+        for card in self.extractor.cards(html):
+            try:
+                job = self.extractor.extract(card, self)
+                job.update({
+                    # Filled in from the job page by enrich_details()
+                    'requirements': "No specific requirements listed",
+                    'source_website': 'LinkedIn',
+                    'posted_date': job['posted_date'] or timezone.now(),
+                    'is_active': True
+                })
+                jobs.append(job)
+                
+            except Exception as e:
+                logger.error(f"Error extracting LinkedIn job data: {str(e)}")
+                continue
+
+        return jobs
+
+    def _determine_employment_type(self, text):
+        """Determine employment type from the card's employment type label"""
         job_types = {
             'full-time': 'FULL_TIME',
             'part-time': 'PART_TIME',
@@ -73,65 +84,38 @@ class LinkedInScraper(BaseScraper):
             'remote': 'REMOTE'
         }
         
-        type_elem = card.find('span', class_='job-search-card__employment-type')
-        if not type_elem:
-            return 'FULL_TIME'  # Default to full-time if not specified
-            
-        text = type_elem.text.lower()
+        text = text.lower()
         for key, value in job_types.items():
             if key in text:
                 return value
                 
         return 'FULL_TIME'
 
-    def _extract_description(self, card):
-        """Extract job description"""
-        desc_elem = card.find('p', class_='base-search-card__metadata')
-        return desc_elem.text.strip() if desc_elem else "No description available"
+    def apply_detail(self, job, description):
+        job['requirements'] = self._extract_requirements(description)
 
-    def _extract_requirements(self, card):
+    def _extract_requirements(self, description):
         """Extract requirements from job description"""
-        # Click on job card to load full description
-        try:
-            job_link = card.find('a', class_='base-card__full-link')['href']
-            self.driver.execute_script(f"window.open('{job_link}', '_blank');")
-            self.driver.switch_to.window(self.driver.window_handles[-1])
-            
-            self.wait_for_element(By.CLASS_NAME, 'description__text')
-            description = self.driver.find_element(By.CLASS_NAME, 'description__text').text
-            
-            self.driver.close()
-            self.driver.switch_to.window(self.driver.window_handles[0])
-            
-            # Extract requirements section
-            lines = description.split('\n')
-            requirements = []
-            capturing = False
-            
-            for line in lines:
-                if any(word in line.lower() for word in ['required', 'requirements', 'qualifications']):
-                    capturing = True
-                    requirements.append(line.strip())
-                elif capturing and line.strip():
-                    if any(word in line.lower() for word in ['about us', 'benefits', 'what we offer']):
-                        break
-                    requirements.append(line.strip())
-                    
-            return '\n'.join(requirements) if requirements else "No specific requirements listed"
-            
-        except Exception as e:
-            logger.error(f"Error extracting LinkedIn job requirements: {str(e)}")
-            return "Error loading requirements"
+        lines = description.split('\n')
+        requirements = []
+        capturing = False
+        
+        for line in lines:
+            if any(word in line.lower() for word in ['required', 'requirements', 'qualifications']):
+                capturing = True
+                requirements.append(line.strip())
+            elif capturing and line.strip():
+                if any(word in line.lower() for word in ['about us', 'benefits', 'what we offer']):
+                    break
+                requirements.append(line.strip())
+                
+        return '\n'.join(requirements) if requirements else "No specific requirements listed"
 
-    def _extract_date(self, card):
-        """Extract and parse posting date"""
-        date_elem = card.find('time', class_='job-search-card__listdate')
-        if not date_elem:
-            return timezone.now()
-            
+    def _parse_date(self, date_text):
+        """Parse the posting date"""
         try:
             # LinkedIn usually shows relative dates like "3 days ago"
-            date_text = date_elem.text.strip().lower()
+            date_text = date_text.lower()
             if 'hour' in date_text:
                 hours = int(date_text.split()[0])
                 return timezone.now() - timezone.timedelta(hours=hours)
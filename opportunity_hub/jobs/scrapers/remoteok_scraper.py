@@ -1,67 +1,77 @@
 from .base import BaseScraper
-from selenium.webdriver.common.by import By
-from bs4 import BeautifulSoup
+from core.scraping.parsing import parse_cards
 from django.utils import timezone
 import logging
 
 logger = logging.getLogger(__name__)
 
 class RemoteOKScraper(BaseScraper):
+    source_name = 'RemoteOK'
+    card_selector = 'tr.job'
+    static_first = True
+
     def scrape_jobs(self, keywords=None, location=None, num_pages=1):
         """
         Scrape jobs from RemoteOK
         Note: RemoteOK focuses on remote jobs, so location parameter is ignored
         """
         jobs = []
-        keywords = keywords or "all"
         
         try:
-            url = f'https://remoteok.com/remote-{keywords}-jobs'
-            self.driver.get(url)
-            self.wait_for_element(By.TAG_NAME, 'tr')
-            self.scroll_page()
-            
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            job_rows = soup.find_all('tr', class_='job')
-            
-            for row in job_rows:
-                try:
-                    # Extract salary range if available
-                    salary_elem = row.find('div', class_='location')
-                    salary_range = None
-                    if salary_elem:
-                        salary_text = salary_elem.text.strip()
-                        if '$' in salary_text:
-                            salary_range = salary_text
-
-                    job = {
-                        'title': row.find('h2', itemprop='title').text.strip(),
-                        'company': row.find('h3', itemprop='name').text.strip(),
-                        'location': 'Remote',  # All jobs are remote
-                        'employment_type': self._determine_employment_type(row),
-                        'description': self._extract_description(row),
-                        'requirements': self._extract_requirements(row),
-                        'salary_range': salary_range,
-                        'application_url': 'https://remoteok.com' + row.find('a', class_='job')['href'],
-                        'source_website': 'RemoteOK',
-                        'posted_date': self._extract_date(row),
-                        'is_remote': True,  # All jobs are remote
-                        'is_active': True
-                    }
-                    jobs.append(job)
-                    
-                except Exception as e:
-                    logger.error(f"Error extracting RemoteOK job data: {str(e)}")
-                    continue
+            url, = self.page_urls(keywords=keywords)
+            html = self.fetch_page(url, self.card_selector)
+            jobs.extend(self.parse_page(html, keywords=keywords, location=location))
 
         except Exception as e:
             logger.error(f"Error scraping RemoteOK: {str(e)}")
         
         return jobs
 
+    def page_urls(self, num_pages=1, keywords=None, location=None):
+        """RemoteOK lists everything on one page"""
+        keywords = keywords or "all"
+        return [f'https://remoteok.com/remote-{keywords}-jobs']
+
+    def parse_page(self, html, keywords=None, location=None):
+        """Extract jobs from the cards on one listing page"""
+        jobs = []
+        job_rows = parse_cards(html, self.card_selector)
+
+        for row in job_rows:
+            try:
+                # Extract salary range if available
+                salary_elem = row.select_one('div.location')
+                salary_range = None
+                if salary_elem:
+                    salary_text = salary_elem.text.strip()
+                    if '$' in salary_text:
+                        salary_range = salary_text
+
+                job = {
+                    'title': row.select_one('h2[itemprop="title"]').text.strip(),
+                    'company': row.select_one('h3[itemprop="name"]').text.strip(),
+                    'location': 'Remote',  # All jobs are remote
+                    'employment_type': self._determine_employment_type(row),
+                    'description': self._extract_description(row),
+                    'requirements': self._extract_requirements(row),
+                    'salary_range': salary_range,
+                    'application_url': 'https://remoteok.com' + row.select_one('a.job')['href'],
+                    'source_website': 'RemoteOK',
+                    'posted_date': self._extract_date(row),
+                    'is_remote': True,  # All jobs are remote
+                    'is_active': True
+                }
+                jobs.append(job)
+                
+            except Exception as e:
+                logger.error(f"Error extracting RemoteOK job data: {str(e)}")
+                continue
+
+        return jobs
+
     def _determine_employment_type(self, row):
         """Determine employment type from job row"""
-        tags = row.find_all('td', class_='tags')
+        tags = row.select('td.tags')
         if not tags:
             return 'FULL_TIME'  # Default to full-time
 
@@ -80,7 +90,7 @@ class RemoteOKScraper(BaseScraper):
 
     def _extract_description(self, row):
         """Extract job description"""
-        desc_elem = row.find('div', class_='description')
+        desc_elem = row.select_one('div.description')
         return desc_elem.text.strip() if desc_elem else "No description available"
 
     def _extract_requirements(self, row):
@@ -105,7 +115,7 @@ class RemoteOKScraper(BaseScraper):
 
     def _extract_date(self, row):
         """Extract and parse posting date"""
-        date_elem = row.find('time', datetime=True)
+        date_elem = row.select_one('time[datetime]')
         if date_elem and date_elem.get('datetime'):
             try:
                 from datetime import datetime
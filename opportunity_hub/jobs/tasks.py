@@ -1,26 +1,40 @@
-from celery import shared_task
-from .utils.scraper import JobScraper
+from celery import chord, shared_task
 from .models import JobListing
 from django.utils import timezone
+from core.ledger import finish_run, ingest_for_run, start_run
+from core.models import ScrapeRun
+from core.profiling import profiled
+from core.tasks import page_tasks
+
+# Listing scrapers (by source_name) fanned out by scrape_jobs_task
+JOB_SOURCES = ['Indeed', 'LinkedIn', 'RemoteOK']
 
 @shared_task
-def scrape_jobs_task():
+def scrape_jobs_task(keywords=None, location=None, num_pages=1, profile=False):
     """Celery task to scrape jobs from various sources"""
-    scraper = JobScraper()
-    
-    # Scrape from multiple sources
-    indeed_jobs = scraper.scrape_indeed()
-    linkedin_jobs = scraper.scrape_linkedin()
-    remote_jobs = scraper.scrape_remoteok()
+    # One subtask per source and page, spread over every worker; the chord
+    # callback saves whatever came back once they have all finished
+    run_id = start_run('jobs')
+    header = page_tasks(JOB_SOURCES, num_pages, run_id=run_id, profile=profile, keywords=keywords, location=location)
+    chord(header)(save_jobs_task.s(run_id=run_id, profile=profile))
     
-    # Combine all jobs
-    all_jobs = indeed_jobs + linkedin_jobs + remote_jobs
+    return f"Dispatched {len(header)} page scrapes for {len(JOB_SOURCES)} sources."
+
+@shared_task
+def save_jobs_task(pages, run_id=None, profile=False):
+    """Chord callback: combine every page's jobs and save them"""
+    all_jobs = (job for page in pages for job in page)
     
-    # Save to database
-    for job_data in all_jobs:
-        JobListing.objects.create(**job_data)
+    # Save to database, one upsert per chunk
+    try:
+        with profiled('save-jobs', run_id, enabled=profile):
+            result = ingest_for_run(run_id, JobListing, all_jobs)
+    except Exception:
+        finish_run(run_id, ScrapeRun.FAILED)
+        raise
+    finish_run(run_id)
     
-    return f"Successfully scraped {len(all_jobs)} jobs."
+    return f"Successfully scraped {result.total} jobs ({result})."
 
 @shared_task
 def clean_old_jobs_task():
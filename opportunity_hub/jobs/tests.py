@@ -1,3 +1,54 @@
+from unittest.mock import ANY, patch
+
 from django.test import TestCase
+from django.utils import timezone
+
+from core.ledger import start_run
+from core.models import ScrapeRun
+
+from .models import JobListing
+from .tasks import JOB_SOURCES, save_jobs_task, scrape_jobs_task
+
+
+def make_job(title):
+    return {
+        'title': title,
+        'company': 'Acme',
+        'location': 'Remote',
+        'employment_type': 'FULL_TIME',
+        'description': 'Build things',
+        'requirements': 'Python',
+        'application_url': f'https://example.com/{title}',
+        'source_website': 'Example',
+        'posted_date': timezone.now().date(),
+    }
+
+
+class ScrapeJobsTaskTests(TestCase):
+    @patch('jobs.tasks.chord')
+    @patch('jobs.tasks.page_tasks')
+    def test_fans_out_pages_into_a_chord(self, page_tasks, chord):
+        page_tasks.return_value = ['page-1', 'page-2']
+
+        result = scrape_jobs_task(keywords='python', num_pages=2)
+
+        page_tasks.assert_called_once_with(JOB_SOURCES, 2, run_id=ANY, profile=False, keywords='python', location=None)
+        chord.assert_called_once_with(['page-1', 'page-2'])
+        callback = chord.return_value.call_args[0][0]
+        self.assertEqual(callback.task, 'jobs.tasks.save_jobs_task')
+        self.assertIn('2 page scrapes', result)
+
+    def test_callback_saves_every_page(self):
+        result = save_jobs_task([[make_job('a'), make_job('b')], [], [make_job('c')]])
+
+        self.assertEqual(JobListing.objects.count(), 3)
+        self.assertEqual(result, 'Successfully scraped 3 jobs (3 created, 0 updated, 0 unchanged).')
+
+    def test_callback_finishes_the_run(self):
+        run_id = start_run('jobs')
+
+        save_jobs_task([[make_job('a')]], run_id=run_id)
 
-# Create your tests here.
+        run = ScrapeRun.objects.get(pk=run_id)
+        self.assertEqual(run.status, ScrapeRun.SUCCESS)
+        self.assertEqual(run.sources.get().created, 1)
@@ -1,25 +1,20 @@
-import requests
 from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from datetime import datetime
 from django.utils import timezone
+from core.scraping.cache import get_http_cache
+from core.scraping.driver_pool import PooledDriverMixin
+from core.scraping.http import fetch_url
+from core.scraping.redirect import redirect_url
+
+class JobScraper(PooledDriverMixin):
+    # Headless Chrome is borrowed from the shared driver pool on first use
 
-class JobScraper:
-    def __init__(self):
-        # Set up headless Chrome browser for Selenium
-        chrome_options = Options()
-        chrome_options.add_argument('--headless')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        self.driver = webdriver.Chrome(options=chrome_options)
-    
     def scrape_indeed(self, query='python developer', location='remote'):
         """Scrape job listings from Indeed"""
         jobs = []
         url = f'https://www.indeed.com/jobs?q={query}&l={location}'
         
-        self.driver.get(url)
+        self.driver.get(redirect_url(url))
         soup = BeautifulSoup(self.driver.page_source, 'html.parser')
         
         job_cards = soup.find_all('div', class_='job_seen_beacon')
@@ -46,7 +41,7 @@ class JobScraper:
         jobs = []
         url = f'https://www.linkedin.com/jobs/search?keywords={query}'
         
-        self.driver.get(url)
+        self.driver.get(redirect_url(url))
         soup = BeautifulSoup(self.driver.page_source, 'html.parser')
         
         job_cards = soup.find_all('div', class_='base-search-card')
@@ -77,8 +72,11 @@ class JobScraper:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
         
-        response = requests.get(url, headers=headers)
-        soup = BeautifulSoup(response.content, 'html.parser')
+        response = fetch_url(url, headers=headers, cache=get_http_cache(), source='RemoteOK')
+        if response.not_modified:
+            # Nothing new since the last run, which already saved these jobs
+            return jobs
+        soup = BeautifulSoup(response.text, 'html.parser')
         
         job_cards = soup.find_all('tr', class_='job')
         
@@ -97,8 +95,4 @@ class JobScraper:
             except Exception as e:
                 print(f"Error scraping RemoteOK job: {e}")
                 
-        return jobs
-
-    def __del__(self):
-        """Close the browser when done"""
-        self.driver.quit()
\ No newline at end of file
+        return jobs
\ No newline at end of file
@@ -3,7 +3,9 @@ from django.contrib.auth.decorators import login_required
 from django.db.models import Q
 from .models import JobListing, JobApplication
 from django.contrib import messages
+from core.metrics import timed_view
 
+@timed_view('job_list')
 def job_list(request):
     jobs = JobListing.objects.all().order_by('-posted_date')
     
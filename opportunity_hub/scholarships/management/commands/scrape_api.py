@@ -1,7 +1,12 @@
 from django.core.management.base import BaseCommand
 from scholarships.scrapers.api_scraper import APIScholarshipScraper
 from scholarships.models import Scholarship
+from core.ingest import IngestResult
+from core.ledger import finish_run, ingest_for_run, record_source, start_run
+from core.models import ScrapeRun
+from core.profiling import profiled
 import logging
+from collections import Counter
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -26,6 +31,11 @@ class Command(BaseCommand):
             help='Number of pages to scrape from CORDIS',
             default=1
         )
+        parser.add_argument(
+            '--profile',
+            action='store_true',
+            help='Profile the run with cProfile and tracemalloc (dumps go to SCRAPER_PROFILE_DIR)'
+        )
 
     def handle(self, *args, **options):
         scraper = APIScholarshipScraper()
@@ -35,42 +45,30 @@ class Command(BaseCommand):
 
         self.stdout.write(self.style.SUCCESS('Starting API-based scholarship scraping...'))
         
+        run_id = start_run('api')
+        session = None
         try:
-            scholarships = scraper.scrape_scholarships(
-                field_of_study=field,
-                country=country,
-                num_pages=pages
-            )
-            
-            count = 0
-            for data in scholarships:
-                scholarship, created = Scholarship.objects.update_or_create(
-                    title=data['title'],
-                    organization=data['organization'],
-                    source_website=data['source_website'],
-                    defaults={
-                        'description': data['description'],
-                        'requirements': data['requirements'],
-                        'amount': data['amount'],
-                        'country': data['country'],
-                        'education_level': data['education_level'],
-                        'field_of_study': data['field_of_study'],
-                        'deadline': data['deadline'],
-                        'website_url': data['website_url'],
-                        'is_fully_funded': data['is_fully_funded'],
-                        'is_active': data['is_active']
-                    }
+            with profiled('scrape-api', run_id, enabled=options['profile']) as session:
+                # Save each source's batch as it arrives instead of holding the whole run in memory
+                batches = scraper.iter_scholarships(
+                    field_of_study=field,
+                    country=country,
+                    num_pages=pages
                 )
-                
-                if created:
-                    logger.info(f'Created new scholarship: {scholarship.title}')
-                    count += 1
-                else:
-                    logger.info(f'Updated existing scholarship: {scholarship.title}')
+
+                # One upsert per batch instead of a SELECT plus INSERT/UPDATE per row
+                result = IngestResult()
+                for batch in batches:
+                    for source, count in Counter(data['source_website'] for data in batch).items():
+                        record_source(run_id, source, records_extracted=count)
+                    result += ingest_for_run(run_id, Scholarship, batch)
+                    scraper.batch_stored(batch)
+            finish_run(run_id)
 
             self.stdout.write(
                 self.style.SUCCESS(
-                    f'Successfully scraped {count} new scholarships!'
+                    f'Successfully scraped {result.created} new scholarships '
+                    f'({result.updated} updated, {result.unchanged} unchanged)!'
                 )
             )
 
@@ -78,4 +76,7 @@ class Command(BaseCommand):
             self.stdout.write(
                 self.style.ERROR(f'Error during scraping: {str(e)}')
             )
-            logger.error(f'Scraping error: {str(e)}', exc_info=True)
\ No newline at end of file
+            logger.error(f'Scraping error: {str(e)}', exc_info=True)
+            finish_run(run_id, ScrapeRun.FAILED)
+        for line in session.summary() if session else []:
+            self.stdout.write(line)
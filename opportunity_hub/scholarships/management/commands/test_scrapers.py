@@ -3,15 +3,30 @@ from django.core.management.base import BaseCommand
 from scholarships.scrapers.scholarships_positions_scraper import ScholarshipsPositionsPortalScraper
 from scholarships.scrapers.university_positions_scraper import UniversityPositionsScraper
 import time
+from core.profiling import profiled
 
 logger = logging.getLogger(__name__)
 
 class Command(BaseCommand):
     help = 'Test scholarship scrapers by running them and printing results'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--profile',
+            action='store_true',
+            help='Profile the run with cProfile and tracemalloc (dumps go to SCRAPER_PROFILE_DIR)'
+        )
+
     def handle(self, *args, **options):
         # Increase logging for debugging
         logging.basicConfig(level=logging.INFO)
+
+        with profiled('test-scrapers', enabled=options['profile']) as session:
+            self.run_scrapers()
+        for line in session.summary() if session else []:
+            self.stdout.write(line)
+
+    def run_scrapers(self):
         
         scrapers = [
             ScholarshipsPositionsPortalScraper(),
@@ -29,7 +44,7 @@ class Command(BaseCommand):
                     url = 'https://www.universitypositions.eu'
                 
                 self.stdout.write(f"Accessing {url}...")
-                scraper.driver.get(url)
+                scraper.load_page(url)
                 time.sleep(5)  # Wait for any redirects/blocks
                 
                 # Log current state
@@ -61,13 +76,12 @@ class Command(BaseCommand):
                 continue
                 
             finally:
-                # Save the page source for debugging
-                try:
-                    with open(f'debug_{scraper.__class__.__name__}.html', 'w', encoding='utf-8') as f:
-                        f.write(scraper.driver.page_source)
-                    self.stdout.write(f"Saved page source to debug_{scraper.__class__.__name__}.html")
-                except Exception as e:
-                    self.stdout.write(f"Could not save debug file: {str(e)}")
+                # Listing pages are already in the page archive; point at how to replay them
+                self.stdout.write(
+                    f"Replay fetched pages with: manage.py replay_pages --source '{scraper.source_name}'"
+                )
+                # Hand the browser back so the next scraper can reuse it
+                scraper.close()
             
             self.stdout.write(self.style.SUCCESS(f"{scraper.__class__.__name__} test completed"))
             
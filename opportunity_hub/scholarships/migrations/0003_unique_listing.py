@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:19
+
+from django.db import migrations, models
+
+
+def remove_duplicates(apps, schema_editor):
+    """
+    Keep the newest of rows that are the same listing, moving applications over to it.
+
+    Rows only count as duplicates when their link, title and organization all match.
+    """
+    Scholarship = apps.get_model('scholarships', 'Scholarship')
+    ScholarshipApplication = apps.get_model('scholarships', 'ScholarshipApplication')
+    keep = {}
+    for row in Scholarship.objects.order_by('-id').values('id', 'source_website', 'website_url', 'title', 'organization'):
+        duplicate_of = keep.setdefault(
+            (row['source_website'], row['website_url'], row['title'], row['organization']), row['id']
+        )
+        if duplicate_of == row['id']:
+            continue
+        for application in ScholarshipApplication.objects.filter(scholarship_id=row['id']):
+            if ScholarshipApplication.objects.filter(user_id=application.user_id, scholarship_id=duplicate_of).exists():
+                application.delete()
+            else:
+                application.scholarship_id = duplicate_of
+                application.save(update_fields=['scholarship'])
+        Scholarship.objects.filter(id=row['id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scholarships', '0002_alter_scholarship_deadline'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='scholarship',
+            constraint=models.UniqueConstraint(fields=('source_website', 'website_url', 'title', 'organization'), name='unique_scholarship'),
+        ),
+    ]
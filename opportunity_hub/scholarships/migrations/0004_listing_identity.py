@@ -0,0 +1,114 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:40
+
+import hashlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from django.db import migrations, models
+
+# Frozen copy of core.identity as of this migration, so later changes to
+# normalization don't change what it computes
+
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'igshid', '_ga', '_gl',
+    'ref', 'ref_', 'referrer', 'trk', 'trkinfo', 'trackingid', 'refid', 'position', 'pagenum',
+    'from', 'tk',
+}
+TRACKING_PREFIXES = ('utm_', 'pk_', 'hsa_')
+
+
+def normalize_url(url):
+    url = (url or '').strip()
+    if not url:
+        return ''
+    parts = urlsplit(url if '//' in url else f'//{url}')
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    port = parts.port
+    if port and (parts.scheme, port) not in (('http', 80), ('https', 443)):
+        host = f'{host}:{port}'
+    query = sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if not (name.lower() in TRACKING_PARAMS or name.lower().startswith(TRACKING_PREFIXES)))
+    path = parts.path.rstrip('/')
+    if not host:
+        return urlunsplit(('', '', path, urlencode(query), ''))
+    return urlunsplit(('https' if parts.scheme in ('http', 'https', '') else parts.scheme.lower(),
+                       host, path, urlencode(query), ''))
+
+
+def listing_identity(source, url, *fields):
+    parts = [(source or '').strip().lower(), normalize_url(url)]
+    parts += [' '.join(str(value or '').lower().split()) for value in fields]
+    return hashlib.blake2b('\x1f'.join(parts).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def merge_duplicates(model, application_model, foreign_key, identity_of):
+    """Set every row's identity, keeping the newest row of each group and moving applications onto it"""
+    identities = {}
+    keep = {}
+    for row in model.objects.order_by('-id').iterator():
+        identity = identity_of(row)
+        identities[row.id] = (row, identity)
+        keep.setdefault(identity, row.id)
+
+    fk = f'{foreign_key}_id'
+    for row_id, (row, identity) in identities.items():
+        kept = keep[identity]
+        if kept == row_id:
+            continue
+        for application in application_model.objects.filter(**{fk: row_id}):
+            if application_model.objects.filter(user_id=application.user_id, **{fk: kept}).exists():
+                application.delete()
+            else:
+                setattr(application, fk, kept)
+                application.save(update_fields=[foreign_key])
+        row.delete()
+
+    changed = [row for row_id, (row, identity) in identities.items()
+               if keep[identity] == row_id and row.identity != identity]
+    # Two passes so rows swapping identities never collide on the unique index
+    for row in changed:
+        row.identity = f'~{row.id}'
+    model.objects.bulk_update(changed, ['identity'], batch_size=500)
+    for row in changed:
+        row.identity = identities[row.id][1]
+    model.objects.bulk_update(changed, ['identity'], batch_size=500)
+
+
+def backfill_identity(apps, schema_editor):
+    """Give every row its canonical identity, merging rows that turn out to be the same listing"""
+    merge_duplicates(
+        apps.get_model('scholarships', 'Scholarship'),
+        apps.get_model('scholarships', 'ScholarshipApplication'),
+        'scholarship',
+        lambda row: listing_identity(row.source_website, row.website_url, row.title, row.organization),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scholarships', '0003_unique_listing'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scholarship',
+            name='identity',
+            field=models.CharField(editable=False, max_length=32, null=True),
+        ),
+        migrations.RunPython(backfill_identity, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='scholarship',
+            name='identity',
+            field=models.CharField(editable=False, max_length=32),
+        ),
+        migrations.RemoveConstraint(
+            model_name='scholarship',
+            name='unique_scholarship',
+        ),
+        migrations.AddConstraint(
+            model_name='scholarship',
+            constraint=models.UniqueConstraint(fields=('identity',), name='unique_scholarship_identity'),
+        ),
+    ]
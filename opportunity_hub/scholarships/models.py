@@ -1,6 +1,8 @@
 from django.db import models
 from django.urls import reverse
 
+from core.identity import listing_identity
+
 class Scholarship(models.Model):
     EDUCATION_LEVEL_CHOICES = [
         ('UNDERGRADUATE', 'Undergraduate'),
@@ -25,6 +27,19 @@ class Scholarship(models.Model):
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Hash of the source, canonical website_url, title and organization (see core.identity)
+    identity = models.CharField(max_length=32, editable=False)
+
+    IDENTITY_FIELDS = ('source_website', 'website_url', 'title', 'organization')
+
+    @classmethod
+    def identity_of(cls, record):
+        """Canonical identity of a scraped record or field dict"""
+        return listing_identity(*(record.get(name) for name in cls.IDENTITY_FIELDS))
+
+    def save(self, *args, **kwargs):
+        self.identity = self.identity_of({name: getattr(self, name) for name in self.IDENTITY_FIELDS})
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.title} by {self.organization}"
@@ -40,6 +55,10 @@ class Scholarship(models.Model):
             models.Index(fields=['education_level']),
             models.Index(fields=['deadline']),
         ]
+        constraints = [
+            # What scraped scholarships are looked up and upserted on (see core.ingest)
+            models.UniqueConstraint(fields=['identity'], name='unique_scholarship_identity'),
+        ]
 
 class ScholarshipApplication(models.Model):
     STATUS_CHOICES = [
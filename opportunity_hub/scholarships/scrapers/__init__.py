@@ -1,9 +1,17 @@
 from .scholarships_positions_scraper import ScholarshipsPositionsPortalScraper
 from .university_positions_scraper import UniversityPositionsScraper
 from .api_scraper import APIScholarshipScraper
+from .cheetah_scraper import CheetahScraper
+from .fastweb_scraper import FastWebScraper
+from .international_scholarships_scraper import InternationalScholarshipsScraper
+from .scholarships_dot_com_scraper import ScholarshipsDotComScraper
 
 __all__ = [
     'ScholarshipsPositionsPortalScraper',
     'UniversityPositionsScraper',
-    'APIScholarshipScraper'
+    'APIScholarshipScraper',
+    'CheetahScraper',
+    'FastWebScraper',
+    'InternationalScholarshipsScraper',
+    'ScholarshipsDotComScraper'
 ]
\ No newline at end of file
@@ -1,9 +1,12 @@
-import requests
+import asyncio
+import json
 from datetime import datetime
 import logging
 from bs4 import BeautifulSoup, Tag
 from django.utils import timezone
-from typing import List, Dict, Any
+from typing import Any, Dict, Iterator, List
+from core.scraping.cache import get_http_cache
+from core.scraping.http import AsyncFetcher, iter_async, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -11,205 +14,302 @@ class APIScholarshipScraper:
     """
     Scraper that uses official APIs and RSS feeds to collect scholarship data
     """
+    DAAD_URL = "https://www2.daad.de/deutschland/stipendium/datenbank/en/21148-scholarship-database/"
+    ERASMUS_URL = "https://erasmus-plus.ec.europa.eu/opportunities/opportunities-for-individuals/students/erasmus-mundus-joint-masters-scholarships"
+    COMMONWEALTH_URL = "https://cscuk.fcdo.gov.uk/scholarships/"
+    CORDIS_URL = "https://api.tech.ec.europa.eu/funding/grants/grants"
+
+    # Archive source name of each fetched page -> the method that parses it (see parse_archived_page)
+    PAGE_PARSERS = {
+        'DAAD': '_parse_daad_database',
+        'Erasmus+': '_parse_erasmus',
+        'Commonwealth Scholarship Commission': '_parse_commonwealth',
+        'EU Funding & Tenders': '_parse_cordis_page',
+    }
+
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.headers = {
             'User-Agent': 'OpportunityHub/1.0 (Academic Project; contact@opportunityhub.edu)'
-        })
+        }
+        # (batch, response) for every fetched page whose records haven't been saved yet
+        self._pending_pages = []
 
     def scrape_scholarships(self, field_of_study=None, country=None, num_pages=1) -> List[Dict[str, Any]]:
         """
-        Collect scholarships from multiple sources
+        Collect scholarships from multiple sources.
+
+        The remote sources (and every CORDIS page) are fetched concurrently,
+        so a run takes about as long as the slowest source.
         """
         scholarships = []
-        
+        for batch in self.iter_scholarships(field_of_study, country, num_pages):
+            scholarships.extend(batch)
+        return scholarships
+
+    def iter_scholarships(self, field_of_study=None, country=None, num_pages=1) -> Iterator[List[Dict[str, Any]]]:
+        """Yield each source's (or CORDIS page's) scholarships as soon as they are parsed"""
         # Get DAAD scholarships
-        daad_scholarships = self._get_daad_scholarships(field_of_study, country)
-        scholarships.extend(daad_scholarships)
-        logger.info(f'Found {len(daad_scholarships)} DAAD scholarships')
+        try:
+            daad_scholarships = self._get_daad_scholarships(field_of_study, country)
+            logger.info(f'Found {len(daad_scholarships)} DAAD scholarships')
+            yield daad_scholarships
+        except Exception as e:
+            logger.error(f"Error getting DAAD scholarships: {str(e)}", exc_info=True)
         
         # Get Swedish Institute scholarships
-        si_scholarships = self._get_sweden_scholarships()
-        scholarships.extend(si_scholarships)
-        logger.info(f'Found {len(si_scholarships)} Swedish Institute scholarships')
+        try:
+            si_scholarships = self._get_sweden_scholarships()
+            logger.info(f'Found {len(si_scholarships)} Swedish Institute scholarships')
+            yield si_scholarships
+        except Exception as e:
+            logger.error(f"Error getting Swedish Institute scholarships: {str(e)}", exc_info=True)
         
-        # DAAD Scholarships
+        yield from iter_async(self._stream_remote_sources(field_of_study, country, num_pages))
+
+    def batch_stored(self, batch):
+        """
+        Call once a batch from iter_scholarships is saved.
+
+        Only then may the page it came from be answered with 304 Not
+        Modified next run; until then that page is fetched in full again.
+        """
+        for scholarships, response in self._pending_pages:
+            if scholarships is batch:
+                response.commit()
+        self._pending_pages = [(scholarships, response) for scholarships, response in self._pending_pages
+                               if scholarships is not batch]
+
+    def _parsed(self, response, scholarships):
+        self._pending_pages.append((scholarships, response))
+        return scholarships
+
+    async def _stream_remote_sources(self, field_of_study=None, country=None, num_pages=1):
+        """Fetch DAAD, Erasmus+, Commonwealth and CORDIS at the same time, yielding whichever finishes first"""
+        async with AsyncFetcher(headers=self.headers, cache=get_http_cache()) as fetcher:
+            tasks = [
+                asyncio.ensure_future(self._fetch_daad_database(fetcher, field_of_study)),
+                asyncio.ensure_future(self._fetch_erasmus(fetcher, field_of_study)),
+                asyncio.ensure_future(self._fetch_commonwealth(fetcher, field_of_study)),
+            ] + [
+                asyncio.ensure_future(self._fetch_cordis_page(fetcher, page + 1, field_of_study, country))
+                for page in range(num_pages)
+            ]
+            try:
+                for finished in asyncio.as_completed(tasks):
+                    batch = await finished
+                    if batch:
+                        yield batch
+            finally:
+                # The consumer stopped early; don't leave requests running
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _fetch_daad_database(self, fetcher, field_of_study=None) -> List[Dict[str, Any]]:
+        """Fetch and parse the DAAD scholarship database page"""
         try:
-            url = "https://www2.daad.de/deutschland/stipendium/datenbank/en/21148-scholarship-database/"
-            response = self.session.get(url)
-            logger.info(f"DAAD response status: {response.status_code}")
-            
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                # First, let's log all available div classes to see what we're working with
-                div_classes = set()
-                for div in soup.find_all('div', class_=True):
-                    div_classes.update(div['class'])
-                logger.info(f"Available div classes: {div_classes}")
-                
-                # Try to find any scholarship-related content
-                scholarship_elements = soup.find_all(['div', 'article'], class_=lambda x: x and any(keyword in x.lower() for keyword in ['scholarship', 'result', 'listing', 'program']))
-                logger.info(f"Found {len(scholarship_elements)} potential scholarship elements")
-                
-                for item in scholarship_elements:
-                    # Try to find title in various ways
-                    title = (
-                        item.find(['h1', 'h2', 'h3', 'h4'], class_=lambda x: x and 'title' in x.lower() if x else True) or
-                        item.find(['a'], class_=lambda x: x and 'title' in x.lower() if x else True)
-                    )
-                    
-                    desc = item.find(['div', 'p'], class_=lambda x: x and any(keyword in x.lower() for keyword in ['desc', 'content', 'text']) if x else True)
-                    
-                    if title:
-                        scholarship = {
-                            'title': title.text.strip(),
-                            'organization': 'DAAD',
-                            'description': desc.text.strip() if desc else '',
-                            'requirements': '',
-                            'amount': 'See website for details',
-                            'country': 'Germany',
-                            'education_level': 'ALL',
-                            'field_of_study': field_of_study or 'All Fields',
-                            'deadline': None,
-                            'website_url': 'https://www2.daad.de' + title.get('href') if title.get('href') else '',
-                            'source_website': 'DAAD',
-                            'is_fully_funded': False,
-                            'is_active': True
-                        }
-                        scholarships.append(scholarship)
-                        logger.info(f'Found DAAD scholarship: {scholarship["title"]}')
+            response = await fetcher.fetch(self.DAAD_URL, source='DAAD', vary={'field_of_study': field_of_study})
+            logger.info(f"DAAD response status: {response.status}")
+            if response.not_modified:
+                # Parsed and saved on an earlier run (see batch_stored)
+                return []
+            if response.status == 200:
+                return self._parsed(response, self._parse_daad_database(response.text, field_of_study))
         except Exception as e:
             logger.error(f"Error fetching DAAD scholarships: {str(e)}", exc_info=True)
+        return []
 
-        # Erasmus Mundus Joint Masters
+    async def _fetch_erasmus(self, fetcher, field_of_study=None) -> List[Dict[str, Any]]:
+        """Fetch and parse the Erasmus Mundus Joint Masters page"""
         try:
-            url = "https://erasmus-plus.ec.europa.eu/opportunities/opportunities-for-individuals/students/erasmus-mundus-joint-masters-scholarships"
-            response = self.session.get(url)
-            logger.info(f"Erasmus response status: {response.status_code}")
-            
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                div_classes = set()
-                for div in soup.find_all('div', class_=True):
-                    div_classes.update(div['class'])
-                logger.info(f"Available Erasmus div classes: {div_classes}")
-                
-                # Look for programme/course listings
-                program_elements = soup.find_all(['div', 'article'], class_=lambda x: x and any(keyword in x.lower() for keyword in ['programme', 'course', 'emjm', 'masters']))
-                logger.info(f"Found {len(program_elements)} potential Erasmus programs")
-                
-                for item in program_elements:
-                    title = (
-                        item.find(['h1', 'h2', 'h3', 'h4'], recursive=False) or
-                        item.find('a', href=True)
-                    )
-                    desc = item.find(['div', 'p'], class_=lambda x: x and 'description' in x.lower() if x else True)
-                    
-                    if title:
-                        scholarship = {
-                            'title': title.text.strip(),
-                            'organization': 'European Commission',
-                            'description': desc.text.strip() if desc else 'Erasmus Mundus Joint Masters Scholarship',
-                            'requirements': 'Bachelor\'s degree required',
-                            'amount': 'Full scholarship (1400 EUR/month + other benefits)',
-                            'country': 'European Union',
-                            'education_level': 'MASTERS',
-                            'field_of_study': field_of_study or 'All Fields',
-                            'deadline': None,
-                            'website_url': title.get('href') if title.get('href') else 'https://erasmus-plus.ec.europa.eu',
-                            'source_website': 'Erasmus+',
-                            'is_fully_funded': True,
-                            'is_active': True
-                        }
-                        scholarships.append(scholarship)
-                        logger.info(f'Found Erasmus scholarship: {scholarship["title"]}')
+            response = await fetcher.fetch(self.ERASMUS_URL, source='Erasmus+', vary={'field_of_study': field_of_study})
+            logger.info(f"Erasmus response status: {response.status}")
+            if response.not_modified:
+                # Parsed and saved on an earlier run (see batch_stored)
+                return []
+            if response.status == 200:
+                return self._parsed(response, self._parse_erasmus(response.text, field_of_study))
         except Exception as e:
             logger.error(f"Error fetching Erasmus scholarships: {str(e)}", exc_info=True)
+        return []
 
-        # Commonwealth Scholarships
+    async def _fetch_commonwealth(self, fetcher, field_of_study=None) -> List[Dict[str, Any]]:
+        """Fetch and parse the Commonwealth Scholarships listing"""
         try:
-            url = "https://cscuk.fcdo.gov.uk/scholarships/"
-            response = self.session.get(url)
-            logger.info(f"Commonwealth response status: {response.status_code}")
-            
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Look for scholarship listings
-                scholarship_items = soup.find_all('article') or soup.find_all(['div', 'section'], class_=lambda x: x and any(keyword in str(x).lower() for keyword in ['scholarship', 'fellowship']))
-                
-                for item in scholarship_items:
-                    title_elem = item.find(['h1', 'h2', 'h3', 'h4']) or item.find('a', class_=lambda x: x and 'title' in str(x).lower() if x else True)
-                    
-                    if not title_elem:
-                        continue
-                        
-                    title_text = title_elem.text.strip()
-                    if not any(keyword in title_text.lower() for keyword in ['scholarship', 'fellowship']):
-                        continue
-                        
-                    # Extract description and other details
-                    desc_elem = item.find(['div', 'p'], class_=lambda x: x and any(word in str(x).lower() for word in ['content', 'desc', 'text']) if x else True)
-                    desc_text = desc_elem.text.strip() if desc_elem else ''
-                    
-                    # Determine education level
-                    education_level = 'ALL'
-                    if any(word in title_text.lower() for word in ['phd', 'doctorate']):
-                        education_level = 'PHD'
-                    elif any(word in title_text.lower() for word in ['master']):
-                        education_level = 'MASTERS'
-                    elif any(word in title_text.lower() for word in ['undergraduate', 'bachelor']):
-                        education_level = 'UNDERGRADUATE'
-                    elif any(word in title_text.lower() for word in ['postdoc', 'post-doc']):
-                        education_level = 'POSTDOC'
-                    
-                    # Extract requirements
-                    requirements = [
-                        'Must be a citizen of a Commonwealth country',
-                        'Must have completed required academic qualifications by start date',
-                        'Must meet English language requirements',
-                        'Must be unable to afford to study in the UK without this scholarship',
-                        'Must return to home country after the scholarship ends'
-                    ]
-                    if education_level == 'MASTERS':
-                        requirements.append('Must hold a first degree of at least upper second class (2:1) standard')
-                    elif education_level == 'PHD':
-                        requirements.extend([
-                            'Must hold a first degree of at least upper second class (2:1) standard',
-                            'Must hold a Master\'s degree'
-                        ])
-                    
-                    # Get URL
-                    url = None
-                    if isinstance(title_elem, Tag) and title_elem.name == 'a' and title_elem.has_attr('href'):
-                        url = title_elem['href']
-                    elif title_elem.find_parent('a') and title_elem.find_parent('a').has_attr('href'):
-                        url = title_elem.find_parent('a')['href']
-                    
-                    if url and not url.startswith('http'):
-                        url = 'https://cscuk.fcdo.gov.uk' + url
-                    
-                    scholarship = {
-                        'title': title_text,
-                        'organization': 'Commonwealth Scholarship Commission',
-                        'description': desc_text if desc_text else f'Commonwealth {education_level.title() if education_level != "ALL" else ""} Scholarship opportunity for citizens of Commonwealth countries to study in the UK.',
-                        'requirements': '\n'.join(requirements),
-                        'amount': 'Full scholarship including:\n- Full tuition fees\n- Living allowance (stipend)\n- Return flights\n- Study travel grant\n- Initial arrival allowance\n- Research support grant (if applicable)\n- Family allowance (if applicable)\n- Excess baggage allowance\n- Thesis grant (for doctoral scholars)',
-                        'country': 'United Kingdom',
-                        'education_level': education_level,
-                        'field_of_study': field_of_study or 'All Fields',
-                        'deadline': None,
-                        'website_url': url or 'https://cscuk.fcdo.gov.uk/scholarships/',
-                        'source_website': 'Commonwealth Scholarship Commission',
-                        'is_fully_funded': True,
-                        'is_active': True
-                    }
-                    scholarships.append(scholarship)
-                    logger.info(f'Found Commonwealth scholarship: {scholarship["title"]}')
+            response = await fetcher.fetch(
+                self.COMMONWEALTH_URL, source='Commonwealth Scholarship Commission',
+                vary={'field_of_study': field_of_study}
+            )
+            logger.info(f"Commonwealth response status: {response.status}")
+            if response.not_modified:
+                # Parsed and saved on an earlier run (see batch_stored)
+                return []
+            if response.status == 200:
+                return self._parsed(response, self._parse_commonwealth(response.text, field_of_study))
         except Exception as e:
             logger.error(f"Error fetching Commonwealth scholarships: {str(e)}", exc_info=True)
+        return []
+
+    def _parse_daad_database(self, html, field_of_study=None) -> List[Dict[str, Any]]:
+        """Extract scholarships from the DAAD database page"""
+        scholarships = []
+        soup = BeautifulSoup(html, 'html.parser')
+        # First, let's log all available div classes to see what we're working with
+        div_classes = set()
+        for div in soup.find_all('div', class_=True):
+            div_classes.update(div['class'])
+        logger.info(f"Available div classes: {div_classes}")
+        
+        # Try to find any scholarship-related content
+        scholarship_elements = soup.find_all(['div', 'article'], class_=lambda x: x and any(keyword in x.lower() for keyword in ['scholarship', 'result', 'listing', 'program']))
+        logger.info(f"Found {len(scholarship_elements)} potential scholarship elements")
+        
+        for item in scholarship_elements:
+            # Try to find title in various ways
+            title = (
+                item.find(['h1', 'h2', 'h3', 'h4'], class_=lambda x: x and 'title' in x.lower() if x else True) or
+                item.find(['a'], class_=lambda x: x and 'title' in x.lower() if x else True)
+            )
+            
+            desc = item.find(['div', 'p'], class_=lambda x: x and any(keyword in x.lower() for keyword in ['desc', 'content', 'text']) if x else True)
+            
+            if title:
+                scholarship = {
+                    'title': title.text.strip(),
+                    'organization': 'DAAD',
+                    'description': desc.text.strip() if desc else '',
+                    'requirements': '',
+                    'amount': 'See website for details',
+                    'country': 'Germany',
+                    'education_level': 'ALL',
+                    'field_of_study': field_of_study or 'All Fields',
+                    'deadline': None,
+                    'website_url': 'https://www2.daad.de' + title.get('href') if title.get('href') else '',
+                    'source_website': 'DAAD',
+                    'is_fully_funded': False,
+                    'is_active': True
+                }
+                scholarships.append(scholarship)
+                logger.info(f'Found DAAD scholarship: {scholarship["title"]}')
+        return scholarships
+
+    def _parse_erasmus(self, html, field_of_study=None) -> List[Dict[str, Any]]:
+        """Extract programmes from the Erasmus Mundus Joint Masters page"""
+        scholarships = []
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        div_classes = set()
+        for div in soup.find_all('div', class_=True):
+            div_classes.update(div['class'])
+        logger.info(f"Available Erasmus div classes: {div_classes}")
+        
+        # Look for programme/course listings
+        program_elements = soup.find_all(['div', 'article'], class_=lambda x: x and any(keyword in x.lower() for keyword in ['programme', 'course', 'emjm', 'masters']))
+        logger.info(f"Found {len(program_elements)} potential Erasmus programs")
+        
+        for item in program_elements:
+            title = (
+                item.find(['h1', 'h2', 'h3', 'h4'], recursive=False) or
+                item.find('a', href=True)
+            )
+            desc = item.find(['div', 'p'], class_=lambda x: x and 'description' in x.lower() if x else True)
+            
+            if title:
+                scholarship = {
+                    'title': title.text.strip(),
+                    'organization': 'European Commission',
+                    'description': desc.text.strip() if desc else 'Erasmus Mundus Joint Masters Scholarship',
+                    'requirements': 'Bachelor\'s degree required',
+                    'amount': 'Full scholarship (1400 EUR/month + other benefits)',
+                    'country': 'European Union',
+                    'education_level': 'MASTERS',
+                    'field_of_study': field_of_study or 'All Fields',
+                    'deadline': None,
+                    'website_url': title.get('href') if title.get('href') else 'https://erasmus-plus.ec.europa.eu',
+                    'source_website': 'Erasmus+',
+                    'is_fully_funded': True,
+                    'is_active': True
+                }
+                scholarships.append(scholarship)
+                logger.info(f'Found Erasmus scholarship: {scholarship["title"]}')
+        return scholarships
 
+    def _parse_commonwealth(self, html, field_of_study=None) -> List[Dict[str, Any]]:
+        """Extract scholarships from the Commonwealth Scholarship Commission listing"""
+        scholarships = []
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Look for scholarship listings
+        scholarship_items = soup.find_all('article') or soup.find_all(['div', 'section'], class_=lambda x: x and any(keyword in str(x).lower() for keyword in ['scholarship', 'fellowship']))
+        
+        for item in scholarship_items:
+            title_elem = item.find(['h1', 'h2', 'h3', 'h4']) or item.find('a', class_=lambda x: x and 'title' in str(x).lower() if x else True)
+            
+            if not title_elem:
+                continue
+                
+            title_text = title_elem.text.strip()
+            if not any(keyword in title_text.lower() for keyword in ['scholarship', 'fellowship']):
+                continue
+                
+            # Extract description and other details
+            desc_elem = item.find(['div', 'p'], class_=lambda x: x and any(word in str(x).lower() for word in ['content', 'desc', 'text']) if x else True)
+            desc_text = desc_elem.text.strip() if desc_elem else ''
+            
+            # Determine education level
+            education_level = 'ALL'
+            if any(word in title_text.lower() for word in ['phd', 'doctorate']):
+                education_level = 'PHD'
+            elif any(word in title_text.lower() for word in ['master']):
+                education_level = 'MASTERS'
+            elif any(word in title_text.lower() for word in ['undergraduate', 'bachelor']):
+                education_level = 'UNDERGRADUATE'
+            elif any(word in title_text.lower() for word in ['postdoc', 'post-doc']):
+                education_level = 'POSTDOC'
+            
+            # Extract requirements
+            requirements = [
+                'Must be a citizen of a Commonwealth country',
+                'Must have completed required academic qualifications by start date',
+                'Must meet English language requirements',
+                'Must be unable to afford to study in the UK without this scholarship',
+                'Must return to home country after the scholarship ends'
+            ]
+            if education_level == 'MASTERS':
+                requirements.append('Must hold a first degree of at least upper second class (2:1) standard')
+            elif education_level == 'PHD':
+                requirements.extend([
+                    'Must hold a first degree of at least upper second class (2:1) standard',
+                    'Must hold a Master\'s degree'
+                ])
+            
+            # Get URL
+            url = None
+            if isinstance(title_elem, Tag) and title_elem.name == 'a' and title_elem.has_attr('href'):
+                url = title_elem['href']
+            elif title_elem.find_parent('a') and title_elem.find_parent('a').has_attr('href'):
+                url = title_elem.find_parent('a')['href']
+            
+            if url and not url.startswith('http'):
+                url = 'https://cscuk.fcdo.gov.uk' + url
+            
+            scholarship = {
+                'title': title_text,
+                'organization': 'Commonwealth Scholarship Commission',
+                'description': desc_text if desc_text else f'Commonwealth {education_level.title() if education_level != "ALL" else ""} Scholarship opportunity for citizens of Commonwealth countries to study in the UK.',
+                'requirements': '\n'.join(requirements),
+                'amount': 'Full scholarship including:\n- Full tuition fees\n- Living allowance (stipend)\n- Return flights\n- Study travel grant\n- Initial arrival allowance\n- Research support grant (if applicable)\n- Family allowance (if applicable)\n- Excess baggage allowance\n- Thesis grant (for doctoral scholars)',
+                'country': 'United Kingdom',
+                'education_level': education_level,
+                'field_of_study': field_of_study or 'All Fields',
+                'deadline': None,
+                'website_url': url or 'https://cscuk.fcdo.gov.uk/scholarships/',
+                'source_website': 'Commonwealth Scholarship Commission',
+                'is_fully_funded': True,
+                'is_active': True
+            }
+            scholarships.append(scholarship)
+            logger.info(f'Found Commonwealth scholarship: {scholarship["title"]}')
         return scholarships
 
     def _get_daad_scholarships(self, field_of_study=None, country=None) -> List[Dict[str, Any]]:
@@ -287,59 +387,80 @@ class APIScholarshipScraper:
         """
         Fetch scholarships from CORDIS public API for EU research funding
         """
-        scholarships = []
-        api_url = "https://api.tech.ec.europa.eu/funding/grants/grants"
-
-        for page in range(num_pages):
-            params = {
-                'page': page + 1,
-                'limit': 25,
-                'orderBy': 'publicationDate',
-                'order': 'desc',
-                'language': 'en',
-                'responseType': 'json'
+        async def fetch():
+            async with AsyncFetcher(headers=self.headers, cache=get_http_cache()) as fetcher:
+                return await self._fetch_cordis(fetcher, field_of_study, country, num_pages)
+        return run_async(fetch())
+
+    async def _fetch_cordis(self, fetcher, field_of_study=None, country=None, num_pages=1) -> List[Dict[str, Any]]:
+        """Request every CORDIS results page at once and merge them in page order"""
+        pages = await asyncio.gather(*(
+            self._fetch_cordis_page(fetcher, page + 1, field_of_study, country)
+            for page in range(num_pages)
+        ))
+        return [scholarship for page in pages for scholarship in page]
+
+    async def _fetch_cordis_page(self, fetcher, page, field_of_study=None, country=None) -> List[Dict[str, Any]]:
+        params = {
+            'page': page,
+            'limit': 25,
+            'orderBy': 'publicationDate',
+            'order': 'desc',
+            'language': 'en',
+            'responseType': 'json'
+        }
+        if field_of_study:
+            params['topic'] = field_of_study
+        if country:
+            params['country'] = country
+
+        try:
+            # Add required headers for the EU API
+            headers = {
+                'Accept': 'application/json',
+                'User-Agent': 'OpportunityHub/1.0 (Educational Project)'
             }
-            if field_of_study:
-                params['topic'] = field_of_study
-            if country:
-                params['country'] = country
+            response = await fetcher.fetch(self.CORDIS_URL, params=params, headers=headers, source='EU Funding & Tenders')
+            response.raise_for_status()
+            if response.not_modified:
+                return []
+            return self._parsed(response, self._parse_cordis_results(response.json()))
 
-            try:
-                # Add required headers for the EU API
-                headers = {
-                    'Accept': 'application/json',
-                    'User-Agent': 'OpportunityHub/1.0 (Educational Project)'
-                }
-                response = self.session.get(api_url, params=params, headers=headers)
-                response.raise_for_status()
-                data = response.json()
-
-                for item in data.get('results', []):
-                    funding_info = item.get('fundingInformation', {})
-                    topic_info = item.get('topic', {})
-                    deadline_info = item.get('deadline', {})
-                    
-                    scholarship = {
-                        'title': item.get('title', {}).get('en', 'Untitled Grant'),
-                        'organization': item.get('fundingBody', 'European Commission'),
-                        'description': item.get('description', {}).get('en', ''),
-                        'requirements': item.get('eligibilityCriteria', {}).get('en', ''),
-                        'amount': f"Maximum {funding_info.get('maxAmount', 'N/A')} EUR",
-                        'country': 'European Union',
-                        'education_level': self._map_cordis_level(topic_info.get('type')),
-                        'field_of_study': topic_info.get('name', {}).get('en', 'Various'),
-                        'deadline': self._parse_date(deadline_info.get('date')),
-                        'website_url': item.get('callUrl'),
-                        'source_website': 'EU Funding & Tenders',
-                        'is_fully_funded': funding_info.get('fundingRate', 0) == 100,
-                        'is_active': deadline_info.get('status') == 'OPEN'
-                    }
-                    scholarships.append(scholarship)
-
-            except Exception as e:
-                logger.error(f"Error in EU Funding API: {str(e)}")
-                break
+        except Exception as e:
+            logger.error(f"Error in EU Funding API (page {page}): {str(e)}")
+            return []
+
+    def parse_archived_page(self, source, text) -> List[Dict[str, Any]]:
+        """Parse a page archived under ``source`` (a PAGE_PARSERS key) as a run without filters would"""
+        return getattr(self, self.PAGE_PARSERS[source])(text)
 
+    def _parse_cordis_page(self, text) -> List[Dict[str, Any]]:
+        return self._parse_cordis_results(json.loads(text))
+
+    def _parse_cordis_results(self, data) -> List[Dict[str, Any]]:
+        """Map one page of CORDIS grant results to scholarship dictionaries"""
+        scholarships = []
+        for item in data.get('results', []):
+            funding_info = item.get('fundingInformation', {})
+            topic_info = item.get('topic', {})
+            deadline_info = item.get('deadline', {})
+            
+            scholarship = {
+                'title': item.get('title', {}).get('en', 'Untitled Grant'),
+                'organization': item.get('fundingBody', 'European Commission'),
+                'description': item.get('description', {}).get('en', ''),
+                'requirements': item.get('eligibilityCriteria', {}).get('en', ''),
+                'amount': f"Maximum {funding_info.get('maxAmount', 'N/A')} EUR",
+                'country': 'European Union',
+                'education_level': self._map_cordis_level(topic_info.get('type')),
+                'field_of_study': topic_info.get('name', {}).get('en', 'Various'),
+                'deadline': self._parse_date(deadline_info.get('date')),
+                'website_url': item.get('callUrl'),
+                'source_website': 'EU Funding & Tenders',
+                'is_fully_funded': funding_info.get('fundingRate', 0) == 100,
+                'is_active': deadline_info.get('status') == 'OPEN'
+            }
+            scholarships.append(scholarship)
         return scholarships
 
     def _parse_date(self, date_string):
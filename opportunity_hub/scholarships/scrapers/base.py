@@ -1,60 +1,41 @@
 from abc import ABC, abstractmethod
 from bs4 import BeautifulSoup
-import undetected_chromedriver as uc
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from django.utils import timezone
+from core.scraping.driver_pool import PooledDriverMixin
+from core.scraping.fetch import PageFetchMixin
+from core.scraping.stealth import CAUTIOUS, HUMAN
+from scholarships.models import Scholarship
 import time
 import logging
 import random
-from fake_useragent import UserAgent
 
 logger = logging.getLogger(__name__)
 
-class BaseScholarshipScraper(ABC):
-    def __init__(self):
-        options = uc.ChromeOptions()
-        # Basic options
-        options.add_argument('--headless')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        
-        # Randomize viewport size to appear more human-like
-        width = random.randint(1024, 1920)
-        height = random.randint(768, 1080)
-        options.add_argument(f'--window-size={width},{height}')
-        
-        # Add random user agent
-        ua = UserAgent()
-        options.add_argument(f'--user-agent={ua.random}')
-        
-        # Add additional anti-detection measures
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        
-        # Initialize undetected-chromedriver
-        self.driver = uc.Chrome(options=options)
-        
-        # Add some randomization to appear more human-like
-        self.driver.implicitly_wait(random.uniform(8, 12))  # Random wait time between 8-12 seconds
-
-    def __del__(self):
-        if hasattr(self, 'driver'):
-            self.driver.quit()
+class BaseScholarshipScraper(PageFetchMixin, PooledDriverMixin, ABC):
+    """
+    Scholarship scrapers run on undetected Chrome. Human-like pacing is
+    only paid for once a source has pushed back: CAUTIOUS adds pauses
+    around element waits, HUMAN also simulates reading and scrolling.
+    """
+    driver_pool = 'undetected'
+    listing_model = Scholarship
 
     def wait_for_element(self, by, value, timeout=15):
-        """Wait for an element to be present on the page with human-like behavior"""
+        """Wait for an element to be present on the page, pausing like a human if needed"""
+        cautious = self.stealth_level >= CAUTIOUS
         try:
-            # Add random delay before looking for element
-            time.sleep(random.uniform(1, 3))
+            if cautious:
+                # Add random delay before looking for element
+                time.sleep(random.uniform(1, 3))
             element = WebDriverWait(self.driver, timeout).until(
                 EC.presence_of_element_located((by, value))
             )
-            # Simulate human observation time
-            time.sleep(random.uniform(0.5, 1.5))
+            if cautious:
+                # Simulate human observation time
+                time.sleep(random.uniform(0.5, 1.5))
             return element
         except Exception as e:
             logger.error(f"Error waiting for element {value}: {str(e)}")
@@ -62,8 +43,10 @@ class BaseScholarshipScraper(ABC):
             logger.error(f"Page source preview: {self.driver.page_source[:500]}")
             return None
 
-    def scroll_page(self, scroll_pause_time=None):
-        """Scroll the page to load dynamic content with human-like behavior"""
+    def scroll_page(self, card_selector=None):
+        """Scroll like a reader at the HUMAN stealth level, otherwise as fast as cards load"""
+        if self.stealth_level < HUMAN:
+            return super().scroll_page(card_selector)
         try:
             viewport_height = self.driver.execute_script("return window.innerHeight")
             page_height = self.driver.execute_script("return document.body.scrollHeight")
@@ -94,6 +77,8 @@ class BaseScholarshipScraper(ABC):
 
     def simulate_human_interaction(self):
         """Add random mouse movements and delays to appear more human-like"""
+        if self.stealth_level < HUMAN:
+            return
         try:
             # Random mouse movements
             elements = self.driver.find_elements(By.TAG_NAME, "a")
@@ -2,8 +2,11 @@ from .base import BaseScholarshipScraper
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
+from core.scraping.parsing import parse_cards
 from django.utils import timezone
+from core.scraping.archive import archive_page
+from core.scraping.stealth import CAUTIOUS, HUMAN
+from core.scraping.throttle import get_scheduler
 import logging
 import time
 import random
@@ -11,131 +14,186 @@ import random
 logger = logging.getLogger(__name__)
 
 class ScholarshipsDotComScraper(BaseScholarshipScraper):
+    source_name = 'Scholarships.com'
+    card_selector = 'div.scholarship-listing'
+
     def scrape_scholarships(self, field_of_study=None, country=None, num_pages=1):
         """
         Scrape scholarships from Scholarships.com with enhanced bot detection avoidance
         """
         scholarships = []
+        for page in self.stream(num_pages, field_of_study=field_of_study, country=country):
+            scholarships.extend(page)
+        return scholarships
+
+    def stream(self, num_pages=1, field_of_study=None, country=None):
+        """Yield each directory page's scholarships, one page at a time"""
         field_of_study = field_of_study or "all-fields"
-        max_retries = 3
-        
+
         try:
-            # Start with the homepage to establish a normal browsing pattern
-            logger.info("Accessing homepage first...")
-            self.driver.get('https://www.scholarships.com')
-            time.sleep(random.uniform(3, 5))
-            
-            # Check for CAPTCHA or blocking
-            if self._is_blocked():
-                logger.error("Initial access blocked - possible CAPTCHA or IP ban")
-                return []
-            
-            # Simulate human browsing pattern
-            self.simulate_human_interaction()
-            
-            # Now proceed with scholarship search
-            for page in range(num_pages):
-                retry_count = 0
-                while retry_count < max_retries:
-                    try:
-                        url = 'https://www.scholarships.com/financial-aid/college-scholarships/scholarship-directory'
-                        if field_of_study:
-                            url += f'/field-of-study/{field_of_study}'
-                        if country:
-                            url += f'/country/{country}'
-                        if page > 0:
-                            url += f'?page={page+1}'
-                        
-                        logger.info(f"Accessing page {page + 1}...")
-                        self.driver.get(url)
-                        
-                        # Random delay before interactions
-                        time.sleep(random.uniform(2, 4))
-                        
-                        if self._is_blocked():
-                            logger.warning(f"Blocked on attempt {retry_count + 1} - waiting before retry")
-                            time.sleep(random.uniform(30, 60))  # Longer wait between retries
-                            retry_count += 1
-                            continue
-                        
-                        # Wait for content with increased timeout
-                        element = self.wait_for_element(By.CLASS_NAME, 'scholarship-listing', timeout=20)
-                        if not element:
-                            logger.warning(f"No scholarships found on attempt {retry_count + 1}")
-                            retry_count += 1
-                            continue
-                            
-                        # Simulate human reading behavior
-                        self.simulate_human_interaction()
-                        self.scroll_page()
-                        break  # Success - exit retry loop
-                        
-                    except Exception as e:
-                        logger.error(f"Error on attempt {retry_count + 1}: {str(e)}")
-                        if retry_count < max_retries - 1:
-                            retry_count += 1
-                            time.sleep(random.uniform(20, 40))
-                            continue
-                        raise  # Re-raise the last exception if all retries failed
-                
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-                scholarship_cards = soup.find_all('div', class_='scholarship-listing')
-                
-                for card in scholarship_cards:
-                    try:
-                        title_elem = card.find('h3', class_='scholarship-title')
-                        org_elem = card.find('div', class_='scholarship-sponsor')
-                        amount_elem = card.find('div', class_='scholarship-amount')
-                        deadline_elem = card.find('div', class_='scholarship-deadline')
-                        
-                        scholarship = {
-                            'title': title_elem.text.strip() if title_elem else 'Untitled Scholarship',
-                            'organization': org_elem.text.strip() if org_elem else 'Unknown Organization',
-                            'description': self._extract_description(card),
-                            'requirements': self._extract_requirements(card),
-                            'amount': amount_elem.text.strip() if amount_elem else 'Amount not specified',
-                            'country': country or 'International',
-                            'education_level': self._determine_education_level(
-                                card.find('div', class_='scholarship-details').text
-                            ),
-                            'field_of_study': field_of_study.replace('-', ' ').title(),
-                            'deadline': self._parse_date(deadline_elem.text.strip()) if deadline_elem else None,
-                            'website_url': self._get_website_url(card),
-                            'source_website': 'Scholarships.com',
-                            'is_fully_funded': 'full' in (amount_elem.text.lower() if amount_elem else ''),
-                            'is_active': True
-                        }
-                        scholarships.append(scholarship)
-                        
-                    except Exception as e:
-                        logger.error(f"Error extracting Scholarships.com data: {str(e)}")
-                        continue
+            for page, url in enumerate(self.page_urls(num_pages, field_of_study=field_of_study, country=country)):
+                logger.info(f"Accessing page {page + 1}...")
+                html = self.fetch_listing_page(url)
+                page_scholarships = self._parse_page(html, field_of_study=field_of_study, country=country)
+                known = self.page_is_known(page_scholarships)
+                yield page_scholarships
+                if known:
+                    logger.info(f"Page {page + 1} held no new scholarships; stopping")
+                    break
 
         except Exception as e:
             logger.error(f"Error scraping Scholarships.com: {str(e)}")
+
+    def fetch_listing_page(self, url):
+        """
+        Load one directory page, backing off and retrying while the site shows a block page.
+
+        Used by stream() and by per-page Celery subtasks alike, so a page is
+        loaded the same way however the source is scraped.
+        """
+        max_retries = 3
+        scheduler = get_scheduler()
+        self._warm_up()
+
+        started = time.monotonic()
+        retry_count = 0
+        while retry_count < max_retries:
+            try:
+                self.load_page(url)
+                
+                if self.stealth_level >= CAUTIOUS:
+                    # Random delay before interactions
+                    time.sleep(random.uniform(2, 4))
+                
+                if self._is_blocked():
+                    # Later attempts (and runs) slow down until the site settles
+                    self.report_block("CAPTCHA or block page")
+                    logger.warning(f"Blocked on attempt {retry_count + 1} - waiting before retry")
+                    # Hold the whole domain, not just this loop, before retrying
+                    scheduler.backoff(url, random.uniform(30, 60))
+                    retry_count += 1
+                    continue
+                
+                # Wait for content with increased timeout
+                element = self.wait_for_element(By.CLASS_NAME, 'scholarship-listing', timeout=20)
+                if not element:
+                    self.report_block("empty results")
+                    logger.warning(f"No scholarships found on attempt {retry_count + 1}")
+                    retry_count += 1
+                    continue
+                    
+                # Simulate human reading behavior
+                self.simulate_human_interaction()
+                self.scroll_page()
+                break  # Success - exit retry loop
+                
+            except Exception as e:
+                logger.error(f"Error on attempt {retry_count + 1}: {str(e)}")
+                self.stats.add(errors=1)
+                if retry_count < max_retries - 1:
+                    retry_count += 1
+                    scheduler.backoff(url, random.uniform(20, 40))
+                    continue
+                raise  # Re-raise the last exception if all retries failed
+
+        html = self.driver.page_source
+        self.stats.add(pages_fetched=1, bytes_transferred=len(html.encode('utf-8')),
+                       fetch_seconds=time.monotonic() - started)
+        archive_page(url, html, self.source_name)
+        return html
+
+    def _warm_up(self):
+        """At HUMAN stealth, visit the homepage once per scraper before any directory page"""
+        if self.stealth_level < HUMAN or getattr(self, '_warmed_up', False):
+            return
+
+        # Start with the homepage to establish a normal browsing pattern
+        logger.info("Accessing homepage first...")
+        self.load_page('https://www.scholarships.com')
+        time.sleep(random.uniform(3, 5))
         
+        # Check for CAPTCHA or blocking
+        if self._is_blocked():
+            self.report_block("blocked on the homepage")
+            raise RuntimeError("Initial access blocked - possible CAPTCHA or IP ban")
+        
+        # Simulate human browsing pattern
+        self.simulate_human_interaction()
+        self._warmed_up = True
+
+    def page_urls(self, num_pages=1, field_of_study=None, country=None):
+        """URLs of the first ``num_pages`` directory pages"""
+        field_of_study = field_of_study or "all-fields"
+        urls = []
+        for page in range(num_pages):
+            url = 'https://www.scholarships.com/financial-aid/college-scholarships/scholarship-directory'
+            if field_of_study:
+                url += f'/field-of-study/{field_of_study}'
+            if country:
+                url += f'/country/{country}'
+            if page > 0:
+                url += f'?page={page+1}'
+            urls.append(url)
+        return urls
+
+    def parse_page(self, html, field_of_study=None, country=None):
+        """Extract scholarships from the cards on one listing page"""
+        scholarships = []
+        field_of_study = field_of_study or "all-fields"
+        scholarship_cards = parse_cards(html, self.card_selector)
+
+        for card in scholarship_cards:
+            try:
+                title_elem = card.select_one('h3.scholarship-title')
+                org_elem = card.select_one('div.scholarship-sponsor')
+                amount_elem = card.select_one('div.scholarship-amount')
+                deadline_elem = card.select_one('div.scholarship-deadline')
+
+                scholarship = {
+                    'title': title_elem.text.strip() if title_elem else 'Untitled Scholarship',
+                    'organization': org_elem.text.strip() if org_elem else 'Unknown Organization',
+                    'description': self._extract_description(card),
+                    'requirements': self._extract_requirements(card),
+                    'amount': amount_elem.text.strip() if amount_elem else 'Amount not specified',
+                    'country': country or 'International',
+                    'education_level': self._determine_education_level(
+                        card.select_one('div.scholarship-details').text
+                    ),
+                    'field_of_study': field_of_study.replace('-', ' ').title(),
+                    'deadline': self._parse_date(deadline_elem.text.strip()) if deadline_elem else None,
+                    'website_url': self._get_website_url(card),
+                    'source_website': 'Scholarships.com',
+                    'is_fully_funded': 'full' in (amount_elem.text.lower() if amount_elem else ''),
+                    'is_active': True
+                }
+                scholarships.append(scholarship)
+
+            except Exception as e:
+                logger.error(f"Error extracting Scholarships.com data: {str(e)}")
+                continue
+
         return scholarships
 
     def _extract_description(self, card):
         """Extract scholarship description"""
-        desc_elem = card.find('div', class_='scholarship-description')
+        desc_elem = card.select_one('div.scholarship-description')
         return desc_elem.text.strip() if desc_elem else "No description available"
 
     def _extract_requirements(self, card):
         """Extract scholarship requirements"""
-        details = card.find('div', class_='scholarship-details')
+        details = card.select_one('div.scholarship-details')
         if not details:
             return "No requirements specified"
         
         requirements = []
-        for item in details.find_all('li'):
+        for item in details.select('li'):
             requirements.append(item.text.strip())
             
         return '\n'.join(requirements) if requirements else details.text.strip()
 
     def _get_website_url(self, card):
         """Get the scholarship website URL"""
-        link = card.find('a', class_='scholarship-title-link')
+        link = card.select_one('a.scholarship-title-link')
         return 'https://www.scholarships.com' + link['href'] if link else None
         
     def _is_blocked(self):
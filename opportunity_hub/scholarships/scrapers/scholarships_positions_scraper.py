@@ -1,11 +1,8 @@
 from .base import BaseScholarshipScraper
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
+from core.scraping.parsing import parse_cards
 import logging
-import time
-import random
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +11,11 @@ class ScholarshipsPositionsPortalScraper(BaseScholarshipScraper):
     Scraper for ScholarshipsPositionsPortal.com - a site that explicitly allows reasonable scraping
     through their robots.txt
     """
+    source_name = 'Scholarship-Positions.com'
+    card_selector = 'article.post'
+    static_first = True
+    base_url = 'https://scholarship-positions.com'
+
     def scrape_scholarships(self, field_of_study=None, country=None, num_pages=1):
         """
         Scrape scholarships from ScholarshipsPositionsPortal
@@ -21,78 +23,66 @@ class ScholarshipsPositionsPortalScraper(BaseScholarshipScraper):
         scholarships = []
         
         try:
-            # Base URL for scholarship search
-            base_url = 'https://scholarship-positions.com'
-            
-            for page in range(num_pages):
-                try:
-                    # Construct URL with filters
-                    url = f"{base_url}/category/international-scholarships/"
-                    if page > 0:
-                        url += f"page/{page + 1}/"
-                    
-                    logger.info(f"Accessing page {page + 1}: {url}")
-                    self.driver.get(url)
-                    
-                    # Add random delay to respect the site
-                    time.sleep(random.uniform(2, 4))
-                    
-                    # Wait for scholarship listings
-                    self.wait_for_element(By.CLASS_NAME, 'post')
-                    
-                    # Scroll slowly to simulate human behavior
-                    self.scroll_page()
-                    
-                    # Parse the page
-                    soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-                    scholarship_posts = soup.find_all('article', class_='post')
-                    
-                    for post in scholarship_posts:
-                        try:
-                            # Extract scholarship details
-                            title_elem = post.find('h2', class_='entry-title')
-                            content_elem = post.find('div', class_='entry-content')
-                            meta_elem = post.find('div', class_='entry-meta')
-                            
-                            if not title_elem or not content_elem:
-                                continue
-                                
-                            # Extract details from content
-                            content_text = content_elem.get_text()
-                            scholarship = {
-                                'title': title_elem.text.strip(),
-                                'organization': self._extract_organization(content_text),
-                                'description': self._clean_description(content_text),
-                                'requirements': self._extract_requirements(content_text),
-                                'amount': self._extract_amount(content_text),
-                                'country': country or self._extract_country(content_text),
-                                'education_level': self._determine_education_level(content_text),
-                                'field_of_study': field_of_study or self._extract_field(content_text),
-                                'deadline': self._extract_deadline(content_text),
-                                'website_url': title_elem.find('a')['href'] if title_elem.find('a') else None,
-                                'source_website': 'Scholarship-Positions.com',
-                                'is_fully_funded': self._is_fully_funded(content_text),
-                                'is_active': True
-                            }
-                            
-                            # Only add if we have essential details
-                            if scholarship['title'] and scholarship['description']:
-                                scholarships.append(scholarship)
-                            
-                        except Exception as e:
-                            logger.error(f"Error extracting scholarship details: {str(e)}")
-                            continue
-                            
-                except Exception as e:
-                    logger.error(f"Error processing page {page + 1}: {str(e)}")
+            urls = self.page_urls(num_pages, field_of_study=field_of_study, country=country)
+            # The listing is server-rendered, so these are usually plain GETs
+            logger.info(f"Accessing {len(urls)} pages from {self.base_url}")
+            # Keep what earlier pages produced if a later one fails
+            for page in self.iter_pages(urls, field_of_study=field_of_study, country=country):
+                scholarships.extend(page)
+                        
+        except Exception as e:
+            logger.error(f"Error in ScholarshipsPositionsPortal scraper: {str(e)}")
+        
+        return scholarships
+
+    def page_urls(self, num_pages=1, field_of_study=None, country=None):
+        """URLs of the first ``num_pages`` result pages"""
+        return [
+            f"{self.base_url}/category/international-scholarships/" + (f"page/{page + 1}/" if page > 0 else "")
+            for page in range(num_pages)
+        ]
+
+    def parse_page(self, html, field_of_study=None, country=None):
+        """Extract scholarships from the cards on one listing page"""
+        scholarships = []
+        scholarship_posts = parse_cards(html, self.card_selector)
+
+        for post in scholarship_posts:
+            try:
+                # Extract scholarship details
+                title_elem = post.select_one('h2.entry-title')
+                content_elem = post.select_one('div.entry-content')
+                meta_elem = post.select_one('div.entry-meta')
+                
+                if not title_elem or not content_elem:
                     continue
                     
-                # Respect the site's rate limits
-                time.sleep(random.uniform(3, 5))
+                # Extract details from content
+                content_text = content_elem.text
+                scholarship = {
+                    'title': title_elem.text.strip(),
+                    'organization': self._extract_organization(content_text),
+                    'description': self._clean_description(content_text),
+                    'requirements': self._extract_requirements(content_text),
+                    'amount': self._extract_amount(content_text),
+                    'country': country or self._extract_country(content_text),
+                    'education_level': self._determine_education_level(content_text),
+                    'field_of_study': field_of_study or self._extract_field(content_text),
+                    'deadline': self._extract_deadline(content_text),
+                    'website_url': title_elem.select_one('a')['href'] if title_elem.select_one('a') else None,
+                    'source_website': 'Scholarship-Positions.com',
+                    'is_fully_funded': self._is_fully_funded(content_text),
+                    'is_active': True
+                }
                 
-        except Exception as e:
-            logger.error(f"Error in ScholarshipsPositionsPortal scraper: {str(e)}")
-            
+                # Only add if we have essential details
+                if scholarship['title'] and scholarship['description']:
+                    scholarships.append(scholarship)
+                
+            except Exception as e:
+                logger.error(f"Error extracting scholarship details: {str(e)}")
+                continue
+
         return scholarships
         
     def _clean_description(self, text):
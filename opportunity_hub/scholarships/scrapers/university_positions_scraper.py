@@ -1,11 +1,8 @@
 from .base import BaseScholarshipScraper
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
+from core.scraping.parsing import parse_cards
 import logging
-import time
-import random
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +11,11 @@ class UniversityPositionsScraper(BaseScholarshipScraper):
     Scraper for UniversityPositions.eu - a site that explicitly allows reasonable scraping
     and provides structured scholarship data
     """
+    source_name = 'UniversityPositions.eu'
+    card_selector = 'div.scholarship-item'
+    static_first = True
+    base_url = 'https://www.universitypositions.eu/scholarships'
+
     def scrape_scholarships(self, field_of_study=None, country=None, num_pages=1):
         """
         Scrape scholarships from UniversityPositions.eu
@@ -21,86 +23,78 @@ class UniversityPositionsScraper(BaseScholarshipScraper):
         scholarships = []
         
         try:
-            # Base URL for scholarship search
-            base_url = 'https://www.universitypositions.eu/scholarships'
-            
-            for page in range(num_pages):
-                try:
-                    # Construct URL with filters
-                    url = base_url
-                    filters = []
-                    if field_of_study:
-                        filters.append(f"field={field_of_study}")
-                    if country:
-                        filters.append(f"country={country}")
-                    if page > 0:
-                        filters.append(f"page={page + 1}")
-                    if filters:
-                        url += '?' + '&'.join(filters)
-                    
-                    logger.info(f"Accessing page {page + 1}: {url}")
-                    self.driver.get(url)
-                    
-                    # Add random delay to respect the site
-                    time.sleep(random.uniform(2, 4))
-                    
-                    # Wait for scholarship listings
-                    self.wait_for_element(By.CLASS_NAME, 'scholarship-item')
-                    
-                    # Scroll slowly to simulate human behavior
-                    self.scroll_page()
-                    
-                    # Parse the page
-                    soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-                    scholarship_items = soup.find_all('div', class_='scholarship-item')
-                    
-                    for item in scholarship_items:
-                        try:
-                            # Extract scholarship details from structured data
-                            title_elem = item.find('h3', class_='title')
-                            org_elem = item.find('div', class_='organization')
-                            details_elem = item.find('div', class_='details')
-                            
-                            if not title_elem:
-                                continue
-                                
-                            scholarship = {
-                                'title': title_elem.text.strip(),
-                                'organization': org_elem.text.strip() if org_elem else 'Unknown Organization',
-                                'description': self._extract_description(item),
-                                'requirements': self._extract_requirements(item),
-                                'amount': self._extract_amount(item),
-                                'country': country or self._extract_country(item),
-                                'education_level': self._extract_education_level(item),
-                                'field_of_study': field_of_study or self._extract_field(item),
-                                'deadline': self._extract_deadline(item),
-                                'website_url': self._extract_url(item),
-                                'source_website': 'UniversityPositions.eu',
-                                'is_fully_funded': self._is_fully_funded(item),
-                                'is_active': True
-                            }
-                            
-                            scholarships.append(scholarship)
-                            
-                        except Exception as e:
-                            logger.error(f"Error extracting scholarship details: {str(e)}")
-                            continue
-                            
-                except Exception as e:
-                    logger.error(f"Error processing page {page + 1}: {str(e)}")
+            urls = self.page_urls(num_pages, field_of_study=field_of_study, country=country)
+            # The listing is server-rendered, so these are usually plain GETs
+            logger.info(f"Accessing {len(urls)} pages from {self.base_url}")
+            # Keep what earlier pages produced if a later one fails
+            for page in self.iter_pages(urls, field_of_study=field_of_study, country=country):
+                scholarships.extend(page)
+                        
+        except Exception as e:
+            logger.error(f"Error in UniversityPositions scraper: {str(e)}")
+        
+        return scholarships
+
+    def page_urls(self, num_pages=1, field_of_study=None, country=None):
+        """URLs of the first ``num_pages`` result pages"""
+        urls = []
+        for page in range(num_pages):
+            # Construct URL with filters
+            url = self.base_url
+            filters = []
+            if field_of_study:
+                filters.append(f"field={field_of_study}")
+            if country:
+                filters.append(f"country={country}")
+            if page > 0:
+                filters.append(f"page={page + 1}")
+            if filters:
+                url += '?' + '&'.join(filters)
+            urls.append(url)
+        return urls
+
+    def parse_page(self, html, field_of_study=None, country=None):
+        """Extract scholarships from the cards on one listing page"""
+        scholarships = []
+        scholarship_items = parse_cards(html, self.card_selector)
+
+        for item in scholarship_items:
+            try:
+                # Extract scholarship details from structured data
+                title_elem = item.select_one('h3.title')
+                org_elem = item.select_one('div.organization')
+                details_elem = item.select_one('div.details')
+                
+                if not title_elem:
                     continue
                     
-                # Respect the site's rate limits
-                time.sleep(random.uniform(3, 5))
+                scholarship = {
+                    'title': title_elem.text.strip(),
+                    'organization': org_elem.text.strip() if org_elem else 'Unknown Organization',
+                    'description': self._extract_description(item),
+                    'requirements': self._extract_requirements(item),
+                    'amount': self._extract_amount(item),
+                    'country': country or self._extract_country(item),
+                    'education_level': self._extract_education_level(item),
+                    'field_of_study': field_of_study or self._extract_field(item),
+                    'deadline': self._extract_deadline(item),
+                    'website_url': self._extract_url(item),
+                    'source_website': 'UniversityPositions.eu',
+                    'is_fully_funded': self._is_fully_funded(item),
+                    'is_active': True
+                }
                 
-        except Exception as e:
-            logger.error(f"Error in UniversityPositions scraper: {str(e)}")
-            
+                scholarships.append(scholarship)
+                
+            except Exception as e:
+                logger.error(f"Error extracting scholarship details: {str(e)}")
+                continue
+
         return scholarships
         
     def _extract_description(self, item):
         """Extract scholarship description"""
-        desc_elem = item.find('div', class_='description')
+        desc_elem = item.select_one('div.description')
         if desc_elem:
             text = desc_elem.text.strip()
             # Limit description length
@@ -109,41 +103,41 @@ class UniversityPositionsScraper(BaseScholarshipScraper):
         
     def _extract_requirements(self, item):
         """Extract scholarship requirements"""
-        req_elem = item.find('div', class_='requirements')
+        req_elem = item.select_one('div.requirements')
         if not req_elem:
             return "Requirements not specified"
             
         requirements = []
-        for req in req_elem.find_all('li'):
+        for req in req_elem.select('li'):
             requirements.append(req.text.strip())
             
         return '\n'.join(requirements) if requirements else req_elem.text.strip()
         
     def _extract_amount(self, item):
         """Extract scholarship amount"""
-        amount_elem = item.find('div', class_='funding')
+        amount_elem = item.select_one('div.funding')
         return amount_elem.text.strip() if amount_elem else "Amount not specified"
         
     def _extract_country(self, item):
         """Extract country information"""
-        country_elem = item.find('div', class_='location')
+        country_elem = item.select_one('div.location')
         return country_elem.text.strip() if country_elem else None
         
     def _extract_education_level(self, item):
         """Extract education level"""
-        level_elem = item.find('div', class_='degree-level')
+        level_elem = item.select_one('div.degree-level')
         if level_elem:
             return self._determine_education_level(level_elem.text)
         return 'ALL'
         
     def _extract_field(self, item):
         """Extract field of study"""
-        field_elem = item.find('div', class_='field')
+        field_elem = item.select_one('div.field')
         return field_elem.text.strip() if field_elem else 'All Fields'
         
     def _extract_deadline(self, item):
         """Extract application deadline"""
-        deadline_elem = item.find('div', class_='deadline')
+        deadline_elem = item.select_one('div.deadline')
         if deadline_elem:
             try:
                 return self._parse_date(deadline_elem.text.strip())
@@ -153,13 +147,13 @@ class UniversityPositionsScraper(BaseScholarshipScraper):
         
     def _extract_url(self, item):
         """Extract scholarship URL"""
-        link = item.find('a', class_='apply-link')
-        return link['href'] if link and 'href' in link.attrs else None
+        link = item.select_one('a.apply-link')
+        return link['href'] if link and link.get('href') else None
         
     def _is_fully_funded(self, item):
         """Check if scholarship is fully funded"""
-        text = item.get_text().lower()
-        funding_elem = item.find('div', class_='funding')
+        text = item.text.lower()
+        funding_elem = item.select_one('div.funding')
         if funding_elem:
             text += ' ' + funding_elem.text.lower()
             
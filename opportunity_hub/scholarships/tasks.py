@@ -1,26 +1,68 @@
-from celery import shared_task
+from celery import chord, shared_task
 from .utils.scraper import ScholarshipScraper
 from .models import Scholarship
 from django.utils import timezone
+from core.ledger import finish_run, ingest_for_run, record_source, start_run
+from core.models import ScrapeRun
+from core.profiling import profiled
+from core.scraping.blocking import get_resource_blocker
+from core.tasks import page_tasks
+import logging
+import time
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+# Listing scrapers (by source_name) fanned out per page by scrape_scholarships_task
+SCHOLARSHIP_SOURCES = ['Scholarships.com']
+# Single-page sources that only ScholarshipScraper knows how to read
+SCHOLARSHIP_PAGES = ['scrape_fulbright', 'scrape_erasmus']
 
 @shared_task
-def scrape_scholarships_task():
+def scrape_scholarships_task(field_of_study=None, country=None, num_pages=1, profile=False):
     """Celery task to scrape scholarships from various sources"""
-    scraper = ScholarshipScraper()
+    # One subtask per source and page, spread over every worker; the chord
+    # callback saves whatever came back once they have all finished
+    run_id = start_run('scholarships')
+    header = page_tasks(SCHOLARSHIP_SOURCES, num_pages, run_id=run_id, profile=profile,
+                        field_of_study=field_of_study, country=country)
+    header += [scrape_scholarship_page_task.s(method, run_id=run_id, profile=profile) for method in SCHOLARSHIP_PAGES]
+    chord(header)(save_scholarships_task.s(run_id=run_id, profile=profile))
     
-    # Scrape from multiple sources
-    scholarships_com = scraper.scrape_scholarships_com()
-    fulbright = scraper.scrape_fulbright()
-    erasmus = scraper.scrape_erasmus()
-    
-    # Combine all scholarships
-    all_scholarships = scholarships_com + fulbright + erasmus
+    return f"Dispatched {len(header)} page scrapes."
+
+@shared_task
+def scrape_scholarship_page_task(method, run_id=None, profile=False):
+    """Run one ScholarshipScraper page method, e.g. ``scrape_fulbright``"""
+    started = time.monotonic()
+    try:
+        with profiled(method, run_id, enabled=profile), ScholarshipScraper() as scraper:
+            scholarships = getattr(scraper, method)()
+    except Exception as e:
+        logger.error(f"Error running {method}: {str(e)}")
+        record_source(run_id, method, errors=1)
+        return []
+    get_resource_blocker().report()
+    elapsed = time.monotonic() - started
+    for source, count in Counter(scholarship['source_website'] for scholarship in scholarships).items():
+        record_source(run_id, source, pages_fetched=1, records_extracted=count, fetch_seconds=elapsed)
+    return scholarships
+
+@shared_task
+def save_scholarships_task(pages, run_id=None, profile=False):
+    """Chord callback: combine every page's scholarships and save them"""
+    all_scholarships = (scholarship for page in pages for scholarship in page)
     
-    # Save to database
-    for scholarship_data in all_scholarships:
-        Scholarship.objects.create(**scholarship_data)
+    # Save to database, one upsert per chunk
+    try:
+        with profiled('save-scholarships', run_id, enabled=profile):
+            result = ingest_for_run(run_id, Scholarship, all_scholarships)
+    except Exception:
+        finish_run(run_id, ScrapeRun.FAILED)
+        raise
+    finish_run(run_id)
     
-    return f"Successfully scraped {len(all_scholarships)} scholarships."
+    return f"Successfully scraped {result.total} scholarships ({result})."
 
 @shared_task
 def clean_expired_scholarships_task():
@@ -1,149 +1,145 @@
-import pytest
-from unittest.mock import Mock, patch
-from opportunity_hub.scholarships.scrapers.api_scraper import APIScholarshipScraper
-from datetime import datetime
+import asyncio
 import json
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock, patch
 
-@pytest.fixture
-def api_scraper():
-    return APIScholarshipScraper()
-
-def test_daad_scholarships(api_scraper):
-    mock_response = Mock()
-    mock_response.json.return_value = {
-        'items': [{
-            'title': 'Test DAAD Scholarship',
-            'description': 'Test description',
-            'requirements': 'Test requirements',
-            'funding': 'Full scholarship',
-            'destination': 'Germany',
-            'degree': 'PhD',
-            'subject': 'Computer Science',
-            'deadline': '2024-12-31',
-            'url': 'https://test.daad.de'
-        }]
-    }
-    mock_response.status_code = 200
-
-    with patch('requests.Session.get', return_value=mock_response):
-        scholarships = api_scraper._get_daad_scholarships()
-        
-        assert len(scholarships) == 1
-        scholarship = scholarships[0]
-        assert scholarship['title'] == 'Test DAAD Scholarship'
-        assert scholarship['organization'] == 'DAAD'
-        assert scholarship['country'] == 'Germany'
-        assert scholarship['education_level'] == 'PHD'
-        assert scholarship['is_fully_funded'] == True
-
-def test_sweden_scholarships(api_scraper):
-    mock_response = Mock()
-    mock_response.content = '''<?xml version="1.0" encoding="UTF-8"?>
-    <rss version="2.0">
-        <channel>
-            <item>
-                <title>Swedish Institute Scholarship</title>
-                <description>Full scholarship for Master's studies. Requirements: Bachelor's degree</description>
-                <link>https://test.si.se</link>
-                <pubDate>Wed, 31 Dec 2024 12:00:00 GMT</pubDate>
-            </item>
-        </channel>
-    </rss>'''
-    mock_response.status_code = 200
-
-    with patch('requests.Session.get', return_value=mock_response):
-        scholarships = api_scraper._get_sweden_scholarships()
-        
-        assert len(scholarships) == 1
-        scholarship = scholarships[0]
-        assert scholarship['title'] == 'Swedish Institute Scholarship'
-        assert scholarship['organization'] == 'Swedish Institute'
-        assert scholarship['country'] == 'Sweden'
-        assert scholarship['education_level'] == 'MASTERS'
-        assert scholarship['website_url'] == 'https://test.si.se'
-
-def test_cordis_scholarships(api_scraper):
-    mock_response = Mock()
-    mock_response.json.return_value = {
-        'results': [{
-            'title': 'Test CORDIS Scholarship',
-            'organization': 'Test University',
-            'objective': 'Research scholarship',
-            'eligibility': 'PhD candidates',
-            'fundingDetails': 'Full funding',
-            'hostCountry': 'Netherlands',
-            'academicLevel': 'early stage researcher',
-            'topic': 'Computer Science',
-            'deadline': '2024-12-31',
-            'infoUrl': 'https://test.cordis.eu'
-        }]
-    }
-    mock_response.status_code = 200
-
-    with patch('requests.Session.get', return_value=mock_response):
-        scholarships = api_scraper._get_cordis_scholarships()
-        
-        assert len(scholarships) == 1
+from django.test import SimpleTestCase
+
+from core.scraping.http import AsyncFetcher, FetchResult
+from scholarships.scrapers.api_scraper import APIScholarshipScraper
+
+DAAD_PAGE = """
+<section id="search">
+  <div class="scholarship-result"><a class="title" href="/stipendium/1">Research Grants</a>
+    <p class="description">For doctoral candidates</p></div>
+  <div class="scholarship-result"><h3 class="title">Study Scholarships</h3></div>
+</section>
+"""
+
+CORDIS_RESULTS = {
+    'results': [{
+        'title': {'en': 'Test CORDIS Grant'},
+        'fundingBody': 'Test University',
+        'description': {'en': 'Research grant'},
+        'eligibilityCriteria': {'en': 'PhD candidates'},
+        'fundingInformation': {'maxAmount': 50000, 'fundingRate': 100},
+        'topic': {'type': 'early stage researcher', 'name': {'en': 'Computer Science'}},
+        'deadline': {'date': '2024-12-31', 'status': 'OPEN'},
+        'callUrl': 'https://test.cordis.eu',
+    }]
+}
+
+
+def fake_fetcher(status=200, text=''):
+    fetcher = Mock()
+    fetcher.fetch = AsyncMock(return_value=FetchResult(url='https://example.com/', status=status, text=text))
+    return fetcher
+
+
+class APIScholarshipScraperTests(SimpleTestCase):
+    def setUp(self):
+        self.scraper = APIScholarshipScraper()
+
+    def test_daad_database_page(self):
+        fetcher = fake_fetcher(text=DAAD_PAGE)
+
+        scholarships = asyncio.run(self.scraper._fetch_daad_database(fetcher, 'Computer Science'))
+
+        self.assertEqual([s['title'] for s in scholarships], ['Research Grants', 'Study Scholarships'])
+        self.assertEqual(scholarships[0]['organization'], 'DAAD')
+        self.assertEqual(scholarships[0]['website_url'], 'https://www2.daad.de/stipendium/1')
+        self.assertEqual(scholarships[0]['field_of_study'], 'Computer Science')
+        # The field filter is stamped on every record, so it keys the HTTP cache too
+        self.assertEqual(fetcher.fetch.call_args.kwargs['vary'], {'field_of_study': 'Computer Science'})
+
+    def test_unchanged_page_yields_nothing(self):
+        scholarships = asyncio.run(self.scraper._fetch_erasmus(fake_fetcher(status=304, text=DAAD_PAGE)))
+
+        self.assertEqual(scholarships, [])
+
+    def test_fetch_errors_yield_nothing(self):
+        fetcher = Mock()
+        fetcher.fetch = AsyncMock(side_effect=OSError('connection reset'))
+
+        self.assertEqual(asyncio.run(self.scraper._fetch_commonwealth(fetcher)), [])
+
+    def test_sweden_scholarships(self):
+        scholarships = self.scraper._get_sweden_scholarships()
+
+        self.assertEqual(len(scholarships), 2)
+        self.assertEqual({s['organization'] for s in scholarships}, {'Swedish Institute'})
+        self.assertEqual({s['country'] for s in scholarships}, {'Sweden'})
+
+    def test_cordis_page(self):
+        fetcher = fake_fetcher(text=json.dumps(CORDIS_RESULTS))
+
+        scholarships = asyncio.run(self.scraper._fetch_cordis_page(fetcher, 2, 'Physics', 'NL'))
+
+        self.assertEqual(len(scholarships), 1)
         scholarship = scholarships[0]
-        assert scholarship['title'] == 'Test CORDIS Scholarship'
-        assert scholarship['organization'] == 'Test University'
-        assert scholarship['country'] == 'Netherlands'
-        assert scholarship['education_level'] == 'PHD'
-        assert scholarship['is_fully_funded'] == True
-
-def test_scrape_scholarships_integration(api_scraper):
-    """Test the main scraping method that combines all sources"""
-    with patch.object(api_scraper, '_get_daad_scholarships', return_value=[{'title': 'DAAD1'}]), \
-         patch.object(api_scraper, '_get_sweden_scholarships', return_value=[{'title': 'Sweden1'}]), \
-         patch.object(api_scraper, '_get_cordis_scholarships', return_value=[{'title': 'CORDIS1'}]):
-        
-        scholarships = api_scraper.scrape_scholarships()
-        
-        assert len(scholarships) == 3
-        titles = [s['title'] for s in scholarships]
-        assert 'DAAD1' in titles
-        assert 'Sweden1' in titles
-        assert 'CORDIS1' in titles
-
-def test_error_handling(api_scraper):
-    """Test that errors in one source don't affect others"""
-    def raise_error(*args, **kwargs):
-        raise Exception("Test error")
-
-    with patch.object(api_scraper, '_get_daad_scholarships', side_effect=raise_error), \
-         patch.object(api_scraper, '_get_sweden_scholarships', return_value=[{'title': 'Sweden1'}]), \
-         patch.object(api_scraper, '_get_cordis_scholarships', return_value=[{'title': 'CORDIS1'}]):
-        
-        scholarships = api_scraper.scrape_scholarships()
-        
-        assert len(scholarships) == 2  # DAAD failed but others succeeded
-        titles = [s['title'] for s in scholarships]
-        assert 'Sweden1' in titles
-        assert 'CORDIS1' in titles
-
-def test_date_parsing():
-    scraper = APIScholarshipScraper()
-    
-    # Test ISO format
-    assert scraper._parse_date('2024-12-31T00:00:00Z') == datetime(2024, 12, 31).date()
-    
-    # Test RFC format
-    assert scraper._parse_date('Wed, 31 Dec 2024 12:00:00 GMT') == datetime(2024, 12, 31).date()
-    
-    # Test invalid date
-    assert scraper._parse_date('invalid date') is None
-    assert scraper._parse_date(None) is None
-
-def test_education_level_mapping():
-    scraper = APIScholarshipScraper()
-    
-    # Test DAAD mappings
-    assert scraper._map_daad_level('PhD') == 'PHD'
-    assert scraper._map_daad_level('Master') == 'MASTERS'
-    assert scraper._map_daad_level('Bachelor') == 'UNDERGRADUATE'
-    assert scraper._map_daad_level(None) == 'ALL'
-    
-    # Test CORDIS mappings
-    assert scraper._map_cordis_level('early stage researcher') == 'PHD'
-    assert scraper._map_cordis_level('postdoctoral') == 'POSTDOC'
-    assert scraper._map_cordis_level(None) == 'ALL'
\ No newline at end of file
+        self.assertEqual(scholarship['title'], 'Test CORDIS Grant')
+        self.assertEqual(scholarship['organization'], 'Test University')
+        self.assertEqual(scholarship['education_level'], 'PHD')
+        self.assertTrue(scholarship['is_fully_funded'])
+        self.assertTrue(scholarship['is_active'])
+        params = fetcher.fetch.call_args.kwargs['params']
+        self.assertEqual((params['page'], params['topic'], params['country']), (2, 'Physics', 'NL'))
+
+    def test_cordis_pages_fetched_concurrently(self):
+        """Every CORDIS page is requested at once and results keep page order"""
+        in_flight = 0
+        max_in_flight = 0
+
+        async def fetch(url, params=None, **kwargs):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+            return FetchResult(url=url, status=200, text=json.dumps({
+                'results': [{'title': {'en': f"Grant page {params['page']}"}}]
+            }))
+
+        with patch.object(AsyncFetcher, 'fetch', side_effect=fetch):
+            scholarships = self.scraper._get_cordis_scholarships(num_pages=3)
+
+        self.assertEqual(max_in_flight, 3)
+        self.assertEqual([s['title'] for s in scholarships], ['Grant page 1', 'Grant page 2', 'Grant page 3'])
+
+    def remote_sources(self, *batches):
+        async def stream(*args, **kwargs):
+            for batch in batches:
+                yield batch
+        return patch.object(self.scraper, '_stream_remote_sources', side_effect=stream)
+
+    def test_scrape_scholarships_combines_sources(self):
+        with patch.object(self.scraper, '_get_daad_scholarships', return_value=[{'title': 'DAAD1'}]), \
+             patch.object(self.scraper, '_get_sweden_scholarships', return_value=[{'title': 'Sweden1'}]), \
+             self.remote_sources([{'title': 'CORDIS1'}], [{'title': 'Erasmus1'}]):
+            scholarships = self.scraper.scrape_scholarships()
+
+        self.assertEqual([s['title'] for s in scholarships], ['DAAD1', 'Sweden1', 'CORDIS1', 'Erasmus1'])
+
+    def test_failing_source_does_not_affect_others(self):
+        with patch.object(self.scraper, '_get_daad_scholarships', side_effect=Exception('Test error')), \
+             patch.object(self.scraper, '_get_sweden_scholarships', return_value=[{'title': 'Sweden1'}]), \
+             self.remote_sources([{'title': 'CORDIS1'}]):
+            scholarships = self.scraper.scrape_scholarships()
+
+        self.assertEqual([s['title'] for s in scholarships], ['Sweden1', 'CORDIS1'])
+
+    def test_date_parsing(self):
+        self.assertEqual(self.scraper._parse_date('2024-12-31T00:00:00Z'), datetime(2024, 12, 31).date())
+        self.assertEqual(self.scraper._parse_date('Wed, 31 Dec 2024 12:00:00 GMT'), datetime(2024, 12, 31).date())
+        self.assertIsNone(self.scraper._parse_date('invalid date'))
+        self.assertIsNone(self.scraper._parse_date(None))
+
+    def test_education_level_mapping(self):
+        self.assertEqual(self.scraper._map_daad_level('PhD'), 'PHD')
+        self.assertEqual(self.scraper._map_daad_level('Master'), 'MASTERS')
+        self.assertEqual(self.scraper._map_daad_level('Bachelor'), 'UNDERGRADUATE')
+        self.assertEqual(self.scraper._map_daad_level(None), 'ALL')
+
+        self.assertEqual(self.scraper._map_cordis_level('early stage researcher'), 'PHD')
+        self.assertEqual(self.scraper._map_cordis_level('postdoctoral'), 'POSTDOC')
+        self.assertEqual(self.scraper._map_cordis_level(None), 'ALL')
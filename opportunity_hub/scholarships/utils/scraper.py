@@ -1,25 +1,19 @@
 import requests
 from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from datetime import datetime
 from django.utils import timezone
+from core.scraping.driver_pool import PooledDriverMixin
+from core.scraping.redirect import redirect_url
 
-class ScholarshipScraper:
-    def __init__(self):
-        # Set up headless Chrome browser for Selenium
-        chrome_options = Options()
-        chrome_options.add_argument('--headless')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        self.driver = webdriver.Chrome(options=chrome_options)
+class ScholarshipScraper(PooledDriverMixin):
+    # Headless Chrome is borrowed from the shared driver pool on first use
 
     def scrape_scholarships_com(self):
         """Scrape scholarships from Scholarships.com"""
         scholarships = []
         url = 'https://www.scholarships.com/financial-aid/college-scholarships/scholarship-directory'
         
-        self.driver.get(url)
+        self.driver.get(redirect_url(url))
         soup = BeautifulSoup(self.driver.page_source, 'html.parser')
         
         scholarship_cards = soup.find_all('div', class_='scholarship-listing')
@@ -46,7 +40,7 @@ class ScholarshipScraper:
         scholarships = []
         url = 'https://foreign.fulbrightonline.org/applicants/getting-started'
         
-        self.driver.get(url)
+        self.driver.get(redirect_url(url))
         soup = BeautifulSoup(self.driver.page_source, 'html.parser')
         
         scholarship_sections = soup.find_all('div', class_='scholarship-opportunity')
@@ -75,7 +69,7 @@ class ScholarshipScraper:
         scholarships = []
         url = 'https://erasmus-plus.ec.europa.eu/opportunities/opportunities-for-individuals/students/erasmus-mundus-joint-masters-scholarships'
         
-        self.driver.get(url)
+        self.driver.get(redirect_url(url))
         soup = BeautifulSoup(self.driver.page_source, 'html.parser')
         
         programs = soup.find_all('div', class_='programme-card')
@@ -106,8 +100,4 @@ class ScholarshipScraper:
             # This is a simplified example
             return datetime.strptime(date_string, '%m/%d/%Y').date()
         except:
-            return timezone.now().date()
-
-    def __del__(self):
-        """Close the browser when done"""
-        self.driver.quit()
\ No newline at end of file
+            return timezone.now().date()
\ No newline at end of file
@@ -3,7 +3,9 @@ from django.contrib.auth.decorators import login_required
 from django.db.models import Q
 from django.contrib import messages
 from .models import Scholarship, ScholarshipApplication
+from core.metrics import timed_view
 
+@timed_view('scholarship_list')
 def scholarship_list(request):
     scholarships = Scholarship.objects.all().order_by('-created_at')
     